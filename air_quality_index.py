@@ -0,0 +1,161 @@
+"-----------------------------------------------MODUŁ: air_quality_index-----------------------------------------------"
+"""
+    Moduł zawierający obliczanie Polskiego Indeksu Jakości Powietrza dla stacji pomiarowych. Dla każdej stacji brane są
+najnowsze wartości stanowisk mierzących PM10, PM2.5, O3, NO2, SO2 i CO (wg kolumny param_code tabeli 'sensors');
+wartości wcześniejsze o więcej niż MAX_AGE godzin od najnowszego pomiaru stacji są pomijane. Każda wartość
+przypisywana jest do kategorii indeksu według progów GIOŚ (indeks cząstkowy), a indeksem stacji jest najgorszy
+z indeksów cząstkowych.
+    Indeksy cząstkowe wszystkich stacji liczone są naraz: progi wszystkich parametrów tworzą jedną tablicę, a kategoria
+wyznaczana jest przez porównanie wektora wartości z wierszami tej tablicy. Wyniki zapisywane są w tabeli
+'station_index'. Odświeżanie jest przyrostowe - przeliczane są tylko stacje, których stanowiska mają nowe pomiary
+od poprzedniego odświeżenia (data ostatniego pomiaru z wartością odczytywana jest z tabeli 'sensor_stats').
+
+Moduł zawiera następujące elementy:
+- numpy - moduł do obliczeń na tablicach,
+- get_sensors_data, get_measurements_data - moduły tworzące tabele stanowisk i pomiarów.
+"""
+
+import numpy as np
+from get_sensors_data import create_sensors_table
+from get_measurements_data import create_measurements_table
+
+LEVELS = ('Bardzo dobry', 'Dobry', 'Umiarkowany', 'Dostateczny', 'Zły', 'Bardzo zły')
+LEVEL_COLORS = ('#57b108', '#b0dd10', '#ffd911', '#e58100', '#e50000', '#990000')
+# górne granice kategorii 0-4 (wartości godzinowe w µg/m3); wartości większe od ostatniej granicy - kategoria 5;
+# progi NO2 według obecnej tabeli GIOŚ, zharmonizowanej z Europejskim Indeksem Jakości Powietrza (EEA)
+BREAKPOINTS = {'PM10': (20, 50, 80, 110, 150),
+               'PM2.5': (13, 35, 55, 75, 110),
+               'O3': (70, 120, 150, 180, 240),
+               'NO2': (40, 90, 120, 230, 340),
+               'SO2': (50, 100, 200, 350, 500),
+               'CO': (3000, 7000, 11000, 15000, 21000)}
+PARAMETERS = tuple(BREAKPOINTS)
+INDEX_COLUMNS = ('pm10', 'pm25', 'o3', 'no2', 'so2', 'co')
+BREAKPOINT_TABLE = np.array([BREAKPOINTS[param] for param in PARAMETERS], dtype=np.float64)
+MAX_AGE = 3  # w godzinach - wartości starsze od najnowszego pomiaru stacji nie są brane pod uwagę
+
+
+def create_station_index_table(conn):
+    """
+        Tworzy tabele 'station_index' (indeks stacji, parametr decydujący, data najnowszego pomiaru i indeksy
+    cząstkowe) oraz 'station_index_sources' (data ostatniego pomiaru każdego stanowiska uwzględnionego w indeksie),
+    o ile jeszcze nie istnieją.
+
+        Args:
+            conn (sqlite3.Connection): Połączenie z bazą danych.
+    """
+    columns = ',\n'.join(f'{column} INTEGER' for column in INDEX_COLUMNS)
+    conn.execute(f'''CREATE TABLE IF NOT EXISTS station_index (
+                     station_id INTEGER NOT NULL PRIMARY KEY,
+                     index_level INTEGER,
+                     dominant TEXT,
+                     values_date DATETIME,
+                     {columns})''')
+    conn.execute('''CREATE TABLE IF NOT EXISTS station_index_sources (
+                    sensor_id INTEGER NOT NULL PRIMARY KEY,
+                    last_date DATETIME)''')
+
+
+def sub_indices(params, values):
+    """
+        Zwraca indeksy cząstkowe (0-5) wartości values parametrów o numerach params (pozycje w PARAMETERS).
+    """
+    return (np.asarray(values, dtype=np.float64)[:, None] > BREAKPOINT_TABLE[params]).sum(axis=1)
+
+
+def compute_indices(stations, params, values, dates):
+    """
+        Wyznacza indeksy stacji z najnowszych wartości ich stanowisk.
+
+        Args:
+            stations (numpy.ndarray): ID stacji każdej wartości.
+            params (numpy.ndarray): Numer parametru każdej wartości (pozycja w PARAMETERS).
+            values (numpy.ndarray): Wartości.
+            dates (numpy.ndarray): Daty wartości (datetime64).
+
+        Returns:
+            tuple: ID stacji (rosnąco), macierz indeksów cząstkowych (stacja x parametr, -1 dla braku wartości) i data
+            najnowszego pomiaru każdej stacji.
+    """
+    keys, position = np.unique(stations, return_inverse=True)
+    seconds = dates.astype('datetime64[s]').astype(np.int64)
+    newest = np.full(len(keys), np.iinfo(np.int64).min)
+    np.maximum.at(newest, position, seconds)
+    current = seconds >= newest[position] - MAX_AGE * 3600
+    matrix = np.full((len(keys), len(PARAMETERS)), -1)
+    np.maximum.at(matrix, (position[current], params[current]), sub_indices(params[current], values[current]))
+    return keys, matrix, newest.astype('datetime64[s]')
+
+
+def refresh_station_index(conn):
+    """
+        Przelicza indeksy stacji, których stanowiska mają nowe pomiary od poprzedniego odświeżenia, i zapisuje je
+    w tabeli 'station_index'. Funkcja nie zatwierdza transakcji.
+
+        Args:
+            conn (sqlite3.Connection): Połączenie z bazą danych.
+
+        Returns:
+            int: Liczba przeliczonych stacji.
+    """
+    create_sensors_table(conn)
+    create_measurements_table(conn)
+    create_station_index_table(conn)
+    placeholders = ', '.join('?' * len(PARAMETERS))
+    changed = [row[0] for row in conn.execute(
+        f'''SELECT DISTINCT s.station_id FROM sensors s
+            JOIN sensor_stats st ON st.sensor_id = s.id
+            LEFT JOIN station_index_sources src ON src.sensor_id = s.id
+            WHERE s.param_code IN ({placeholders}) AND src.last_date IS NOT st.last_date''', PARAMETERS)]
+    if not changed:
+        return 0
+    rows = conn.execute(f'''SELECT s.id, s.station_id, s.param_code, m.values_value, m.values_date
+                            FROM sensors s
+                            JOIN sensor_stats st ON st.sensor_id = s.id
+                            JOIN measurements m ON m.sensor_id = s.id AND m.values_date = st.last_date
+                            WHERE s.param_code IN ({placeholders})
+                              AND s.station_id IN ({", ".join("?" * len(changed))})''',
+                        PARAMETERS + tuple(changed)).fetchall()
+    sensor_ids, stations, codes, values, dates = zip(*rows)
+    params = np.array([PARAMETERS.index(code) for code in codes])
+    keys, matrix, latest = compute_indices(np.array(stations), params, np.array(values, dtype=np.float64),
+                                           np.array(dates, dtype='datetime64[s]'))
+
+    levels = matrix.max(axis=1)
+    dominant = matrix.argmax(axis=1)
+    conn.executemany(f'''INSERT OR REPLACE INTO station_index
+                         (station_id, index_level, dominant, values_date, {", ".join(INDEX_COLUMNS)})
+                         VALUES (?, ?, ?, ?, {", ".join("?" * len(INDEX_COLUMNS))})''',
+                     [(int(station_id), int(level) if level >= 0 else None,
+                       PARAMETERS[index] if level >= 0 else None,
+                       str(date).replace('T', ' '))
+                      + tuple(int(value) if value >= 0 else None for value in row)
+                      for station_id, level, index, date, row in zip(keys, levels, dominant, latest, matrix)])
+    conn.executemany('INSERT OR REPLACE INTO station_index_sources VALUES (?, ?)', zip(sensor_ids, dates))
+    return len(keys)
+
+
+def station_index_levels(conn):
+    """
+        Zwraca indeksy wszystkich stacji w postaci słownika {ID stacji: kategoria 0-5}; stacje bez indeksu nie są
+    uwzględniane.
+
+        Example:
+            levels = station_index_levels(conn)
+            color = LEVEL_COLORS[levels[114]]
+    """
+    create_station_index_table(conn)
+    return dict(conn.execute('SELECT station_id, index_level FROM station_index WHERE index_level IS NOT NULL'))
+
+
+def station_index(conn, station_id):
+    """
+        Zwraca indeks stacji: słownik z kluczami 'index_level', 'dominant', 'values_date' i kluczami PARAMETERS
+    (indeksy cząstkowe, None dla parametrów bez wartości) albo None, jeśli indeks stacji nie był liczony.
+    """
+    create_station_index_table(conn)
+    row = conn.execute(f'''SELECT index_level, dominant, values_date, {", ".join(INDEX_COLUMNS)} FROM station_index
+                           WHERE station_id = ?''', (station_id,)).fetchone()
+    if row is None:
+        return None
+    return dict(zip(('index_level', 'dominant', 'values_date') + PARAMETERS, row))
@@ -0,0 +1,183 @@
+"-----------------------------------------------MODUŁ: anomaly_detection-----------------------------------------------"
+"""
+    Moduł zawierający wykrywanie nietypowych pomiarów (awarii czujników i epizodów zanieczyszczenia) w trakcie zapisu
+pomiarów, bez ponownego przeglądania historii. Dla każdego stanowiska utrzymywany jest stan detektora (tabela
+'anomaly_state'): okno ostatnich WINDOW_SIZE wartości oraz średnia i wariancja ważone wykładniczo. Każdy nowy pomiar
+aktualizuje stan w stałym czasie, a pomiar nietypowy zapisywany jest w tabeli 'anomalies' (z indeksem dat), jako:
+- 'negative' - wartość ujemna (błąd czujnika),
+- 'flat' - ostatnie WINDOW_SIZE wartości są identyczne (zawieszony czujnik),
+- 'spike' - odchylenie od mediany okna większe niż SPIKE_THRESHOLD odchyleń MAD (nagły skok),
+- 'episode' - wartość większa od średniej ważonej wykładniczo o więcej niż Z_THRESHOLD odchyleń standardowych
+  (epizod wysokiego zanieczyszczenia).
+    Pomiary starsze od ostatniego pomiaru przetworzonego przez detektor (uzupełnienia dawnych luk) są pomijane.
+
+Moduł zawiera następujące elementy:
+- json - moduł do zapisu okna wartości w bazie danych,
+- math - moduł funkcji matematycznych,
+- collections - moduł zawierający deque (okno ostatnich wartości).
+"""
+
+import json
+import math
+from collections import deque
+
+WINDOW_SIZE = 24
+MIN_WINDOW = 12
+MIN_HISTORY = 48
+HALF_LIFE = 168
+ALPHA = 1 - 0.5 ** (1 / HALF_LIFE)
+SPIKE_THRESHOLD = 6.0
+Z_THRESHOLD = 4.0
+# MAD rozkładu normalnego jest 1.4826 razy mniejsze od odchylenia standardowego
+MAD_SCALE = 1.4826
+# najmniejsza skala odchyleń (względem mediany), by drobne wahania bardzo stabilnych wartości nie były skokami
+MIN_RELATIVE_SCALE = 0.1
+MIN_SCALE = 1e-3
+
+
+def create_anomaly_tables(conn):
+    """
+        Tworzy tabele 'anomaly_state' (stan detektora każdego stanowiska) i 'anomalies' (pomiary nietypowe), o ile
+    jeszcze nie istnieją.
+
+        Args:
+            conn (sqlite3.Connection): Połączenie z bazą danych.
+    """
+    conn.execute('''CREATE TABLE IF NOT EXISTS anomaly_state (
+                    sensor_id INTEGER NOT NULL PRIMARY KEY,
+                    last_date DATETIME NOT NULL,
+                    recent TEXT NOT NULL,
+                    count INTEGER NOT NULL,
+                    mean REAL NOT NULL,
+                    variance REAL NOT NULL)''')
+    conn.execute('''CREATE TABLE IF NOT EXISTS anomalies (
+                    sensor_id INTEGER NOT NULL,
+                    values_date DATETIME NOT NULL,
+                    value REAL NOT NULL,
+                    kind TEXT NOT NULL,
+                    score REAL,
+                    baseline REAL,
+                    PRIMARY KEY (sensor_id, values_date)) WITHOUT ROWID''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_anomalies_date ON anomalies (values_date)')
+
+
+def _median(values):
+    ordered = sorted(values)
+    middle = len(ordered) // 2
+    return ordered[middle] if len(ordered) % 2 else (ordered[middle - 1] + ordered[middle]) / 2
+
+
+class DetectorState:
+    """
+        Stan detektora jednego stanowiska: okno ostatnich wartości, liczba przetworzonych wartości, średnia i wariancja
+    ważone wykładniczo oraz data ostatniego przetworzonego pomiaru.
+    """
+
+    def __init__(self, last_date=None, window=(), count=0, mean=0.0, variance=0.0):
+        self.last_date = last_date
+        self.window = deque(window, maxlen=WINDOW_SIZE)
+        self.count = count
+        self.mean = mean
+        self.variance = variance
+
+    def update(self, date, value):
+        """
+            Dołącza pomiar do stanu i zwraca wynik jego oceny: krotkę (rodzaj, wynik, wartość odniesienia) dla pomiaru
+        nietypowego albo None.
+        """
+        result = None
+        if value < 0:
+            result = ('negative', None, None)
+        elif len(self.window) >= MIN_WINDOW:
+            median = _median(self.window)
+            mad = _median(abs(item - median) for item in self.window)
+            scale = max(MAD_SCALE * mad, MIN_RELATIVE_SCALE * abs(median), MIN_SCALE)
+            score = (value - median) / scale
+            if len(self.window) == WINDOW_SIZE and min(self.window) == max(self.window) == value:
+                result = ('flat', 0.0, median)
+            elif abs(score) > SPIKE_THRESHOLD:
+                result = ('spike', score, median)
+            elif self.count >= MIN_HISTORY and self.variance > 0:
+                z = (value - self.mean) / math.sqrt(self.variance)
+                if z > Z_THRESHOLD:
+                    result = ('episode', z, self.mean)
+
+        self.window.append(value)
+        if self.count:
+            difference = value - self.mean
+            increment = ALPHA * difference
+            self.mean += increment
+            self.variance = (1 - ALPHA) * (self.variance + difference * increment)
+        else:
+            self.mean = value
+        self.count += 1
+        self.last_date = date
+        return result
+
+
+def load_state(conn, sensor_id):
+    """
+        Odczytuje stan detektora stanowiska (nowy, pusty stan, jeśli stanowisko nie było jeszcze przetwarzane).
+    """
+    row = conn.execute('SELECT last_date, recent, count, mean, variance FROM anomaly_state WHERE sensor_id = ?',
+                       (sensor_id,)).fetchone()
+    if row is None:
+        return DetectorState()
+    return DetectorState(row[0], json.loads(row[1]), row[2], row[3], row[4])
+
+
+def save_state(conn, sensor_id, state):
+    conn.execute('INSERT OR REPLACE INTO anomaly_state VALUES (?, ?, ?, ?, ?, ?)',
+                 (sensor_id, state.last_date, json.dumps(list(state.window)), state.count, state.mean, state.variance))
+
+
+def detect_anomalies(conn, sensor_id, rows):
+    """
+        Przetwarza nowe pomiary stanowiska detektorem i zapisuje pomiary nietypowe w tabeli 'anomalies'. Pomiary bez
+    wartości oraz starsze od ostatniego przetworzonego pomiaru są pomijane. Funkcja nie zatwierdza transakcji -
+    wywoływana jest przez save_measurements w transakcji zapisu pomiarów.
+
+        Args:
+            conn (sqlite3.Connection): Połączenie z bazą danych.
+            sensor_id (int): Numer ID stanowiska pomiarowego.
+            rows (iterable): Nowe pomiary (data, wartość).
+
+        Returns:
+            int: Liczba zapisanych pomiarów nietypowych.
+    """
+    state = load_state(conn, sensor_id)
+    rows = sorted((date, float(value)) for date, value in rows
+                  if value is not None and (state.last_date is None or date > state.last_date))
+    if not rows:
+        return 0
+    found = []
+    for date, value in rows:
+        result = state.update(date, value)
+        if result is not None:
+            found.append((sensor_id, date, value) + result)
+    conn.executemany('INSERT OR REPLACE INTO anomalies VALUES (?, ?, ?, ?, ?, ?)', found)
+    save_state(conn, sensor_id, state)
+    return len(found)
+
+
+def anomalies(conn, sensor_id=None, start=None, end=None, kinds=None):
+    """
+        Zwraca zapisane pomiary nietypowe, opcjonalnie jednego stanowiska, z zakresu dat od start do end (włącznie)
+    i wybranych rodzajów.
+
+        Returns:
+            list: Krotki (sensor_id, values_date, value, kind, score, baseline), posortowane według daty.
+
+        Example:
+            for row in anomalies(conn, start='2024-03-01 00:00:00', kinds=('episode',)):
+                print(row)
+    """
+    conditions, args = ['values_date >= ?', 'values_date <= ?'], [start or '', end or '￿']
+    if sensor_id is not None:
+        conditions.append('sensor_id = ?')
+        args.append(sensor_id)
+    if kinds is not None:
+        conditions.append(f'kind IN ({", ".join("?" * len(kinds))})')
+        args += list(kinds)
+    return conn.execute(f'''SELECT sensor_id, values_date, value, kind, score, baseline FROM anomalies
+                            WHERE {" AND ".join(conditions)} ORDER BY values_date, sensor_id''', args).fetchall()
@@ -0,0 +1,340 @@
+"------------------------------------------------MODUŁ: batch_analytics------------------------------------------------"
+"""
+    Moduł zawierający funkcję batch_analyze, która wykonuje analizę MeasurementAnalysis.analyze() (statystyki i trend
+metodą średniej kroczącej o stałym czasie trwania okna) jednocześnie dla wielu stanowisk pomiarowych: wybranych
+stanowisk, wszystkich stanowisk danego parametru, stanowisk wybranych stacji albo wszystkich stanowisk w bazie. Wynikiem
+jest jedna tabela (ramka danych pandas) z wierszem dla każdego stanowiska.
+    Stanowiska dzielone są na partie; każda partia wczytywana jest jednym zapytaniem (w kolejności klucza głównego
+tabeli 'measurements') i liczona operacjami grupowymi numpy na całej partii naraz, bez pętli po stanowiskach. Partie
+liczone są równolegle w puli procesów, więc raport dla wszystkich stanowisk w Polsce wykorzystuje wszystkie rdzenie
+procesora.
+    Funkcja batch_forecast w ten sam sposób liczy prognozy (moduł forecasting) dla wielu stanowisk: partie stanowisk
+uzupełniają w puli procesów modele o pomiary nowsze od ostatniego przetworzonego, a uzupełnione modele zapisywane są
+w bazie danych przez proces główny.
+
+Moduł zawiera następujące elementy:
+- os, argparse - moduły do odczytu liczby rdzeni i obsługi argumentów wiersza poleceń,
+- concurrent.futures - moduł udostępniający pulę procesów,
+- numpy - moduł do obliczeń na tablicach,
+- pandas - moduł, który został wykorzystany do generowania dataframe,
+- database - moduł zarządzający połączeniami z bazą danych database.db,
+- get_sensors_data, get_measurements_data - moduły tworzące tabele stanowisk i pomiarów,
+- trends - moduł z metodami wyznaczania linii trendu (czas trwania okna średniej kroczącej),
+- forecasting - moduł z modelami prognoz stanowisk.
+"""
+
+import os
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from database import connect, get_connection
+from get_sensors_data import create_sensors_table
+from get_measurements_data import create_measurements_table
+from trends import ROLLING_WINDOW
+from forecasting import (HORIZON, MIN_HISTORY, WARM_UP, apply_measurements, create_forecast_table, empty_forecast,
+                         load_model, save_model)
+
+DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+SHARD_SIZE = 100
+# odstęp kluczy kolejnych serii przy wyszukiwaniu okien (większy niż zakres dat w sekundach)
+GROUP_SPAN = 1 << 40
+RESULT_COLUMNS = ('station_id', 'param_code', 'count', 'data_mean', 'data_std', 'min_value', 'min_date', 'max_value',
+                  'max_date', 'first_date', 'last_date', 'trend_start', 'trend_end', 'trend_slope')
+
+
+def select_sensors(conn, sensors='all', param_code=None, stations=None):
+    """
+        Zwraca stanowiska z pomiarami spełniające wszystkie podane warunki.
+
+        Args:
+            conn (sqlite3.Connection): Połączenie z bazą danych.
+            sensors (list or str): Numery ID stanowisk albo 'all' (wszystkie stanowiska).
+            param_code (str): Kod parametru, np. 'PM10' (None - dowolny).
+            stations (list): Numery ID stacji lub wiersze tabeli 'stations' (None - dowolna stacja).
+
+        Returns:
+            list: Krotki (sensor_id, station_id, param_code), posortowane według ID stanowiska.
+    """
+    conditions, args = [], []
+    if sensors != 'all':
+        sensors = [int(sensor_id) for sensor_id in sensors]
+        conditions.append(f'm.sensor_id IN ({", ".join("?" * len(sensors))})')
+        args += sensors
+    if param_code is not None:
+        conditions.append('s.param_code = ?')
+        args.append(param_code)
+    if stations is not None:
+        stations = [station[0] if isinstance(station, (tuple, list)) else int(station) for station in stations]
+        conditions.append(f's.station_id IN ({", ".join("?" * len(stations))})')
+        args += stations
+    where = f'WHERE {" AND ".join(conditions)}' if conditions else ''
+    return conn.execute(f'''SELECT m.sensor_id, s.station_id, s.param_code
+                            FROM (SELECT DISTINCT sensor_id FROM measurements) m
+                            LEFT JOIN sensors s ON s.id = m.sensor_id
+                            {where} ORDER BY m.sensor_id''', args).fetchall()
+
+
+def _first_match(values, extremes, groups, starts):
+    # indeks pierwszego pomiaru każdej grupy równego wartości skrajnej grupy (-1, jeśli grupa nie ma wartości)
+    candidates = np.flatnonzero(values == extremes[groups])
+    first = np.concatenate(([True], np.diff(groups[candidates]) > 0))
+    result = np.full(len(starts), -1)
+    result[groups[candidates[first]]] = candidates[first]
+    return result
+
+
+def rolling_trend(seconds, values, groups, window=ROLLING_WINDOW):
+    """
+        Liczy linię trendu każdej serii tak jak metoda 'rolling' modułu trends: średnią kroczącą z pomiarów z wartością
+    z okna o stałym czasie trwania, kończącego się na dacie pomiaru. Wszystkie serie liczone są jednocześnie z sum
+    skumulowanych, a początki okien wyszukiwane binarnie.
+
+        Args:
+            seconds (numpy.ndarray): Daty pomiarów w sekundach, rosnąco w obrębie serii.
+            values (numpy.ndarray): Wartości kolejnych serii, jedna po drugiej (NaN dla pomiarów bez wartości).
+            groups (numpy.ndarray): Numer serii każdego pomiaru, rosnąco.
+            window (str): Czas trwania okna, np. '7D'.
+    """
+    keys = groups.astype(np.int64) * GROUP_SPAN + seconds
+    low = np.searchsorted(keys, keys - int(pd.Timedelta(window).total_seconds()), side='right')
+    high = np.arange(1, len(values) + 1)
+    present = ~np.isnan(values)
+    sums = np.concatenate(([0.0], np.cumsum(np.where(present, values, 0.0))))
+    numbers = np.concatenate(([0], np.cumsum(present)))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return (sums[high] - sums[low]) / (numbers[high] - numbers[low])
+
+
+def analyze_frame(sensor_ids, dates, values):
+    """
+        Liczy statystyki i trend wielu serii jednocześnie.
+
+        Args:
+            sensor_ids (numpy.ndarray): ID stanowiska każdego pomiaru, rosnąco.
+            dates (numpy.ndarray): Daty pomiarów (tekst 'RRRR-MM-DD GG:MM:SS'), rosnąco w obrębie stanowiska.
+            values (numpy.ndarray): Wartości pomiarów (NaN dla pomiarów bez wartości).
+
+        Returns:
+            pandas.DataFrame: Wiersz wyników dla każdego stanowiska (indeks 'sensor_id').
+    """
+    if not len(values):
+        return pd.DataFrame(columns=list(RESULT_COLUMNS[2:]), index=pd.Index([], name='sensor_id', dtype=np.int64))
+    keys, starts, counts = np.unique(sensor_ids, return_index=True, return_counts=True)
+    groups = np.repeat(np.arange(len(keys)), counts)
+    present = ~np.isnan(values)
+    filled = np.where(present, values, 0.0)
+    number = np.bincount(groups, weights=present, minlength=len(keys))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.bincount(groups, weights=filled, minlength=len(keys)) / number
+        deviations = np.where(present, values - mean[groups], 0.0)
+        std = np.sqrt(np.bincount(groups, weights=deviations ** 2, minlength=len(keys)) / (number - 1))
+    minimum = np.fmin.reduceat(values, starts)
+    maximum = np.fmax.reduceat(values, starts)
+    at_min = _first_match(values, minimum, groups, starts)
+    at_max = _first_match(values, maximum, groups, starts)
+
+    seconds = pd.to_datetime(pd.Series(dates, dtype=object), format=DATE_FORMAT).to_numpy() \
+        .astype('datetime64[s]').astype(np.int64)
+    trend = rolling_trend(seconds, values, groups)
+    trend_at = np.flatnonzero(~np.isnan(trend))
+    trend_groups = groups[trend_at]
+    # pierwszy i ostatni punkt trendu każdej serii oraz nachylenie prostej dopasowanej do trendu (na dobę)
+    first = np.full(len(keys), -1)
+    last = np.full(len(keys), -1)
+    first[trend_groups[::-1]] = trend_at[::-1]
+    last[trend_groups] = trend_at
+    days = (seconds[trend_at] - seconds[0]) / 86400
+    points = np.bincount(trend_groups, minlength=len(keys))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean_day = np.bincount(trend_groups, weights=days, minlength=len(keys)) / points
+        mean_trend = np.bincount(trend_groups, weights=trend[trend_at], minlength=len(keys)) / points
+        centered = days - mean_day[trend_groups]
+        slope = (np.bincount(trend_groups, weights=centered * (trend[trend_at] - mean_trend[trend_groups]),
+                             minlength=len(keys))
+                 / np.bincount(trend_groups, weights=centered ** 2, minlength=len(keys)))
+
+    def pick(array, index, empty):
+        return np.where(index >= 0, array[np.maximum(index, 0)], empty)
+
+    return pd.DataFrame({'count': number.astype(np.int64),
+                         'data_mean': mean,
+                         'data_std': std,
+                         'min_value': minimum,
+                         'min_date': pick(dates, at_min, None),
+                         'max_value': maximum,
+                         'max_date': pick(dates, at_max, None),
+                         'first_date': dates[starts],
+                         'last_date': dates[starts + counts - 1],
+                         'trend_start': pick(trend, first, np.nan),
+                         'trend_end': pick(trend, last, np.nan),
+                         'trend_slope': slope},
+                        index=pd.Index(keys, name='sensor_id'))
+
+
+def analyze_shard(db_file, sensor_ids):
+    """
+        Wczytuje pomiary partii stanowisk jednym zapytaniem i liczy dla nich analyze_frame. Funkcja wykonywana jest
+    w procesie puli, więc otwiera własne połączenie z bazą danych.
+    """
+    conn = connect(db_file)
+    try:
+        rows = conn.execute(f'''SELECT sensor_id, values_date, values_value FROM measurements
+                                WHERE sensor_id IN ({", ".join("?" * len(sensor_ids))})
+                                ORDER BY sensor_id, values_date''', list(sensor_ids)).fetchall()
+    finally:
+        conn.close()
+    ids, dates, values = zip(*rows) if rows else ((), (), ())
+    return analyze_frame(np.array(ids, dtype=np.int64), np.array(dates, dtype=object),
+                         np.array(values, dtype=np.float64))
+
+
+def batch_analyze(sensors='all', param_code=None, stations=None, db_file='database.db', workers=None,
+                  shard_size=SHARD_SIZE):
+    """
+        Wykonuje analizę (statystyki i trend) dla wielu stanowisk pomiarowych i zwraca wyniki w jednej tabeli.
+
+        Args:
+            sensors (list or str): Numery ID stanowisk albo 'all'.
+            param_code (str): Kod parametru, np. 'PM10' (None - dowolny).
+            stations (list): Numery ID stacji lub wiersze tabeli 'stations' (None - dowolna stacja).
+            db_file (str): Ścieżka do pliku bazy danych.
+            workers (int): Liczba procesów (None - liczba rdzeni procesora, 1 - obliczenia w bieżącym procesie).
+            shard_size (int): Liczba stanowisk w jednej partii.
+
+        Returns:
+            pandas.DataFrame: Wiersz dla każdego stanowiska (indeks 'sensor_id', kolumny RESULT_COLUMNS): stacja,
+            parametr, statystyki jak w MeasurementAnalysis.statistics(), pierwszy i ostatni punkt trendu oraz
+            nachylenie trendu (zmiana wartości na dobę).
+
+        Example:
+            report = batch_analyze(param_code='PM10')
+            print(report.sort_values('trend_slope').tail())
+    """
+    conn = get_connection(db_file)
+    create_sensors_table(conn)
+    create_measurements_table(conn)
+    selected = select_sensors(conn, sensors, param_code, stations)
+    metadata = pd.DataFrame(selected, columns=['sensor_id', 'station_id', 'param_code']).set_index('sensor_id')
+    ids = metadata.index.tolist()
+    shards = [ids[start:start + shard_size] for start in range(0, len(ids), shard_size)]
+    workers = min(workers or os.cpu_count() or 1, len(shards))
+
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(analyze_shard, [db_file] * len(shards), shards))
+    else:
+        results = [analyze_shard(db_file, shard) for shard in shards]
+
+    frames = [result for result in results if len(result)]
+    analysis = pd.concat(frames) if frames else analyze_shard(db_file, [])
+    return metadata.join(analysis, how='inner')[list(RESULT_COLUMNS)]
+
+
+def forecast_shard(db_file, sensor_ids, hours=HORIZON):
+    """
+        Uzupełnia modele prognoz partii stanowisk o pomiary nowsze od ostatniego przetworzonego (jednym zapytaniem)
+    i liczy prognozy. Nowy model stanowiska, tak jak w update_forecast, dopasowywany jest tylko do pomiarów z ostatnich
+    WARM_UP godzin przed najnowszym pomiarem stanowiska. Funkcja wykonywana jest w procesie puli, więc otwiera własne
+    połączenie z bazą danych i niczego nie zapisuje.
+
+        Returns:
+            tuple: Prognozy (ramka danych z indeksem (sensor_id, values_date)) i uzupełnione modele {sensor_id: model}.
+    """
+    conn = connect(db_file)
+    try:
+        create_forecast_table(conn)
+        models = {sensor_id: load_model(conn, sensor_id) for sensor_id in sensor_ids}
+        rows = conn.execute(f'''SELECT m.sensor_id, m.values_date, m.values_value
+                                FROM measurements m LEFT JOIN forecast_state f ON f.sensor_id = m.sensor_id
+                                WHERE m.sensor_id IN ({", ".join("?" * len(sensor_ids))})
+                                  AND m.values_value IS NOT NULL
+                                  AND CASE WHEN f.last_date IS NULL
+                                           THEN m.values_date >= (SELECT datetime(MAX(w.values_date), ?)
+                                                                  FROM measurements w
+                                                                  WHERE w.sensor_id = m.sensor_id
+                                                                    AND w.values_value IS NOT NULL)
+                                           ELSE m.values_date > f.last_date END
+                                ORDER BY m.sensor_id, m.values_date''',
+                            list(sensor_ids) + [f'-{WARM_UP} hours']).fetchall()
+    finally:
+        conn.close()
+    ids = np.array([row[0] for row in rows], dtype=np.int64)
+    starts = np.flatnonzero(np.r_[True, ids[1:] != ids[:-1]]) if len(ids) else np.empty(0, dtype=np.int64)
+    updated = {}
+    for start, stop in zip(starts, np.r_[starts[1:], len(ids)]):
+        sensor_id = rows[start][0]
+        if apply_measurements(models[sensor_id], ((date, value) for _, date, value in rows[start:stop])):
+            updated[sensor_id] = models[sensor_id]
+    frames = {sensor_id: model.predict(hours) for sensor_id, model in models.items() if model.count >= MIN_HISTORY}
+    return (pd.concat(frames, names=['sensor_id']) if frames else empty_forecast()), updated
+
+
+def batch_forecast(sensors='all', param_code=None, stations=None, db_file='database.db', hours=HORIZON, workers=None,
+                   shard_size=SHARD_SIZE):
+    """
+        Liczy prognozy wielu stanowisk pomiarowych i zapisuje uzupełnione modele prognoz. Model zapisany w bazie
+    w trakcie obliczeń (np. przez równoległy zapis pomiarów) nie jest zastępowany starszym.
+
+        Args:
+            sensors (list or str): Numery ID stanowisk albo 'all'.
+            param_code (str): Kod parametru, np. 'PM10' (None - dowolny).
+            stations (list): Numery ID stacji lub wiersze tabeli 'stations' (None - dowolna stacja).
+            db_file (str): Ścieżka do pliku bazy danych.
+            hours (int): Horyzont prognozy w godzinach.
+            workers (int): Liczba procesów (None - liczba rdzeni procesora, 1 - obliczenia w bieżącym procesie).
+            shard_size (int): Liczba stanowisk w jednej partii.
+
+        Returns:
+            pandas.DataFrame: Prognozy (kolumny 'forecast', 'lower', 'upper') z indeksem (sensor_id, values_date);
+            stanowiska, których modele przetworzyły mniej niż forecasting.MIN_HISTORY pomiarów, są pomijane.
+
+        Example:
+            frame = batch_forecast(param_code='PM10', hours=24)
+            print(frame.groupby(level='sensor_id')['forecast'].max().nlargest(10))
+    """
+    conn = get_connection(db_file)
+    create_sensors_table(conn)
+    create_measurements_table(conn)
+    create_forecast_table(conn)
+    conn.commit()
+    ids = [sensor_id for sensor_id, _, _ in select_sensors(conn, sensors, param_code, stations)]
+    shards = [ids[start:start + shard_size] for start in range(0, len(ids), shard_size)]
+    workers = min(workers or os.cpu_count() or 1, len(shards))
+
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(forecast_shard, [db_file] * len(shards), shards, [hours] * len(shards)))
+    else:
+        results = [forecast_shard(db_file, shard, hours) for shard in shards]
+
+    with conn:
+        for _, updated in results:
+            for sensor_id, model in updated.items():
+                stored = load_model(conn, sensor_id)
+                if stored.last_date is None or stored.last_date < model.last_date:
+                    save_model(conn, sensor_id, model)
+    frames = [frame for frame, _ in results if len(frame)]
+    return pd.concat(frames) if frames else empty_forecast()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Analiza pomiarów wielu stanowisk pomiarowych.')
+    parser.add_argument('--param', help='kod parametru, np. PM10')
+    parser.add_argument('--stations', type=int, nargs='+', help='numery ID stacji')
+    parser.add_argument('--sensors', type=int, nargs='+', help='numery ID stanowisk')
+    parser.add_argument('--workers', type=int, help='liczba procesów (domyślnie liczba rdzeni)')
+    parser.add_argument('--output', default='raport.csv', help='plik CSV z wynikami')
+    parser.add_argument('--forecast', type=int, metavar='HOURS',
+                        help='prognoza na podaną liczbę godzin zamiast analizy')
+    args = parser.parse_args()
+
+    if args.forecast:
+        forecasts = batch_forecast(args.sensors or 'all', args.param, args.stations, hours=args.forecast,
+                                   workers=args.workers)
+        forecasts.to_csv(args.output)
+        print(f'PROGNOZY {forecasts.index.get_level_values(0).nunique()} STANOWISK ZAPISANO W PLIKU {args.output}')
+    else:
+        report = batch_analyze(args.sensors or 'all', args.param, args.stations, workers=args.workers)
+        report.to_csv(args.output)
+        print(f'PRZEANALIZOWANO {len(report)} STANOWISK, WYNIKI ZAPISANO W PLIKU {args.output}')
@@ -0,0 +1,155 @@
+"-------------------------------------------------MODUŁ: bulk_crawler-------------------------------------------------"
+"""
+    Moduł zawierający funkcję crawl_all, która pobiera stanowiska pomiarowe i dane pomiarowe ze wszystkich stacji
+zapisanych w tabeli 'stations'. Zapytania do serwisu GIOŚ wykonywane są równolegle w puli wątków, przez wspólną sesję
+HTTP utrzymującą połączenia (keep-alive) i pamięć podręczną http_cache, z ograniczeniem liczby równoczesnych zapytań
+oraz liczby zapytań na sekundę do jednego hosta. Wszystkie dane zapisywane są w bazie danych database.db w jednej
+transakcji, razem z odświeżonymi indeksami jakości powietrza stacji z nowymi pomiarami.
+
+Moduł zawiera następujące elementy:
+- requests - moduł do wykonywania zapytań sieciowych,
+- database - moduł zarządzający połączeniami z bazą danych database.db,
+- threading, time - moduły do synchronizacji wątków i odmierzania odstępów między zapytaniami,
+- concurrent.futures - moduł udostępniający pulę wątków,
+- get_stations_data - funkcja pobiera listę wszystkich stacji pomiarowych i zapisuje ją w bazie danych SQL,
+- get_sensors_data - moduł z funkcjami pobierającymi i zapisującymi stanowiska pomiarowe,
+- get_measurements_data - moduł z funkcjami pobierającymi i zapisującymi dane pomiarowe,
+- air_quality_index - moduł obliczający indeks jakości powietrza stacji.
+"""
+
+import requests
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlparse
+from requests.adapters import HTTPAdapter
+from database import get_connection
+from get_stations_data import get_stations_data
+from get_sensors_data import create_sensors_table, fetch_sensors, save_sensors
+from get_measurements_data import create_measurements_table, fetch_measurements, save_measurements
+from air_quality_index import refresh_station_index
+
+
+class RateLimiter:
+    """
+        Klasa ogranicza liczbę zapytań wysyłanych do jednego hosta w ciągu sekundy. Każdy host ma własny harmonogram,
+    więc zapytania do różnych serwerów nie blokują się nawzajem.
+    """
+
+    def __init__(self, requests_per_second):
+        """
+            Inicjalizuje instancję klasy RateLimiter.
+
+            Args:
+                requests_per_second (float): Maksymalna liczba zapytań na sekundę do jednego hosta (0 - bez limitu).
+        """
+        self.interval = 1.0 / requests_per_second if requests_per_second else 0.0
+        self._next_slot = {}
+        self._lock = threading.Lock()
+
+    def wait(self, url):
+        """
+            Wstrzymuje bieżący wątek do chwili, w której można wysłać kolejne zapytanie na adres url.
+        """
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.interval
+        delay = slot - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+
+
+class RateLimitedSession(requests.Session):
+    """
+        Sesja HTTP współdzielona przez wątki. Utrzymuje pulę połączeń keep-alive o rozmiarze równym liczbie wątków
+    i przed każdym zapytaniem czeka na zgodę ogranicznika RateLimiter.
+    """
+
+    def __init__(self, rate_limiter, pool_size):
+        """
+            Inicjalizuje instancję klasy RateLimitedSession.
+
+            Args:
+                rate_limiter (RateLimiter): Ogranicznik liczby zapytań na sekundę.
+                pool_size (int): Liczba utrzymywanych połączeń do jednego hosta.
+        """
+        super().__init__()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.mount('http://', adapter)
+        self.mount('https://', adapter)
+        self.rate_limiter = rate_limiter
+
+    def request(self, method, url, *args, **kwargs):
+        self.rate_limiter.wait(url)
+        return super().request(method, url, *args, **kwargs)
+
+
+def crawl_all(max_workers=16, requests_per_second=10, db_file='database.db'):
+    """
+        Funkcja pobiera stanowiska pomiarowe wszystkich stacji z tabeli 'stations', a następnie dane pomiarowe
+        wszystkich tych stanowisk i zapisuje je do tabel 'sensors' i 'measurements'. Zapytania o dane pomiarowe
+        wysyłane są od razu po otrzymaniu listy stanowisk danej stacji, bez czekania na pozostałe stacje.
+        Stanowiska lub stacje, których nie udało się pobrać, są pomijane i liczone w podsumowaniu.
+
+        Args:
+            max_workers (int): Maksymalna liczba równoczesnych zapytań.
+            requests_per_second (float): Maksymalna liczba zapytań na sekundę do jednego hosta (0 - bez limitu).
+            db_file (str): Ścieżka do pliku bazy danych.
+
+        Returns:
+            dict: Podsumowanie pobierania - liczba stacji, stanowisk, nowych pomiarów i błędów.
+
+        Example:
+            crawl_all(max_workers=8, requests_per_second=5)
+
+        Output:
+            POBRANO DANE: 254 STACJI, 1398 STANOWISK, 1398 NOWYCH POMIARÓW, 3 BŁĘDÓW
+    """
+    conn = get_connection(db_file)
+    create_sensors_table(conn)
+    create_measurements_table(conn)
+
+    has_stations = conn.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='stations'").fetchone()
+    if not has_stations or not conn.execute("SELECT 1 FROM stations LIMIT 1").fetchone():
+        get_stations_data(db_file=db_file)
+    station_ids = [row[0] for row in conn.execute("SELECT id FROM stations")]
+
+    summary = {'stations': 0, 'sensors': 0, 'measurements': 0, 'errors': 0}
+    session = RateLimitedSession(RateLimiter(requests_per_second), max_workers)
+
+    with session, ThreadPoolExecutor(max_workers=max_workers) as pool:
+        sensor_futures = {pool.submit(fetch_sensors, station_id, session): station_id for station_id in station_ids}
+        measurement_futures = {}
+
+        for future in as_completed(sensor_futures):
+            station_id = sensor_futures[future]
+            try:
+                sensors = future.result()
+            except requests.exceptions.RequestException:
+                summary['errors'] += 1
+                continue
+            save_sensors(conn, station_id, sensors)
+            summary['stations'] += 1
+            for sensor in sensors:
+                measurement_futures[pool.submit(fetch_measurements, sensor['id'], session)] = sensor['id']
+
+        for future in as_completed(measurement_futures):
+            sensor_id = measurement_futures[future]
+            try:
+                measurements = future.result()
+            except requests.exceptions.RequestException:
+                summary['errors'] += 1
+                continue
+            summary['sensors'] += 1
+            summary['measurements'] += save_measurements(conn, sensor_id, measurements)
+
+    refresh_station_index(conn)
+    conn.commit()
+
+    print(f"POBRANO DANE: {summary['stations']} STACJI, {summary['sensors']} STANOWISK, "
+          f"{summary['measurements']} NOWYCH POMIARÓW, {summary['errors']} BŁĘDÓW")
+    return summary
+
+if __name__ == '__main__': crawl_all()
@@ -3,7 +3,9 @@
     Moduł stanowiący instrukcję przycisku "Wyszukaj stacje po nazwie miejscowości" głównego okna. Zawiera klasę 
 CommandCity, która kolejno:
 - wyświetla okno z listboxem, w którym:
-    - po wprowadzeniu nazwy miejsowości - wyświetli listę stacji pomiarowych w tej miejscowości (o ile są dostępne),
+    - po wprowadzeniu nazwy miejsowości - wyświetli listę stacji pomiarowych w tej miejscowości (o ile są dostępne);
+      lista aktualizowana jest w trakcie wpisywania, a nazwa może być podana bez polskich znaków, w skrócie lub
+      z literówką,
     - po wybraniu id stacji - wyświetla listę stanowisk pomiarowych, gdzie każde stanowisko mierzy inny parametr,
     - po wybraniu id parametru - wyświetla wykres danych oraz ich listę,
 - po zamknięciu okienka wykresu, a następnie kliknięciu przysciku analizuj - wyświetla linię trendu oraz prostą analizę 
@@ -11,8 +13,9 @@ danych.
 
 Moduł zawiera następujące elementy:
 - Tkinter - moduł do tworzenia interfejsu użytkownika,
-- sqlite3 - moduł do łączenia z bazą danych database.db,
-- get_stations_data - funkcja pobiera listę wszystkich stacji pomiarowych i zapisuje ją w bazie danych SQL,
+- database - moduł zarządzający połączeniami z bazą danych database.db,
+- station_registry - moduł udostępniający zapisaną listę stacji pomiarowych i odświeżający ją w tle,
+- station_search - moduł zawierający funkcję search_stations, wyszukującą stacje po nazwie,
 - get_sensors_data - funkcja pobiera listę stanowisk pomiarowych wybranej stacji i zapisuje ją w bazie danych SQL,
 - get_measurements_data - funkcja pobiera listę pomiarów wybranego parametru i zapisuje ją w bazie danych SQL,
 - MeasurementAnalysis - klasa do tworzenia analizy danych, w tym wykresów,
@@ -21,8 +24,9 @@ Moduł zawiera następujące elementy:
 
 from tkinter import *
 import tkinter as tk
-import sqlite3
-from get_stations_data import get_stations_data
+from database import get_connection
+from station_registry import get_stations
+from station_search import search_stations
 from get_sensors_data import get_sensors_data
 from get_measurements_data import get_measurements_data
 from measurement_analysis import MeasurementAnalysis
@@ -73,7 +77,7 @@ class CommandCity(Tk):
         self.button_city = Button(self.frame, text="Szukaj", command=self.show_city)
         self.button_stationId = Button(self.frame, text="Szukaj", command=self.show_sensors_data)
         self.button_id = Button(self.frame, text="Szukaj", command=self.show_measurements_data)
-        self.button_analysis = Button(self.frame, text="Analiza danych", command=AnalysisWindow)
+        self.button_analysis = Button(self.frame, text="Analiza danych", command=self.show_analysis)
 
         self.label_city.grid(row=0, column=0, padx=10)
         self.label_staionId.grid(row=1, column=0, padx=10)
@@ -84,19 +88,16 @@ class CommandCity(Tk):
         self.entry_staionId.grid(row=1, column=1, padx=10)
         self.entry_id.grid(row=2, column=1, padx=10)
 
+        self.entry_city.bind("<KeyRelease>", lambda event: self.show_city())
+
         self.button_city.grid(row=0, column=2, padx=10)
         self.button_stationId.grid(row=1, column=2, padx=10)
         self.button_id.grid(row=2, column=2, padx=10)
         self.button_analysis.grid(row=3, column=1, padx=10)
 
-        get_stations_data()
+        self.conn = get_connection()
 
-        self.conn = sqlite3.connect('database.db')
-        cursor = self.conn.cursor()
-        cursor.execute('SELECT * FROM stations')
-        result = cursor.fetchall()
-
-        for row in result:
+        for row in get_stations():
             self.listbox.insert(tk.END, row)
 
         self.mainloop()
@@ -115,13 +116,20 @@ class CommandCity(Tk):
         get_measurements_data(id)
 
         cursor = self.conn.cursor()
-        cursor.execute('SELECT * FROM measurements')
+        cursor.execute('SELECT values_date, values_value FROM measurements WHERE sensor_id = ? '
+                       'ORDER BY values_date DESC', (id,))
         result = cursor.fetchall()
 
         for row in result:
             self.listbox.insert(tk.END, row)
 
-        MeasurementAnalysis().chart()
+        MeasurementAnalysis(sensor_id=id).chart()
+
+    def show_analysis(self):
+        """
+            Otwiera okno analizy danych dla stanowiska o ID podanym w polu entry_id.
+        """
+        AnalysisWindow(int(self.entry_id.get()))
 
     def show_sensors_data(self):
         """
@@ -136,7 +144,7 @@ class CommandCity(Tk):
         get_sensors_data(stationId)
 
         cursor = self.conn.cursor()
-        cursor.execute('SELECT * FROM sensors')
+        cursor.execute('SELECT * FROM sensors WHERE station_id = ?', (stationId,))
         result = cursor.fetchall()
 
         for row in result:
@@ -146,16 +154,14 @@ class CommandCity(Tk):
         """
             Wyświetla listę stacji pomiarowych w wybranej miejscowości.
 
-            Pobiera wartość nazwy miejscowości z pola entry_city, pobiera z bazy danych odpowiednie stacje pomiarowe,
-            o ile występują i wyświetla je w listboxie.
+            Pobiera wartość nazwy miejscowości z pola entry_city, wyszukuje w indeksie wyszukiwania odpowiednie stacje
+            pomiarowe, o ile występują i wyświetla je w listboxie, od najlepiej dopasowanych.
         """
         self.listbox.delete(0, END)
 
         city_name = str(self.entry_city.get())
 
-        cursor = self.conn.cursor()
-        cursor.execute('SELECT * FROM stations WHERE city_name = ?', (city_name,))
-        result = cursor.fetchall()
+        result = search_stations(city_name, limit=100)
 
         for row in result:
             self.listbox.insert(tk.END, row)
@@ -10,20 +10,20 @@ która kolejno:
 
 Moduł zawiera następujące elementy:
 - Tkinter - moduł do tworzenia interfejsu użytkownika,
-- sqlite3 - moduł do łączenia z bazą danych database.db,
-- get_stations_data - funkcja pobiera listę wszystkich stacji pomiarowych i zapisuje ją w bazie danych SQL,
+- database - moduł zarządzający połączeniami z bazą danych database.db,
+- station_registry - moduł udostępniający zapisaną listę stacji pomiarowych i odświeżający ją w tle,
 - get_sensors_data - funkcja pobiera listę stanowisk pomiarowych wybranej stacji i zapisuje ją w bazie danych SQL,
 - get_measurements_data - funkcja pobiera listę pomiarów wybranego parametru i zapisuje ją w bazie danych SQL,
 - MeasurementAnalysis - klasa do tworzenia analizy danych, w tym wykresów,
 - AnalysisWindow - GUI do okienka analizy danych.
 """
 
-from get_stations_data import get_stations_data
+from station_registry import get_stations
 from get_sensors_data import get_sensors_data
 from get_measurements_data import get_measurements_data
 from tkinter import *
 import tkinter as tk
-import sqlite3
+from database import get_connection
 from measurement_analysis import MeasurementAnalysis
 from print_analysis import AnalysisWindow
 
@@ -68,7 +68,7 @@ class CommandFull(Tk):
 
         self.button_stationId = Button(self.frame, text="Szukaj", command=self.show_sensors_data)
         self.button_id = Button(self.frame, text="Szukaj", command=self.show_measurements_data)
-        self.button_analysis = Button(self.frame, text="Analiza danych", command=AnalysisWindow)
+        self.button_analysis = Button(self.frame, text="Analiza danych", command=self.show_analysis)
 
         self.label_staionId.grid(row=1, column=0, padx=10)
         self.label_id.grid(row=2, column=0, padx=10)
@@ -81,14 +81,9 @@ class CommandFull(Tk):
         self.button_id.grid(row=2, column=2, padx=10)
         self.button_analysis.grid(row=3, column=1, padx=10)
 
-        get_stations_data()
+        self.conn = get_connection()
 
-        self.conn = sqlite3.connect('database.db')
-        cursor = self.conn.cursor()
-        cursor.execute('SELECT * FROM stations')
-        result = cursor.fetchall()
-
-        for row in result:
+        for row in get_stations():
             self.listbox.insert(tk.END, row)
 
         self.mainloop()
@@ -107,13 +102,20 @@ class CommandFull(Tk):
         get_measurements_data(id)
 
         cursor = self.conn.cursor()
-        cursor.execute('SELECT * FROM measurements')
+        cursor.execute('SELECT values_date, values_value FROM measurements WHERE sensor_id = ? '
+                       'ORDER BY values_date DESC', (id,))
         result = cursor.fetchall()
 
         for row in result:
             self.listbox.insert(tk.END, row)
 
-        MeasurementAnalysis().chart()
+        MeasurementAnalysis(sensor_id=id).chart()
+
+    def show_analysis(self):
+        """
+            Otwiera okno analizy danych dla stanowiska o ID podanym w polu entry_id.
+        """
+        AnalysisWindow(int(self.entry_id.get()))
 
     def show_sensors_data(self):
         """
@@ -128,7 +130,7 @@ class CommandFull(Tk):
         get_sensors_data(stationId)
 
         cursor = self.conn.cursor()
-        cursor.execute('SELECT * FROM sensors')
+        cursor.execute('SELECT * FROM sensors WHERE station_id = ?', (stationId,))
         result = cursor.fetchall()
 
         for row in result:
@@ -11,9 +11,10 @@ CommandLocation, która kolejno:
 
 Moduł zawiera następujące elementy:
 - Tkinter - moduł do tworzenia interfejsu użytkownika,
-- sqlite3 - moduł do łączenia z bazą danych database.db,
-- geopy - moduł do geolokalizacji,
-- get_stations_data - funkcja pobiera listę wszystkich stacji pomiarowych i zapisuje ją w bazie danych SQL,
+- database - moduł zarządzający połączeniami z bazą danych database.db,
+- geocoding - moduł zamieniający nazwę miejscowości na współrzędne (lokalny słownik miejscowości i pamięć podręczna),
+- spatial_index - moduł z indeksem przestrzennym stacji (wyszukiwanie stacji w zadanym promieniu),
+- station_registry - moduł udostępniający zapisaną listę stacji pomiarowych i odświeżający ją w tle,
 - get_sensors_data - funkcja pobiera listę stanowisk pomiarowych wybranej stacji i zapisuje ją w bazie danych SQL,
 - get_measurements_data - funkcja pobiera listę pomiarów wybranego parametru i zapisuje ją w bazie danych SQL,
 - MeasurementAnalysis - klasa do tworzenia analizy danych, w tym wykresów,
@@ -22,10 +23,10 @@ Moduł zawiera następujące elementy:
 
 from tkinter import *
 import tkinter as tk
-import sqlite3
-from geopy.geocoders import Nominatim
-from geopy.distance import great_circle
-from get_stations_data import get_stations_data
+from database import get_connection
+from geocoding import geocode
+from spatial_index import station_index
+from station_registry import get_stations
 from get_sensors_data import get_sensors_data
 from get_measurements_data import get_measurements_data
 from measurement_analysis import MeasurementAnalysis
@@ -78,7 +79,7 @@ class CommandLocation(Tk):
         self.button_localization = Button(self.frame, text="Szukaj", command=self.show_stations_by_location)
         self.button_stationId = Button(self.frame, text="Szukaj", command=self.show_sensors_data)
         self.button_id = Button(self.frame, text="Szukaj", command=self.show_measurements_data)
-        self.button_analysis = Button(self.frame, text="Analiza danych", command=AnalysisWindow)
+        self.button_analysis = Button(self.frame, text="Analiza danych", command=self.show_analysis)
 
         self.label_localization.grid(row=0, column=0, padx=10)
         self.label_radius.grid(row=1, column=0, padx=10)
@@ -96,14 +97,9 @@ class CommandLocation(Tk):
         self.button_id.grid(row=3, column=2, padx=10)
         self.button_analysis.grid(row=4, column=1, padx=10)
 
-        get_stations_data()
+        self.conn = get_connection()
 
-        self.conn = sqlite3.connect('database.db')
-        cursor = self.conn.cursor()
-        cursor.execute('SELECT * FROM stations')
-        result = cursor.fetchall()
-
-        for row in result:
+        for row in get_stations():
             self.listbox.insert(tk.END, row)
 
         self.mainloop()
@@ -122,13 +118,20 @@ class CommandLocation(Tk):
         get_measurements_data(id)
 
         cursor = self.conn.cursor()
-        cursor.execute('SELECT * FROM measurements')
+        cursor.execute('SELECT values_date, values_value FROM measurements WHERE sensor_id = ? '
+                       'ORDER BY values_date DESC', (id,))
         result = cursor.fetchall()
 
         for row in result:
             self.listbox.insert(tk.END, row)
 
-        MeasurementAnalysis().chart()
+        MeasurementAnalysis(sensor_id=id).chart()
+
+    def show_analysis(self):
+        """
+            Otwiera okno analizy danych dla stanowiska o ID podanym w polu entry_id.
+        """
+        AnalysisWindow(int(self.entry_id.get()))
 
     def show_sensors_data(self):
         """
@@ -143,7 +146,7 @@ class CommandLocation(Tk):
         get_sensors_data(stationId)
 
         cursor = self.conn.cursor()
-        cursor.execute('SELECT * FROM sensors')
+        cursor.execute('SELECT * FROM sensors WHERE station_id = ?', (stationId,))
         result = cursor.fetchall()
 
         for row in result:
@@ -154,39 +157,22 @@ class CommandLocation(Tk):
             Wyświetla listę dostępnych stacji pomiarowych o zadanym zasięgu od zadanej miejscowości.
 
             Pobiera wartość nazwy miejscowości z pola entry_localization oraz zasięg (w km) z pola entry_radius, a
-        następnie pobiera z bazy danych odpowiednie stacje pomiarowe, o ile występują i wyświetla je w listboxie.
+        następnie wyszukuje w indeksie przestrzennym stacje pomiarowe w tym zasięgu, o ile występują i wyświetla je
+        w listboxie od najbliższej, wraz z odległością w km.
         """
         self.listbox.delete(0, END)
 
         address = str(self.entry_localization.get())
         radius = float(self.entry_radius.get())
 
-        geolocator = Nominatim(user_agent="11.04")
-        location = geolocator.geocode(address)
-        user_lat, user_lon = location.latitude, location.longitude
+        location = geocode(address)
+        if location is None:
+            self.listbox.insert(tk.END, f'NIE ZNALEZIONO LOKALIZACJI: {address}')
+            return
+        user_lat, user_lon = location
 
-        cursor = self.conn.cursor()
-        cursor.execute("BEGIN IMMEDIATE")
-        cursor.execute("ALTER TABLE stations ADD COLUMN distance FLOAT")
-        cursor.execute("SELECT station_name, gegr_lat, gegr_lon FROM stations")
-        stations = cursor.fetchall()
-
-        distances = []
-        for row in stations:
-            station_name, station_lat, station_lon = row
-            distance = great_circle((user_lat, user_lon), (station_lat, station_lon)).km
-            if distance <= radius:  # dodaj tylko te stacje, które mieszczą się w zasięgu
-                distances.append((row, distance))
-                cursor.execute("UPDATE stations SET distance = ? WHERE station_name = ?", (distance, station_name))
-
-        cursor.execute("SELECT * FROM stations WHERE distance <= ?", (radius,))
-
-        stations = cursor.fetchall()
-        stations.sort(key=lambda x: x[2])
-
-        cursor.execute("COMMIT")  # zakończenie transakcji
-
-        for row in stations:
-            self.listbox.insert(tk.END, row)
+        # stacje w zasięgu, od najbliższej - wiersz stacji uzupełniony o odległość w km
+        for distance, row in station_index().within_radius(user_lat, user_lon, radius):
+            self.listbox.insert(tk.END, row + (round(distance, 3),))
 
 if __name__ == '__main__': CommandLocation()
\ No newline at end of file
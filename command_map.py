@@ -2,33 +2,46 @@
 """
     Moduł stanowiący instrukcję przycisku "Wybierz punkt na mapie" głównego okna. Zawiera klasę CommandMap, która 
 kolejno:
-- wyświetla mapę z naniesionymi punktami lokalizacji stacji pomiarowych,
-- po kliknięciu wybranego punktu na mapie - wyświetla listę stacji pomiarowych z wklejonym id klikniętego punktu,
+- wyświetla mapę z naniesionymi punktami lokalizacji stacji pomiarowych (bliskie stacje łączone są w klastry zależnie
+  od przybliżenia; mapę można przybliżać kółkiem myszy lub przyciskami +/- i przesuwać, przeciągając ją myszą),
+- po wybraniu parametru z listy "Rozkład parametru" - nakłada na mapę rozkład jego najnowszych wartości, a po wybraniu
+  indeksu jakości powietrza - koloruje punkty stacji według kategorii indeksu (klastry - według najgorszej stacji),
+- po wskazaniu punktu kursorem - wyświetla podpowiedź z nazwą stacji i najnowszymi wartościami jej stanowisk,
+- po kliknięciu wybranego punktu na mapie - wyświetla listę stanowisk pomiarowych stacji z wklejonym id klikniętego
+  punktu,
 - po wybraniu id parametru - wyświetla wykres danych oraz ich listę,
 - po zamknięciu okienka wykresu, a następnie kliknięciu przysciku analizuj - wyświetla linię trendu oraz prostą analizę 
   danych.
 
 Moduł zawiera następujące elementy:
 - Tkinter - moduł do tworzenia interfejsu użytkownika,
-- sqlite3 - moduł do łączenia z bazą danych database.db,
+- database - moduł zarządzający połączeniami z bazą danych database.db,
 - geopy - moduł do geolokalizacji,
-- get_stations_data - funkcja pobiera listę wszystkich stacji pomiarowych i zapisuje ją w bazie danych SQL,
+- map_layer - moduł zawierający warstwę mapy (zapamiętane położenia i klastry stacji) oraz piramidę obrazów mapy,
+- heat_map - moduł zawierający interpolowany rozkład wybranego parametru nad Polską, nakładany na mapę,
+- air_quality_index - moduł zawierający indeksy jakości powietrza stacji,
 - get_sensors_data - funkcja pobiera listę stanowisk pomiarowych wybranej stacji i zapisuje ją w bazie danych SQL,
-- get_measurements_data - funkcja pobiera listę pomiarów wybranego parametru i zapisuje ją w bazie danych SQL,
+- get_measurements_data - funkcja pobiera listę pomiarów wybranego parametru i zapisuje ją w bazie danych SQL
+  (oraz funkcja latest_station_values, odczytująca najnowsze wartości stanowisk stacji do podpowiedzi na mapie),
 - MeasurementAnalysis - klasa do tworzenia analizy danych, w tym wykresów,
 - AnalysisWindow - GUI do okienka analizy danych.
 """
 
 from tkinter import *
 import tkinter as tk
-import sqlite3
+from database import get_connection
 from PIL import Image, ImageTk
-from get_stations_data import get_stations_data
+from map_layer import ZOOM_LEVELS, map_layer, map_pyramid
+from heat_map import COLOR_SCALE, PARAMETERS, heat_map, raster_image
+from air_quality_index import LEVELS, LEVEL_COLORS, refresh_station_index, station_index, station_index_levels
 from get_sensors_data import get_sensors_data
-from get_measurements_data import get_measurements_data
+from get_measurements_data import get_measurements_data, latest_station_values
 from measurement_analysis import MeasurementAnalysis
 from print_analysis import AnalysisWindow
 
+NO_OVERLAY = "brak"
+INDEX_OVERLAY = "indeks jakości"
+
 class CommandMap(Toplevel):
     """
         Klasa wyświetla mapę Polski z zaznaczonymi punktami lokalizacji stacji pomiarowych. Po kliknięciu na dany punkt
@@ -53,35 +66,220 @@ class CommandMap(Toplevel):
         label_name.pack()
         label_line.pack()
 
-        map_image = Image.open("Poland_map.png")
-        map_width, map_height = map_image.size
-        min_longtitude = 14.15
-        max_longtitude = 24.2
-        min_latitude = 49
-        max_latitude = 54.9
+        self.pyramid = map_pyramid()
+        self.layer = map_layer()
+        self.map_width, self.map_height = self.pyramid.size
+        self.zoom_index = 0
+        self.left = self.top = 0
+        self.drag_start = None
+        self.hovered = None
+        self.overlay = None
+        self.index_levels = None
+
+        self.canvas = tk.Canvas(self, width=self.map_width, height=self.map_height)
+        self.canvas.pack()
+        zoom_frame = tk.Frame(self)
+        zoom_frame.pack()
+        Button(zoom_frame, text="+", width=3, command=lambda: self.zoom_by(1)).pack(side=tk.LEFT)
+        Button(zoom_frame, text="-", width=3, command=lambda: self.zoom_by(-1)).pack(side=tk.LEFT)
+        tk.Label(zoom_frame, text="   Rozkład parametru:").pack(side=tk.LEFT)
+        self.parameter = tk.StringVar(value=NO_OVERLAY)
+        OptionMenu(zoom_frame, self.parameter, NO_OVERLAY, INDEX_OVERLAY, *PARAMETERS,
+                   command=self.show_heat_map).pack(side=tk.LEFT)
+        self.overlay_label = tk.Label(zoom_frame, text="")
+        self.overlay_label.pack(side=tk.LEFT)
+
+        self.canvas.bind("<ButtonPress-1>", self.on_press)
+        self.canvas.bind("<B1-Motion>", self.on_drag)
+        self.canvas.bind("<ButtonRelease-1>", self.on_release)
+        self.canvas.bind("<Motion>", self.on_hover)
+        self.canvas.bind("<Leave>", lambda event: self.hide_tooltip())
+        self.canvas.bind("<MouseWheel>", lambda event: self.zoom_by(1 if event.delta > 0 else -1, event.x, event.y))
+        self.canvas.bind("<Button-4>", lambda event: self.zoom_by(1, event.x, event.y))
+        self.canvas.bind("<Button-5>", lambda event: self.zoom_by(-1, event.x, event.y))
+
+        self.conn = get_connection()
+        self.render()
 
-        canvas = tk.Canvas(self, width=map_width, height=map_height)
-        canvas.pack()
-        map_image_tk = ImageTk.PhotoImage(map_image)
-        canvas.create_image(0, 0, anchor=tk.NW, image=map_image_tk)
+        self.mainloop()
 
-        get_stations_data()
+    def show_heat_map(self, param_code):
+        """
+            Nakłada na mapę rozkład wybranego parametru z najnowszej godziny pomiarów (siatka z pamięci podręcznej
+        modułu heat_map), koloruje stacje według indeksu jakości powietrza albo usuwa nakładkę.
+        """
+        self.overlay = None
+        self.index_levels = None
+        self.overlay_label.config(text="")
+        if param_code == INDEX_OVERLAY:
+            with self.conn:
+                refresh_station_index(self.conn)
+            self.index_levels = station_index_levels(self.conn)
+            self.overlay_label.config(text=f"stacji z indeksem: {len(self.index_levels)}")
+        elif param_code != NO_OVERLAY:
+            result = heat_map(param_code)
+            if result is None or not result.stations:
+                self.overlay_label.config(text="BRAK POMIARÓW")
+            else:
+                self.overlay = raster_image(result.raster, COLOR_SCALE[param_code], (self.map_width, self.map_height))
+                self.overlay_label.config(text=f"{result.hour}:00, stacji: {result.stations}")
+        self.render()
+
+    def visible_image(self):
+        """
+            Zwraca widoczny fragment mapy dla bieżącego przybliżenia, z nałożonym rozkładem parametru (jeśli wybrany).
+        """
+        zoom = self.zoom
+        image = self.pyramid.crop(zoom, self.left, self.top, self.map_width, self.map_height)
+        if self.overlay is None:
+            return image
+        overlay = self.overlay.crop((self.left / zoom, self.top / zoom, (self.left + self.map_width) / zoom,
+                                     (self.top + self.map_height) / zoom)).resize(image.size, Image.BILINEAR)
+        return Image.alpha_composite(image.convert("RGBA"), overlay)
+
+    @property
+    def zoom(self):
+        return ZOOM_LEVELS[self.zoom_index]
+
+    def render(self):
+        """
+            Rysuje widoczny fragment mapy dla bieżącego przybliżenia: wycinek gotowego obrazu z piramidy i znaczniki
+        (stacje lub klastry stacji) z widocznego obszaru. Położenia i klastry pochodzą z zapamiętanej warstwy mapy.
+        """
+        zoom = self.zoom
+        self.hovered = None
+        self.canvas.delete("all")
+        self.map_image_tk = ImageTk.PhotoImage(self.visible_image())
+        self.canvas.create_image(0, 0, anchor=tk.NW, image=self.map_image_tk)
+
+        #  dodanie punktów i podpisów stacji pomiarowych (lub klastrów stacji) z widocznego obszaru mapy:
+        level = self.layer.clusters(zoom)
+        for index in self.layer.visible(zoom, self.left, self.top, self.map_width, self.map_height):
+            x = level.x[index] * zoom - self.left
+            y = level.y[index] * zoom - self.top
+            count = int(level.counts[index])
+            if count == 1:
+                id = int(level.members[index][0])
+                # rysowanie okręgu reprezentującego stację
+                self.canvas.create_oval(x - 5, y - 5, x + 5, y + 5, fill=self.marker_color([id], "red"),
+                                        outline="black")
+                self.canvas.create_text(x, y + 10, text=str(id), font=("Arial", 6))
+            else:
+                # rysowanie okręgu reprezentującego klaster stacji, z liczbą stacji
+                radius = 8 + 2 * count.bit_length()
+                self.canvas.create_oval(x - radius, y - radius, x + radius, y + radius,
+                                        fill=self.marker_color(level.members[index], "orange"), outline="black")
+                self.canvas.create_text(x, y, text=str(count), font=("Arial", 7, "bold"))
+
+    def marker_color(self, station_ids, default):
+        """
+            Zwraca kolor znacznika: kolor najgorszej kategorii indeksu jakości powietrza wśród stacji znacznika (szary,
+        jeśli żadna nie ma indeksu), gdy stacje kolorowane są według indeksu, a w przeciwnym razie kolor default.
+        """
+        if self.index_levels is None:
+            return default
+        levels = [self.index_levels[int(station_id)] for station_id in station_ids
+                  if int(station_id) in self.index_levels]
+        return LEVEL_COLORS[max(levels)] if levels else "gray"
 
-        self.conn = sqlite3.connect('database.db')
-        cursor = self.conn.cursor()
-        cursor.execute('SELECT id, gegr_lat, gegr_lon FROM stations')
-        stations = cursor.fetchall()
-
-        #  dodanie punktów  i podpisów stacji pomiarowych na mapie:
-        for id, latitude, longitude in stations:
-            x = int((float(longitude) - min_longtitude) * (map_width / (max_longtitude - min_longtitude)))
-            y = int((max_latitude - float(latitude)) * (map_height / (max_latitude - min_latitude)))
-            # rysowanie okręgu reprezentującego stację
-            circle=canvas.create_oval(x - 5, y - 5, x + 5, y + 5, fill="red", outline="black", tags=(id))
-            canvas.create_text(x, y + 10, text=str(id), font=("Arial", 6))
-            canvas.tag_bind(circle, "<Button-1>", self.on_point_click)
+    def scroll_to(self, left, top):
+        """
+            Ustawia lewy górny róg widoku (w pikselach przybliżonej mapy), nie wychodząc poza mapę.
+        """
+        self.left = int(min(max(left, 0), self.map_width * (self.zoom - 1)))
+        self.top = int(min(max(top, 0), self.map_height * (self.zoom - 1)))
 
-        self.mainloop()
+    def zoom_by(self, step, x=None, y=None):
+        """
+            Zmienia poziom przybliżenia o step, zachowując w miejscu punkt mapy pod kursorem (domyślnie środek widoku).
+        """
+        zoom_index = min(max(self.zoom_index + step, 0), len(ZOOM_LEVELS) - 1)
+        if zoom_index == self.zoom_index:
+            return
+        x = self.map_width / 2 if x is None else x
+        y = self.map_height / 2 if y is None else y
+        base_x, base_y = (self.left + x) / self.zoom, (self.top + y) / self.zoom
+        self.zoom_index = zoom_index
+        self.scroll_to(base_x * self.zoom - x, base_y * self.zoom - y)
+        self.render()
+
+    def marker_at(self, event):
+        """
+            Zwraca indeks znacznika pod kursorem (z indeksu siatki pikseli warstwy mapy) albo None.
+        """
+        return self.layer.marker_at(self.zoom, self.left + event.x, self.top + event.y)
+
+    def on_press(self, event):
+        self.hide_tooltip()
+        self.drag_start = self.drag_last = (event.x, event.y)
+
+    def on_drag(self, event):
+        """
+            Przesuwa narysowane elementy razem z kursorem. Mapa rysowana jest ponownie dopiero po puszczeniu przycisku.
+        """
+        self.canvas.move("all", event.x - self.drag_last[0], event.y - self.drag_last[1])
+        self.drag_last = (event.x, event.y)
+
+    def on_release(self, event):
+        """
+            Kończy przesuwanie mapy albo - jeśli kursor się nie przesunął - obsługuje kliknięcie znacznika: klaster
+        jest przybliżany, a dla stacji otwierane jest okienko wyboru stanowiska pomiarowego.
+        """
+        dx, dy = event.x - self.drag_start[0], event.y - self.drag_start[1]
+        if abs(dx) > 3 or abs(dy) > 3:
+            self.scroll_to(self.left - dx, self.top - dy)
+            self.render()
+            return
+        self.canvas.move("all", -dx, -dy)
+        index = self.marker_at(event)
+        if index is None:
+            return
+        level = self.layer.clusters(self.zoom)
+        if level.counts[index] == 1:
+            self.on_point_click(int(level.members[index][0]))
+        else:
+            self.zoom_by(1, event.x, event.y)
+
+    def on_hover(self, event):
+        """
+            Pokazuje podpowiedź dla znacznika pod kursorem: nazwę stacji i najnowsze wartości jej stanowisk albo liczbę
+        stacji klastra. Podpowiedź odczytywana jest z bazy tylko przy zmianie wskazanego znacznika.
+        """
+        index = self.marker_at(event)
+        if index != self.hovered:
+            self.hide_tooltip()
+            self.hovered = index
+            if index is not None:
+                self.tooltip_text = self.tooltip(index)
+        if index is not None:
+            self.show_tooltip(event.x, event.y)
+
+    def tooltip(self, index):
+        level = self.layer.clusters(self.zoom)
+        if level.counts[index] > 1:
+            return f"Stacji: {level.counts[index]} (kliknij, aby przybliżyć)"
+        station_id = int(level.members[index][0])
+        name = self.conn.execute('SELECT station_name FROM stations WHERE id = ?', (station_id,)).fetchone()
+        lines = [f"{station_id}: {name[0] if name else ''}"]
+        index = station_index(self.conn, station_id)
+        if index is not None and index['index_level'] is not None:
+            lines.append(f"Indeks jakości powietrza: {LEVELS[index['index_level']]} ({index['dominant']})")
+        for param_code, value, date in latest_station_values(self.conn, station_id):
+            lines.append(f"{param_code}: {value} ({date})")
+        return "\n".join(lines)
+
+    def show_tooltip(self, x, y):
+        self.canvas.delete("tooltip")
+        text = self.canvas.create_text(x + 12, y + 12, text=self.tooltip_text, anchor=tk.NW, font=("Arial", 8),
+                                       tags="tooltip")
+        left, top, right, bottom = self.canvas.bbox(text)
+        background = self.canvas.create_rectangle(left - 3, top - 3, right + 3, bottom + 3, fill="lightyellow",
+                                                  outline="black", tags="tooltip")
+        self.canvas.tag_lower(background, text)
+
+    def hide_tooltip(self):
+        self.hovered = None
+        self.canvas.delete("tooltip")
 
     def show_measurements_data(self):
         """
@@ -97,13 +295,20 @@ class CommandMap(Toplevel):
         get_measurements_data(id)
 
         cursor = self.conn.cursor()
-        cursor.execute('SELECT * FROM measurements')
+        cursor.execute('SELECT values_date, values_value FROM measurements WHERE sensor_id = ? '
+                       'ORDER BY values_date DESC', (id,))
         result = cursor.fetchall()
 
         for row in result:
             self.listbox.insert(tk.END, row)
 
-        MeasurementAnalysis().chart()
+        MeasurementAnalysis(sensor_id=id).chart()
+
+    def show_analysis(self):
+        """
+            Otwiera okno analizy danych dla stanowiska o ID podanym w polu entry_id.
+        """
+        AnalysisWindow(int(self.entry_id.get()))
 
     def show_sensors_data(self):
         """
@@ -118,22 +323,22 @@ class CommandMap(Toplevel):
         get_sensors_data(stationId)
 
         cursor = self.conn.cursor()
-        cursor.execute('SELECT * FROM sensors')
+        cursor.execute('SELECT * FROM sensors WHERE station_id = ?', (stationId,))
         result = cursor.fetchall()
 
         for row in result:
             self.listbox.insert(tk.END, row)
 
-    def on_point_click(self, event):
+    def on_point_click(self, station_id):
         """
-            Otwiera okienko z listboxem, w którym wyświetla się lista wszytskich stacji pomiarowych. Nr ID klikniętego
-        punktu na mapie wyświetla się automatycznie jako entry w okienku wyboru id stacji pomiarowej.
+            Otwiera okienko z listboxem, w którym wyświetla się lista stanowisk pomiarowych klikniętej stacji. Nr ID
+        klikniętego punktu na mapie wyświetla się automatycznie jako entry w okienku wyboru id stacji pomiarowej.
         """
-        tag = event.widget.gettags("current")[0]
+        name = self.conn.execute('SELECT station_name FROM stations WHERE id = ?', (station_id,)).fetchone()
         new_window = tk.Toplevel()
         new_window.title("AirQualityApp")
         new_window.geometry('900x750')
-        tag_label = tk.Label(new_window, text=f"---Stacja o id: {tag}---")
+        tag_label = tk.Label(new_window, text=f"---Stacja o id: {station_id}{f' ({name[0]})' if name else ''}---")
         tag_label.pack()
 
         frame = tk.Frame(new_window)
@@ -150,12 +355,12 @@ class CommandMap(Toplevel):
         label_analysis = tk.Label(frame, text="DOKONAJ ANALIZY DANYCH")
 
         self.entry_staionId = tk.Entry(frame, bd=5)
-        self.entry_staionId.insert(0, tag)
+        self.entry_staionId.insert(0, station_id)
         self.entry_id = tk.Entry(frame, bd=5)
 
         button_stationId = Button(frame, text="Szukaj", command=self.show_sensors_data)
         button_id = Button(frame, text="Szukaj", command=self.show_measurements_data)
-        button_analysis = Button(frame, text="Analiza danych", command=AnalysisWindow)
+        button_analysis = Button(frame, text="Analiza danych", command=self.show_analysis)
 
         label_staionId.grid(row=1, column=0, padx=10)
         label_id.grid(row=2, column=0, padx=10)
@@ -168,13 +373,7 @@ class CommandMap(Toplevel):
         button_id.grid(row=2, column=2, padx=10)
         button_analysis.grid(row=3, column=1, padx=10)
 
-        conn = sqlite3.connect('database.db')
-        cursor = conn.cursor()
-        cursor.execute('SELECT * FROM stations')
-        result = cursor.fetchall()
-
-        for row in result:
-            self.listbox.insert(tk.END, row)
+        self.show_sensors_data()
 
         self.mainloop()
 
@@ -0,0 +1,187 @@
+"--------------------------------------------------MODUŁ: data_loader--------------------------------------------------"
+"""
+    Moduł zawierający wspólny potok wczytywania danych z serwisu GIOŚ do bazy danych database.db. Odpowiedź serwisu
+zapisywana jest strumieniowo do pliku JSON (w pamięci podręcznej http_cache), który następnie jest parsowany
+przyrostowo - element po elemencie - bez wczytywania całego dokumentu do pamięci. Rekordy zamieniane są na krotki przez
+generatory i zapisywane w bazie danych partiami za pomocą executemany. Zużycie pamięci nie zależy więc od liczby
+wczytywanych wierszy.
+
+Moduł zawiera następujące elementy:
+- json - moduł do konwersji danych między formatem JSON a obiektami Pythona,
+- os - moduł do wykonywania operacji na plikach,
+- itertools - moduł do dzielenia strumienia wierszy na partie.
+"""
+
+import json
+import os
+from itertools import islice
+
+CHUNK_SIZE = 64 * 1024
+BATCH_SIZE = 1000
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = ' \t\n\r'
+
+
+def write_response(response, file_path):
+    """
+        Zapisuje treść odpowiedzi HTTP (otwartej z stream=True) do pliku porcjami. Dane trafiają najpierw do pliku
+    tymczasowego, który zastępuje plik docelowy dopiero po pobraniu całej odpowiedzi, więc przerwane pobieranie nie
+    niszczy poprzednich danych.
+
+        Args:
+            response (requests.Response): Odpowiedź serwisu.
+            file_path (str): Ścieżka pliku, do którego zapisywana jest odpowiedź.
+
+        Raises:
+            requests.exceptions.RequestException: W przypadku błędu podczas pobierania danych.
+    """
+    temp_path = file_path + '.part'
+    try:
+        with open(temp_path, 'wb') as f:
+            for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                f.write(chunk)
+        os.replace(temp_path, file_path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+class _JsonStream:
+    """
+        Bufor znaków odczytywanych porcjami z pliku, po którym przesuwa się parser.
+    """
+
+    def __init__(self, f):
+        self.f = f
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+
+    def fill(self):
+        """
+            Dokłada do bufora kolejną porcję pliku, usuwając już przetworzony początek. Zwraca False na końcu pliku.
+        """
+        chunk = self.f.read(CHUNK_SIZE)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """
+            Zwraca pierwszy znak różny od białego znaku (bez przesuwania pozycji) lub '' na końcu pliku.
+        """
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                return ''
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError(f'Niepoprawny dokument JSON: oczekiwano {char!r}')
+        self.pos += 1
+
+    def value(self):
+        """
+            Dekoduje kolejną wartość JSON, w razie potrzeby doczytując plik aż wartość będzie kompletna.
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if self.fill():
+                    continue
+                raise
+            # liczba na końcu bufora może być ucięta - doczytujemy, aby mieć pewność
+            if end == len(self.buffer) and not self.eof and self.fill():
+                continue
+            self.pos = end
+            return value
+
+
+def iter_json_array(file_path, key=None):
+    """
+        Generator zwracający kolejne elementy tablicy JSON zapisanej w pliku, bez wczytywania całego pliku do pamięci.
+
+        Args:
+            file_path (str): Ścieżka do pliku JSON.
+            key (str): Jeśli podany, dokument jest obiektem, a zwracane są elementy tablicy zapisanej pod tym kluczem.
+
+        Yields:
+            Kolejne elementy tablicy (najczęściej słowniki).
+
+        Example:
+            for measurement in iter_json_array('measurements.json', key='values'):
+                print(measurement['date'], measurement['value'])
+    """
+    with open(file_path, 'r', encoding='utf-8') as f:
+        stream = _JsonStream(f)
+
+        if key is not None:
+            stream.expect('{')
+            while True:
+                if stream.peek() == '}':
+                    return
+                name = stream.value()
+                stream.expect(':')
+                if name == key:
+                    break
+                stream.value()
+                if stream.peek() == ',':
+                    stream.pos += 1
+
+        stream.expect('[')
+        if stream.peek() == ']':
+            return
+        while True:
+            yield stream.value()
+            separator = stream.peek()
+            stream.pos += 1
+            if separator == ']':
+                return
+            if separator != ',':
+                raise ValueError('Niepoprawny dokument JSON: oczekiwano \',\' lub \']\'')
+
+
+def load_rows(conn, sql, rows, batch_size=BATCH_SIZE):
+    """
+        Zapisuje wiersze do bazy danych partiami za pomocą executemany. Funkcja nie zatwierdza transakcji - wszystkie
+    partie trafiają do transakcji otwartej przez wywołującego.
+
+        Args:
+            conn (sqlite3.Connection): Połączenie z bazą danych.
+            sql (str): Zapytanie INSERT z parametrami.
+            rows (iterable): Krotki z parametrami zapytania (np. generator).
+            batch_size (int): Liczba wierszy w jednej partii.
+
+        Returns:
+            int: Liczba zapisanych wierszy.
+    """
+    rows = iter(rows)
+    count = 0
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            return count
+        conn.executemany(sql, batch)
+        count += len(batch)
+
+
+def echo_rows(cursor, header):
+    """
+        Wypisuje w konsoli nagłówek oraz wiersze zwrócone przez kursor, pobierając je partiami.
+    """
+    print(header)
+    while True:
+        rows = cursor.fetchmany(BATCH_SIZE)
+        if not rows:
+            return
+        for row in rows:
+            print(row)
@@ -0,0 +1,94 @@
+"---------------------------------------------------MODUŁ: database---------------------------------------------------"
+"""
+    Moduł zarządzający połączeniami z bazą danych database.db, wspólny dla wszystkich modułów aplikacji. Każdy wątek
+otrzymuje jedno długo żyjące połączenie do danego pliku bazy danych, dzięki czemu kolejne kliknięcia w oknach aplikacji
+nie płacą za nawiązywanie połączenia, a przygotowane zapytania pozostają w pamięci podręcznej połączenia.
+    Połączenia są strojone przy otwarciu: dziennik WAL pozwala na równoczesny odczyt i zapis (np. okna aplikacji
+czytają dane, gdy scheduler zapisuje nowe pomiary), synchronous=NORMAL ogranicza liczbę wywołań fsync, a mmap_size
+i cache_size powiększają pamięć podręczną stron.
+
+Moduł zawiera następujące elementy:
+- sqlite3 - moduł do łączenia z bazą danych database.db,
+- os - moduł do operacji na ścieżkach plików,
+- threading - moduł do przechowywania połączeń osobno dla każdego wątku.
+"""
+
+import sqlite3
+import os
+import threading
+
+DB_FILE = 'database.db'
+CACHED_STATEMENTS = 256
+PRAGMAS = (
+    ('journal_mode', 'WAL'),
+    ('synchronous', 'NORMAL'),
+    ('mmap_size', 256 * 1024 * 1024),
+    ('cache_size', -32 * 1024),
+    ('temp_store', 'MEMORY'),
+    ('busy_timeout', 30000),
+)
+
+_local = threading.local()
+
+
+def _connections():
+    if not hasattr(_local, 'connections'):
+        _local.connections = {}
+    return _local.connections
+
+
+def connect(db_file=DB_FILE):
+    """
+        Otwiera nowe, nastrojone połączenie z bazą danych. Zwykle należy korzystać z get_connection - connect służy
+    procesom i wątkom, które potrzebują własnego połączenia na wyłączność.
+
+        Args:
+            db_file (str): Ścieżka do pliku bazy danych.
+
+        Returns:
+            sqlite3.Connection: Nowe połączenie z ustawionymi parametrami PRAGMA.
+    """
+    conn = sqlite3.connect(db_file, cached_statements=CACHED_STATEMENTS)
+    for name, value in PRAGMAS:
+        conn.execute(f'PRAGMA {name} = {value}')
+    return conn
+
+
+def get_connection(db_file=DB_FILE):
+    """
+        Zwraca połączenie z bazą danych przypisane do bieżącego wątku, otwierając je przy pierwszym użyciu.
+    Połączenia nie należy zamykać - jest współdzielone przez wszystkie moduły działające w tym wątku.
+
+        Args:
+            db_file (str): Ścieżka do pliku bazy danych.
+
+        Returns:
+            sqlite3.Connection: Połączenie z bazą danych.
+
+        Example:
+            conn = get_connection()
+            conn.execute('SELECT * FROM stations WHERE id = ?', (114,)).fetchone()
+    """
+    key = os.path.abspath(db_file)
+    connections = _connections()
+    if key not in connections:
+        connections[key] = connect(db_file)
+    return connections[key]
+
+
+def close_connection(db_file=DB_FILE):
+    """
+        Zamyka połączenie bieżącego wątku z danym plikiem bazy danych (np. przed usunięciem pliku).
+    """
+    conn = _connections().pop(os.path.abspath(db_file), None)
+    if conn is not None:
+        conn.close()
+
+
+def close_all():
+    """
+        Zamyka wszystkie połączenia bieżącego wątku.
+    """
+    connections = _connections()
+    while connections:
+        connections.popitem()[1].close()
@@ -0,0 +1,178 @@
+"--------------------------------------------------MODUŁ: decimation--------------------------------------------------"
+"""
+    Moduł zawierający funkcje zmniejszające liczbę punktów serii pomiarów przed narysowaniem wykresu, tak by wykres
+długiej historii rysował się szybko i pozostał czytelny. Dostępne są dwie metody:
+- LTTB (Largest-Triangle-Three-Buckets) - z każdego przedziału (kubełka) wybierany jest punkt tworzący największy
+  trójkąt z punktem wybranym w poprzednim kubełku i średnią następnego kubełka; zachowuje kształt przebiegu,
+- min/max - z każdego kubełka wybierane są wartość najmniejsza i największa; zachowuje wszystkie skrajne wartości.
+    Klasa DecimatedLine rysuje serię na osiach matplotlib i przy każdej zmianie zakresu osi (przybliżenie, przesunięcie)
+wybiera ponownie punkty z widocznego fragmentu, w liczbie odpowiadającej szerokości osi w pikselach. Wyniki
+zapamiętywane są dla każdego zakresu (poziomu przybliżenia).
+
+Moduł zawiera następujące elementy:
+- collections - moduł zawierający OrderedDict (pamięć podręczna wyników),
+- numpy - moduł do obliczeń na tablicach,
+- matplotlib - moduł, który został wykorzystany w celu generowania wykresów (przeliczanie dat osi x).
+"""
+
+from collections import OrderedDict
+import numpy as np
+from matplotlib import dates as mdates
+
+METHODS = ('lttb', 'minmax')
+CACHE_SIZE = 32
+
+
+def _as_float(x):
+    x = np.asarray(x)
+    return x.astype('datetime64[ns]').astype(np.int64).astype(np.float64) if np.issubdtype(x.dtype, np.datetime64) \
+        else x.astype(np.float64)
+
+
+def _bucket_bounds(size, buckets):
+    # pierwszy i ostatni punkt tworzą osobne kubełki, pozostałe punkty dzielone są na buckets równych przedziałów
+    return np.linspace(1, size - 1, buckets + 1).astype(np.intp)
+
+
+def lttb_indices(x, y, threshold):
+    """
+        Zwraca indeksy punktów wybranych metodą LTTB (rosnąco). Pierwszy i ostatni punkt są zawsze wybierane.
+
+        Args:
+            x (array-like): Współrzędne x (liczby lub daty numpy.datetime64), rosnąco.
+            y (array-like): Wartości, bez NaN.
+            threshold (int): Docelowa liczba punktów (co najmniej 3).
+    """
+    size = len(y)
+    if threshold >= size or threshold < 3:
+        return np.arange(size)
+    x = _as_float(x)
+    y = np.asarray(y, dtype=np.float64)
+    bounds = _bucket_bounds(size, threshold - 2)
+    # średnie wszystkich kubełków liczone jednocześnie; dla ostatniego kubełka "następnym" jest ostatni punkt
+    sums_x, sums_y = np.add.reduceat(x[1:size - 1], bounds[:-1] - 1), np.add.reduceat(y[1:size - 1], bounds[:-1] - 1)
+    counts = np.diff(bounds)
+    next_x = np.append(sums_x[1:] / counts[1:], x[-1])
+    next_y = np.append(sums_y[1:] / counts[1:], y[-1])
+
+    selected = np.empty(threshold, dtype=np.intp)
+    selected[0], selected[-1] = 0, size - 1
+    previous = 0
+    for bucket in range(threshold - 2):
+        start, stop = bounds[bucket], bounds[bucket + 1]
+        # podwojone pole trójkąta (poprzedni wybrany punkt, punkt kubełka, średnia następnego kubełka)
+        areas = np.abs((x[previous] - next_x[bucket]) * (y[start:stop] - y[previous])
+                       - (x[previous] - x[start:stop]) * (next_y[bucket] - y[previous]))
+        previous = start + int(np.argmax(areas))
+        selected[bucket + 1] = previous
+    return selected
+
+
+def minmax_indices(y, threshold):
+    """
+        Zwraca indeksy wartości najmniejszej i największej w każdym z threshold // 2 kubełków (rosnąco, bez powtórzeń).
+    Obliczenia są w pełni wektorowe.
+
+        Args:
+            y (array-like): Wartości, bez NaN.
+            threshold (int): Docelowa liczba punktów.
+    """
+    y = np.asarray(y, dtype=np.float64)
+    size = len(y)
+    buckets = max(threshold // 2, 1)
+    if threshold >= size:
+        return np.arange(size)
+    bucket = np.arange(size) * buckets // size
+    counts = np.bincount(bucket)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    selected = []
+    for reduce in (np.minimum, np.maximum):
+        # pierwszy punkt kubełka równy jego wartości skrajnej
+        candidates = np.flatnonzero(y == np.repeat(reduce.reduceat(y, starts), counts))
+        first = np.concatenate(([True], np.diff(bucket[candidates]) > 0))
+        selected.append(candidates[first])
+    return np.union1d(*selected)
+
+
+def decimate(x, y, threshold, method='lttb'):
+    """
+        Zmniejsza serię do około threshold punktów. Punkty bez wartości (NaN) są pomijane.
+
+        Args:
+            x (array-like): Współrzędne x (liczby lub daty numpy.datetime64), rosnąco.
+            y (array-like): Wartości.
+            threshold (int): Docelowa liczba punktów.
+            method (str): 'lttb' lub 'minmax'.
+
+        Returns:
+            tuple: Tablice x i y wybranych punktów.
+
+        Example:
+            x, y = decimate(df['values_date'].to_numpy(), df['values_value'].to_numpy(), 1000)
+    """
+    if method not in METHODS:
+        raise ValueError(f'Nieznana metoda decymacji: {method}')
+    x, y = np.asarray(x), np.asarray(y, dtype=np.float64)
+    valid = ~np.isnan(y)
+    if not valid.all():
+        x, y = x[valid], y[valid]
+    indices = lttb_indices(x, y, threshold) if method == 'lttb' else minmax_indices(y, threshold)
+    return x[indices], y[indices]
+
+
+class DecimatedLine:
+    """
+        Linia wykresu matplotlib rysująca serię zmniejszoną do szerokości osi w pikselach. Po zmianie zakresu osi x
+    widoczny fragment serii (wyszukiwany binarnie) jest zmniejszany ponownie; wyniki pamiętane są dla CACHE_SIZE
+    ostatnich zakresów.
+
+        Args:
+            ax (matplotlib.axes.Axes): Osie wykresu.
+            x (array-like): Daty (numpy.datetime64) lub liczby, rosnąco.
+            y (array-like): Wartości.
+            method (str): 'lttb' lub 'minmax'.
+            **kwargs: Argumenty przekazywane do ax.plot (np. label).
+    """
+
+    def __init__(self, ax, x, y, method='lttb', **kwargs):
+        self.ax = ax
+        self.x = np.asarray(x)
+        self.y = np.asarray(y, dtype=np.float64)
+        self.method = method
+        self._cache = OrderedDict()
+        self.line, = ax.plot(*self.points(0, len(self.x)), **kwargs)
+        ax.callbacks.connect('xlim_changed', self.on_xlim_changed)
+
+    def target(self):
+        return max(int(self.ax.bbox.width), 3)
+
+    def points(self, start, stop):
+        """
+            Zwraca zmniejszony fragment serii od indeksu start do stop (z pamięci podręcznej, jeśli był już liczony).
+        """
+        key = (start, stop, self.target())
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            return self._cache[key]
+        result = decimate(self.x[start:stop], self.y[start:stop], key[2], self.method)
+        self._cache[key] = result
+        while len(self._cache) > CACHE_SIZE:
+            self._cache.popitem(last=False)
+        return result
+
+    def visible_range(self):
+        """
+            Zwraca zakres indeksów punktów widocznych na osi x, powiększony o jeden punkt z każdej strony, by linia
+        dochodziła do krawędzi wykresu.
+        """
+        if not len(self.x):
+            return 0, 0
+        low, high = self.ax.get_xlim()
+        if np.issubdtype(self.x.dtype, np.datetime64):
+            low, high = (np.datetime64(mdates.num2date(value).replace(tzinfo=None), 'ns') for value in (low, high))
+        start = max(int(np.searchsorted(self.x, low, side='left')) - 1, 0)
+        stop = min(int(np.searchsorted(self.x, high, side='right')) + 1, len(self.x))
+        return start, stop
+
+    def on_xlim_changed(self, ax):
+        self.line.set_data(*self.points(*self.visible_range()))
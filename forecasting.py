@@ -0,0 +1,200 @@
+"--------------------------------------------------MODUŁ: forecasting--------------------------------------------------"
+"""
+    Moduł zawierający krótkoterminowe prognozy pomiarów stanowisk (domyślnie na HORIZON godzin naprzód) metodą
+Holta-Wintersa z tłumionym trendem i sezonowością dobową (addytywny składnik dla każdej godziny doby). Dla każdego
+stanowiska utrzymywany jest dopasowany model (tabela 'forecast_state'): poziom, trend, 24 składniki sezonowe i wariancja
+błędów prognozy jednogodzinnej ważona wykładniczo. Model aktualizowany jest w stałym czasie dla każdego nowego pomiaru
+w trakcie zapisu pomiarów, bez ponownego dopasowania do całej historii; godziny bez pomiaru przesuwają model o krok
+bez aktualizacji, a po przerwie dłuższej niż MAX_GAP godzin trend jest zerowany. Początkowe składniki sezonowe
+wyznaczane są z pierwszej doby pomiarów.
+    Prognoza to wartości modelu dla kolejnych godzin wraz z przedziałem PREDICTION_Z odchyleń standardowych
+(przybliżenie wariancji prognozy h-godzinnej modelu addytywnego). Prognoza jest dostępna, gdy model przetworzył
+co najmniej MIN_HISTORY pomiarów. Prognozy wielu stanowisk w puli procesów liczy funkcja batch_forecast modułu
+batch_analytics.
+
+Moduł zawiera następujące elementy:
+- json - moduł do zapisu składników sezonowych w bazie danych,
+- datetime - moduł do obliczeń na datach pomiarów,
+- numpy - moduł do obliczeń na tablicach,
+- pandas - moduł, który został wykorzystany do generowania dataframe.
+"""
+
+import json
+from datetime import datetime, timedelta
+import numpy as np
+import pandas as pd
+
+DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+SEASON = 24
+ALPHA = 0.2
+BETA = 0.02
+GAMMA = 0.1
+PHI = 0.98  # tłumienie trendu - prognoza dalekiego horyzontu nie rośnie bez końca
+ERROR_WEIGHT = 0.02
+HORIZON = 48
+MIN_HISTORY = 7 * SEASON
+MAX_GAP = 72
+PREDICTION_Z = 1.96
+# długość historii (w godzinach) wczytywanej do nowego modelu stanowiska, które ma już zapisane pomiary
+WARM_UP = 4 * 7 * SEASON
+
+
+def create_forecast_table(conn):
+    """
+        Tworzy tabelę 'forecast_state' (model prognozy każdego stanowiska), o ile jeszcze nie istnieje.
+
+        Args:
+            conn (sqlite3.Connection): Połączenie z bazą danych.
+    """
+    conn.execute('''CREATE TABLE IF NOT EXISTS forecast_state (
+                    sensor_id INTEGER NOT NULL PRIMARY KEY,
+                    last_date DATETIME NOT NULL,
+                    level REAL NOT NULL,
+                    trend REAL NOT NULL,
+                    season TEXT NOT NULL,
+                    count INTEGER NOT NULL,
+                    variance REAL NOT NULL)''')
+
+
+class ForecastModel:
+    """
+        Model Holta-Wintersa jednego stanowiska: poziom, trend, składniki sezonowe godzin doby, liczba przetworzonych
+    pomiarów, wariancja błędów prognozy jednogodzinnej i data ostatniego przetworzonego pomiaru.
+    """
+
+    def __init__(self, last_date=None, level=0.0, trend=0.0, season=None, count=0, variance=0.0):
+        self.last_date = last_date
+        self.level = level
+        self.trend = trend
+        self.season = list(season) if season is not None else [0.0] * SEASON
+        self.count = count
+        self.variance = variance
+
+    def update(self, date, value):
+        """
+            Dołącza pomiar (data w formacie DATE_FORMAT) do modelu.
+        """
+        hour = int(date[11:13])
+        if self.count < SEASON:
+            # pierwsza doba pomiarów wyznacza początkowe składniki sezonowe (odchylenia od średniej doby)
+            if self.count == 0:
+                self.level = value
+            self.season[hour] = value - self.level
+            if self.count == SEASON - 1:
+                shift = sum(self.season) / SEASON
+                self.level += shift
+                self.season = [component - shift for component in self.season]
+        else:
+            steps = int((datetime.strptime(date, DATE_FORMAT) -
+                         datetime.strptime(self.last_date, DATE_FORMAT)).total_seconds() // 3600)
+            if steps > MAX_GAP:
+                self.trend = 0.0
+            else:
+                for _ in range(steps - 1):
+                    self.level += PHI * self.trend
+                    self.trend *= PHI
+            error = value - (self.level + PHI * self.trend + self.season[hour])
+            self.variance = error * error if self.count == SEASON else \
+                (1 - ERROR_WEIGHT) * self.variance + ERROR_WEIGHT * error * error
+            level = ALPHA * (value - self.season[hour]) + (1 - ALPHA) * (self.level + PHI * self.trend)
+            self.trend = BETA * (level - self.level) + (1 - BETA) * PHI * self.trend
+            self.season[hour] = GAMMA * (value - level) + (1 - GAMMA) * self.season[hour]
+            self.level = level
+        self.count += 1
+        self.last_date = date
+
+    def predict(self, hours=HORIZON):
+        """
+            Zwraca prognozę na hours kolejnych godzin po ostatnim pomiarze: ramkę danych z kolumnami 'forecast',
+        'lower' i 'upper' (granice przedziału prognozy) i indeksem dat 'values_date'.
+        """
+        start = datetime.strptime(self.last_date, DATE_FORMAT)
+        dates = pd.DatetimeIndex([start + timedelta(hours=step) for step in range(1, hours + 1)], name='values_date')
+        steps = np.arange(1, hours + 1)
+        damping = np.cumsum(PHI ** steps)
+        season = np.array(self.season)[dates.hour]
+        mean = self.level + damping * self.trend + season
+        weights = ALPHA * (1 + steps * BETA) + GAMMA * (steps % SEASON == 0)
+        variance = self.variance * (1 + np.concatenate(([0.0], np.cumsum(weights[:-1] ** 2))))
+        spread = PREDICTION_Z * np.sqrt(variance)
+        return pd.DataFrame({'forecast': mean, 'lower': mean - spread, 'upper': mean + spread}, index=dates)
+
+
+def load_model(conn, sensor_id):
+    """
+        Odczytuje model stanowiska (nowy, pusty model, jeśli stanowisko nie było jeszcze przetwarzane).
+    """
+    row = conn.execute('SELECT last_date, level, trend, season, count, variance FROM forecast_state '
+                       'WHERE sensor_id = ?', (sensor_id,)).fetchone()
+    if row is None:
+        return ForecastModel()
+    return ForecastModel(row[0], row[1], row[2], json.loads(row[3]), row[4], row[5])
+
+
+def save_model(conn, sensor_id, model):
+    conn.execute('INSERT OR REPLACE INTO forecast_state VALUES (?, ?, ?, ?, ?, ?, ?)',
+                 (sensor_id, model.last_date, model.level, model.trend, json.dumps(model.season), model.count,
+                  model.variance))
+
+
+def apply_measurements(model, rows):
+    """
+        Dołącza do modelu pomiary (data, wartość) nowsze od ostatniego przetworzonego i zwraca ich liczbę.
+    """
+    count = 0
+    for date, value in sorted((date, float(value)) for date, value in rows
+                              if value is not None and (model.last_date is None or date > model.last_date)):
+        model.update(date, value)
+        count += 1
+    return count
+
+
+def update_forecast(conn, sensor_id, rows):
+    """
+        Dołącza nowe pomiary stanowiska do jego modelu prognozy. Pomiary bez wartości oraz starsze od ostatniego
+    przetworzonego pomiaru są pomijane. Nowy model stanowiska dopasowywany jest do pomiarów z ostatnich WARM_UP godzin
+    przed nowymi pomiarami (zapisanych już w tabeli 'measurements'). Funkcja nie zatwierdza transakcji - wywoływana
+    jest przez save_measurements w transakcji zapisu pomiarów.
+
+        Args:
+            conn (sqlite3.Connection): Połączenie z bazą danych.
+            sensor_id (int): Numer ID stanowiska pomiarowego.
+            rows (iterable): Nowe pomiary (data, wartość).
+
+        Returns:
+            int: Liczba pomiarów dołączonych do modelu.
+    """
+    model = load_model(conn, sensor_id)
+    rows = [(date, value) for date, value in rows if value is not None]
+    if model.last_date is None and rows:
+        start = datetime.strptime(min(date for date, _ in rows), DATE_FORMAT) - timedelta(hours=WARM_UP)
+        rows = conn.execute('''SELECT values_date, values_value FROM measurements
+                               WHERE sensor_id = ? AND values_date >= ? AND values_value IS NOT NULL''',
+                            (sensor_id, start.strftime(DATE_FORMAT))).fetchall()
+    count = apply_measurements(model, rows)
+    if count:
+        save_model(conn, sensor_id, model)
+    return count
+
+
+def forecast(conn, sensor_id, hours=HORIZON):
+    """
+        Zwraca prognozę stanowiska na hours godzin (ramka danych jak w ForecastModel.predict) albo None, jeśli model
+    stanowiska przetworzył mniej niż MIN_HISTORY pomiarów.
+
+        Example:
+            frame = forecast(conn, 3584, hours=24)
+            print(frame['forecast'].max())
+    """
+    create_forecast_table(conn)
+    model = load_model(conn, sensor_id)
+    return model.predict(hours) if model.count >= MIN_HISTORY else None
+
+
+def empty_forecast():
+    """
+        Zwraca pustą ramkę prognoz wielu stanowisk (indeks (sensor_id, values_date)).
+    """
+    index = pd.MultiIndex.from_arrays([pd.Index([], dtype=np.int64), pd.DatetimeIndex([])],
+                                      names=['sensor_id', 'values_date'])
+    return pd.DataFrame({'forecast': [], 'lower': [], 'upper': []}, index=index)
@@ -0,0 +1,184 @@
+"---------------------------------------------------MODUŁ: geocoding---------------------------------------------------"
+"""
+    Moduł zamieniający nazwę miejscowości lub adres na współrzędne geograficzne. Zapytania obsługiwane są lokalnie,
+a zdalny geokoder Nominatim używany jest tylko wtedy, gdy lokalne źródła nie znają odpowiedzi:
+- lokalny słownik miejscowości (tabela 'gazetteer') budowany z kolumn city_name, commune_name i district_name tabeli
+  'stations' - współrzędnymi miejscowości jest środek ciężkości położenia jej stacji pomiarowych,
+- trwała pamięć podręczna wyników geokodera (tabela 'geocode_cache').
+    Oba źródła wczytywane są do pamięci procesu przy pierwszym zapytaniu (osobno dla każdego pliku bazy danych), więc
+znane miejscowości obsługiwane są bez odwołań do bazy danych i sieci. Nazwy porównywane są bez względu na wielkość
+liter i polskie znaki.
+
+Moduł zawiera następujące elementy:
+- os, threading, time - moduły do identyfikacji pliku bazy danych, synchronizacji dostępu do słowników w pamięci
+  i zapisu czasu zapytań,
+- geopy - moduł do geolokalizacji (importowany dopiero przy pierwszym zapytaniu do geokodera Nominatim),
+- database - moduł zarządzający połączeniami z bazą danych database.db,
+- text_utils - moduł zawierający funkcję fold_text normalizującą nazwy.
+"""
+
+import os
+import threading
+import time
+from database import DB_FILE, get_connection
+from text_utils import fold_text
+
+# kolejność ma znaczenie: nazwa miejscowości jest ważniejsza od nazwy gminy, a ta od nazwy powiatu
+GAZETTEER_KINDS = (('city', 'city_name'), ('commune', 'commune_name'), ('district', 'district_name'))
+NOMINATIM_USER_AGENT = "11.04"
+
+_memory = {}
+_memory_lock = threading.RLock()
+
+
+def create_geocoding_tables(conn):
+    """
+        Tworzy tabele 'gazetteer' i 'geocode_cache', o ile jeszcze nie istnieją.
+
+        Args:
+            conn (sqlite3.Connection): Połączenie z bazą danych.
+    """
+    conn.execute('''CREATE TABLE IF NOT EXISTS gazetteer (
+                    name_key TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    name TEXT,
+                    latitude REAL,
+                    longitude REAL,
+                    station_count INTEGER,
+                    PRIMARY KEY (name_key, kind))''')
+    conn.execute('''CREATE TABLE IF NOT EXISTS geocode_cache (
+                    query_key TEXT NOT NULL PRIMARY KEY,
+                    latitude REAL,
+                    longitude REAL,
+                    created_at REAL)''')
+
+
+def build_gazetteer(conn):
+    """
+        Przebudowuje słownik miejscowości na podstawie tabeli 'stations' (stacje bez współrzędnych są pomijane).
+    Funkcja nie zatwierdza transakcji - wywoływana jest przez get_stations_data w transakcji zapisu stacji.
+
+        Args:
+            conn (sqlite3.Connection): Połączenie z bazą danych.
+
+        Returns:
+            int: Liczba pozycji słownika.
+    """
+    create_geocoding_tables(conn)
+    conn.execute('DELETE FROM gazetteer')
+    entries = {}
+    for kind, column in GAZETTEER_KINDS:
+        for name, latitude, longitude, count in conn.execute(
+                f'''SELECT {column}, AVG(gegr_lat), AVG(gegr_lon), COUNT(*)
+                    FROM stations WHERE {column} IS NOT NULL AND gegr_lat IS NOT NULL AND gegr_lon IS NOT NULL
+                    GROUP BY {column}'''):
+            key = fold_text(name)
+            if (key, kind) in entries:
+                # różne zapisy tej samej nazwy - łączymy średnie ważone liczbą stacji
+                _, old_latitude, old_longitude, old_count = entries[(key, kind)]
+                total = old_count + count
+                latitude = (old_latitude * old_count + latitude * count) / total
+                longitude = (old_longitude * old_count + longitude * count) / total
+                count = total
+            entries[(key, kind)] = (name, latitude, longitude, count)
+
+    conn.executemany('''INSERT INTO gazetteer (name_key, kind, name, latitude, longitude, station_count)
+                        VALUES (?, ?, ?, ?, ?, ?)''',
+                     [(key, kind) + entry for (key, kind), entry in entries.items()])
+    with _memory_lock:
+        # połączenie nie wskazuje ścieżki, pod którą baza jest zapamiętana - wczytywane są ponownie wszystkie bazy
+        _memory.clear()
+    return len(entries)
+
+
+def _load_memory(conn):
+    """
+        Wczytuje słownik miejscowości i pamięć podręczną geokodera bazy danych do pamięci procesu i zwraca je jako
+    słownik z kluczami 'gazetteer' i 'cache'. Jeśli słownik nie został jeszcze zbudowany (stacje zapisano przed jego
+    wprowadzeniem), buduje go.
+    """
+    create_geocoding_tables(conn)
+    has_stations = conn.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name='stations'").fetchone()
+    if has_stations and conn.execute('SELECT 1 FROM gazetteer LIMIT 1').fetchone() is None:
+        with conn:
+            build_gazetteer(conn)
+    ranks = {kind: rank for rank, (kind, _) in enumerate(GAZETTEER_KINDS)}
+    gazetteer = {}
+    for key, kind, latitude, longitude in conn.execute(
+            'SELECT name_key, kind, latitude, longitude FROM gazetteer'):
+        if key not in gazetteer or ranks[kind] < gazetteer[key][0]:
+            gazetteer[key] = (ranks[kind], (latitude, longitude))
+    return {'gazetteer': {key: coordinates for key, (_, coordinates) in gazetteer.items()},
+            'cache': {key: (latitude, longitude) for key, latitude, longitude in conn.execute(
+                'SELECT query_key, latitude, longitude FROM geocode_cache')}}
+
+
+def lookup_local(query, db_file=DB_FILE):
+    """
+        Wyszukuje współrzędne zapytania w słowniku miejscowości i pamięci podręcznej geokodera, bez użycia sieci.
+    Jeśli całe zapytanie nie jest znane, a zawiera przecinek (np. "Kraków, ul. Długa"), sprawdzana jest jego pierwsza
+    część.
+
+        Args:
+            query (str): Nazwa miejscowości lub adres.
+            db_file (str): Ścieżka do pliku bazy danych.
+
+        Returns:
+            tuple: Para (szerokość, długość geograficzna) lub None, jeśli zapytanie nie jest znane.
+    """
+    path = os.path.abspath(db_file)
+    with _memory_lock:
+        if path not in _memory:
+            _memory[path] = _load_memory(get_connection(db_file))
+        gazetteer, cache = _memory[path]['gazetteer'], _memory[path]['cache']
+
+    key = fold_text(query)
+    if key in gazetteer:
+        return gazetteer[key]
+    if key in cache:
+        return cache[key]
+    if ',' in query:
+        first = fold_text(query.split(',')[0])
+        if first in gazetteer:
+            return gazetteer[first]
+    return None
+
+
+def geocode(query, db_file=DB_FILE):
+    """
+        Zwraca współrzędne geograficzne miejscowości lub adresu. Najpierw sprawdzane są źródła lokalne (lookup_local),
+    a dopiero potem zdalny geokoder Nominatim. Wynik geokodera zapisywany jest w tabeli 'geocode_cache', także wynik
+    pusty (adres nieznany), aby kolejne zapytania o ten sam adres nie trafiały do sieci.
+
+        Args:
+            query (str): Nazwa miejscowości lub adres.
+            db_file (str): Ścieżka do pliku bazy danych.
+
+        Returns:
+            tuple: Para (szerokość, długość geograficzna) lub None, jeśli lokalizacji nie znaleziono.
+
+        Example:
+            geocode('lodz') -> (51.7593..., 19.4557...)
+    """
+    local = lookup_local(query, db_file)
+    if local is not None:
+        return local if local[0] is not None else None
+
+    from geopy.geocoders import Nominatim
+    from geopy.exc import GeopyError
+
+    try:
+        location = Nominatim(user_agent=NOMINATIM_USER_AGENT).geocode(query)
+    except GeopyError:
+        return None
+    coordinates = (location.latitude, location.longitude) if location is not None else (None, None)
+
+    conn = get_connection(db_file)
+    with conn:
+        conn.execute('''INSERT OR REPLACE INTO geocode_cache (query_key, latitude, longitude, created_at)
+                        VALUES (?, ?, ?, ?)''', (fold_text(query),) + coordinates + (time.time(),))
+    with _memory_lock:
+        memory = _memory.get(os.path.abspath(db_file))
+        if memory is not None:
+            memory['cache'][fold_text(query)] = coordinates
+    return coordinates if coordinates[0] is not None else None
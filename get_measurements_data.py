@@ -2,27 +2,166 @@
 """
     Moduł zawierający funkcję get_measurements, która ze strony https://api.gios.gov.pl/pjp-api/rest/data/getData/
 pobiera listę danych pomiarowych dla wybranego przez użytkownika parametru. Dane są zapisywane w postaci tabeli SQL
-i przechowywane w bazie danych database.db.
-    W przypadku braku łączności lub niedostępności usługi pobrane zostaną dane "historycne".
+i przechowywane w bazie danych database.db. Tabela gromadzi historię pomiarów - kolejne pobrania dopisują jedynie
+nowe pomiary.
+    Odpowiedzi serwisu przechowywane są w pamięci podręcznej http_cache, osobno dla każdego stanowiska. W przypadku
+braku łączności lub niedostępności usługi pobrane zostaną dane "historycne" - ostatnia odpowiedź zapisana dla tego
+stanowiska oraz historia pomiarów zgromadzona w bazie danych.
 
 Moduł zawiera następujące elementy:
 - requests - moduł do wykonywania zapytań sieciowych,
-- sqlite3 - moduł do łączenia z bazą danych database.db,
-- json - moduł do konwersji danych między formatem JSON a obiektami Pythona.
+- database - moduł zarządzający połączeniami z bazą danych database.db,
+- data_loader - moduł ze wspólnym potokiem strumieniowego parsowania JSON i wsadowego zapisu do bazy danych,
+- http_cache - moduł z dyskową pamięcią podręczną odpowiedzi serwisu GIOŚ,
+- measurement_stats - moduł ze statystykami pomiarów aktualizowanymi przy zapisie pomiarów,
+- anomaly_detection - moduł wykrywający nietypowe pomiary w trakcie zapisu pomiarów,
+- forecasting - moduł z modelami prognoz aktualizowanymi w trakcie zapisu pomiarów.
 """
 
 import requests
-import sqlite3
-import json
+from database import get_connection
+from data_loader import iter_json_array, load_rows, echo_rows
+from http_cache import default_cache
+from measurement_stats import create_stats_tables, update_statistics
+from anomaly_detection import create_anomaly_tables, detect_anomalies
+from forecasting import create_forecast_table, update_forecast
 
-def get_measurements_data(id):
+MEASUREMENTS_URL = 'https://api.gios.gov.pl/pjp-api/rest/data/getData/'
+
+
+def create_measurements_table(conn):
+    """
+        Tworzy tabelę 'measurements', o ile jeszcze nie istnieje. Tabela przechowuje historię pomiarów wszystkich
+    stanowisk, a kluczem głównym jest para (sensor_id, values_date). Tabela w starym formacie jest przebudowywana:
+    wiersze bez kolumny sensor_id są usuwane, ponieważ nie da się ich przypisać do stanowiska pomiarowego. Tabele
+    statystyk powstające przy przebudowie wyliczane są z przeniesionej historii pomiarów.
+
+        Args:
+            conn (sqlite3.Connection): Połączenie z bazą danych.
+    """
+    columns = {row[1]: row[5] for row in conn.execute('PRAGMA table_info(measurements)')}
+    if columns and 'sensor_id' not in columns:
+        conn.execute('DROP TABLE measurements')
+    elif columns and not columns['sensor_id']:
+        conn.execute('ALTER TABLE measurements RENAME TO measurements_old')
+
+    conn.execute('''CREATE TABLE IF NOT EXISTS measurements (
+                    sensor_id INTEGER NOT NULL,
+                    values_date DATETIME NOT NULL,
+                    values_value FLOAT,
+                    PRIMARY KEY (sensor_id, values_date)) WITHOUT ROWID''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_measurements_date ON measurements (values_date)')
+
+    migrated = columns and 'sensor_id' in columns and not columns['sensor_id']
+    if migrated:
+        conn.execute('''INSERT OR REPLACE INTO measurements (sensor_id, values_date, values_value)
+                        SELECT sensor_id, values_date, values_value FROM measurements_old''')
+        conn.execute('DROP TABLE measurements_old')
+    # tabele pochodne tworzone są po przeniesieniu pomiarów, więc statystyki obejmują przeniesioną historię
+    create_stats_tables(conn)
+    create_anomaly_tables(conn)
+    create_forecast_table(conn)
+    if migrated:
+        conn.commit()
+
+
+def latest_measurement_date(conn, id):
+    """
+        Zwraca datę najnowszego zapisanego pomiaru stanowiska, pomijając pomiary bez wartości.
+
+        Args:
+            conn (sqlite3.Connection): Połączenie z bazą danych.
+            id (int): Numer ID stanowiska pomiarowego.
+
+        Returns:
+            str: Data w formacie 'RRRR-MM-DD GG:MM:SS' lub None, jeśli stanowisko nie ma jeszcze pomiarów.
+    """
+    return conn.execute('''SELECT MAX(values_date) FROM measurements
+                           WHERE sensor_id = ? AND values_value IS NOT NULL''', (id,)).fetchone()[0]
+
+
+def latest_station_values(conn, station_id):
+    """
+        Zwraca najnowsze zapisane wartości wszystkich stanowisk pomiarowych stacji. Dla każdego stanowiska odczytywany
+    jest jeden wiersz z końca klucza głównego (sensor_id, values_date), bez przeglądania historii pomiarów.
+
+        Args:
+            conn (sqlite3.Connection): Połączenie z bazą danych.
+            station_id (int): Numer ID stacji pomiarowej.
+
+        Returns:
+            list: Krotki (kod parametru, wartość, data pomiaru), posortowane według kodu parametru.
+    """
+    return conn.execute('''SELECT s.param_code, m.values_value, m.values_date
+                           FROM sensors s JOIN measurements m ON m.sensor_id = s.id
+                           WHERE s.station_id = ?
+                             AND m.values_date = (SELECT MAX(values_date) FROM measurements
+                                                  WHERE sensor_id = s.id AND values_value IS NOT NULL)
+                           ORDER BY s.param_code''', (station_id,)).fetchall()
+
+
+def fetch_measurements(id, session=requests):
     """
-        Funkcja pobiera listę danych pomiarowych z serwisu GIOŚ i zapisuje je do tabeli 'measuremennts' w pamięci
-        SQLlite. W przypadku błędu podczas pobierania danych, funkcja pobiera dane z pliku 'measurements.json',
-        jeśli taki istnieje.
+        Pobiera z serwisu GIOŚ (przez pamięć podręczną http_cache) dane pomiarowe danego stanowiska.
 
         Args:
             id (int): Numer ID stanowiska pomiarowego.
+            session: Obiekt wykonujący zapytania (requests lub requests.Session), domyślnie moduł requests.
+
+        Returns:
+            list: Pomiary w formacie zwracanym przez API ({'date': ..., 'value': ...}).
+
+        Raises:
+            requests.exceptions.RequestException: W przypadku błędu podczas pobierania danych z serwisu GIOS.
+    """
+    return list(iter_json_array(default_cache().fetch('measurements', id, MEASUREMENTS_URL + str(id), session),
+                                key='values'))
+
+
+def save_measurements(conn, id, values):
+    """
+        Dopisuje dane pomiarowe stanowiska do tabeli 'measurements'. Zapisywane są tylko pomiary nowsze od najnowszego
+    zapisanego pomiaru z wartością, dzięki czemu ponowne pobranie tych samych danych nie zmienia bazy. Pomiary bez
+    wartości (null) są nadpisywane, gdy serwis GIOŚ uzupełni je przy kolejnym pobraniu. Zapisane wartości dołączane
+    są do statystyk stanowiska (measurement_stats) i modelu prognozy (forecasting) oraz oceniane przez detektor
+    pomiarów nietypowych (anomaly_detection). Wywołujący odpowiada za zatwierdzenie transakcji.
+
+        Args:
+            conn (sqlite3.Connection): Połączenie z bazą danych.
+            id (int): Numer ID stanowiska pomiarowego.
+            values (iterable): Pomiary w formacie zwracanym przez API ({'date': ..., 'value': ...}), np. generator.
+
+        Returns:
+            int: Liczba zapisanych wierszy.
+    """
+    create_stats_tables(conn)
+    create_anomaly_tables(conn)
+    create_forecast_table(conn)
+    last_date = latest_measurement_date(conn, id)
+    # pomiar powtórzony w odpowiedzi zapisywany (i liczony w statystykach) jest raz, z ostatnią wartością
+    rows = list({measurement['date']: (id, measurement['date'], measurement['value']) for measurement in values
+                 if last_date is None or measurement['date'] > last_date}.values())
+    count = load_rows(conn, '''INSERT INTO measurements (sensor_id, values_date, values_value)
+                                VALUES (?, ?, ?)
+                                ON CONFLICT (sensor_id, values_date)
+                                DO UPDATE SET values_value = excluded.values_value''',
+                      rows)
+    update_statistics(conn, id, ((date, value) for _, date, value in rows))
+    detect_anomalies(conn, id, ((date, value) for _, date, value in rows))
+    update_forecast(conn, id, ((date, value) for _, date, value in rows))
+    return count
+
+
+def get_measurements_data(id, echo=False):
+    """
+        Funkcja pobiera listę danych pomiarowych z serwisu GIOŚ i dopisuje nowe pomiary do tabeli 'measuremennts'
+        w pamięci SQLlite, zachowując historię wcześniejszych pobrań. Odpowiedź pobierana jest przez pamięć podręczną
+        http_cache. W przypadku błędu podczas pobierania danych i braku odpowiedzi w pamięci podręcznej, w bazie
+        pozostaje historia pomiarów zapisana przy wcześniejszych pobraniach.
+
+        Args:
+            id (int): Numer ID stanowiska pomiarowego.
+            echo (bool): Czy wypisać w konsoli zapisane pomiary (domyślnie nie).
 
         Returns:
             None.
@@ -31,7 +170,7 @@ def get_measurements_data(id):
             requests.exceptions.RequestException: W przypadku błędu podczas pobierania danych z serwisu GIOS.
 
         Example:
-            get_measurements_data(id)
+            get_measurements_data(id, echo=True)
 
         Output:
             LISTA DANYCH ZEBRANYCH ZE STANOWISKA NR 50:
@@ -40,35 +179,19 @@ def get_measurements_data(id):
             ...
         """
 
-    conn = sqlite3.connect('database.db')
-    cursor = conn.cursor()
+    conn = get_connection()
 
-    conn.execute('''DROP TABLE IF EXISTS measurements''')
-
-    conn.execute('''CREATE TABLE IF NOT EXISTS measurements (
-                    values_date DATETIME NOT NULL,
-                    values_value FLOAT)''')
+    create_measurements_table(conn)
 
     try:
-        measurements = requests.get(('https://api.gios.gov.pl/pjp-api/rest/data/getData/') + str(id)).json()
-        with open('measurements.json', 'w') as f:
-            json.dump(measurements, f)
+        measurements_file = default_cache().fetch('measurements', id, MEASUREMENTS_URL + str(id))
+        with conn:
+            save_measurements(conn, id, iter_json_array(measurements_file, key='values'))
 
     except requests.exceptions.RequestException:
         print('BŁĄD POBIERANIA. WCZYTUJĘ DANE HISTORYCZNE...')
-        with open('measurements.json', 'r') as f:
-            measurements = json.load(f)
-
-    for measurement in measurements['values']:
-        conn.execute('''INSERT INTO measurements (values_date, values_value)
-                        VALUES (?, ?)''',
-                     (measurement['date'], measurement['value']))
-
-    print(f"LISTA DANYCH ZEBRANYCH ZE STANOWISKA NR {id}:")
-    cursor.execute("SELECT * FROM measurements")
-    for row in cursor.fetchall():
-        print(row)
-
-    conn.commit()
-    conn.close()
 
+    if echo:
+        echo_rows(conn.execute("SELECT values_date, values_value FROM measurements WHERE sensor_id = ? "
+                               "ORDER BY values_date DESC", (id,)),
+                  f"LISTA DANYCH ZEBRANYCH ZE STANOWISKA NR {id}:")
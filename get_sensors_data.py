@@ -3,26 +3,98 @@
     Moduł zawierający funkcję get_sensors, która ze strony https://api.gios.gov.pl/pjp-api/rest/station/sensors/
 pobiera listę stanowisk pomiarowych w wybranej przez użytkownika stacji pomiarowej. Dane są zapisywane w postaci tabeli 
 SQL i przechowywane w bazie danych database.db.
-    W przypadku braku łączności lub niedostępności usługi pobrane zostaną dane "historycne".
+    Odpowiedzi serwisu przechowywane są w pamięci podręcznej http_cache, osobno dla każdej stacji. W przypadku braku
+łączności lub niedostępności usługi pobrane zostaną dane "historycne" - ostatnia odpowiedź zapisana dla tej stacji.
 
 Moduł zawiera następujące elementy:
 - requests - moduł do wykonywania zapytań sieciowych,
-- sqlite3 - moduł do łączenia z bazą danych database.db,
-- json - moduł do konwersji danych między formatem JSON a obiektami Pythona.
+- database - moduł zarządzający połączeniami z bazą danych database.db,
+- data_loader - moduł ze wspólnym potokiem strumieniowego parsowania JSON i wsadowego zapisu do bazy danych,
+- http_cache - moduł z dyskową pamięcią podręczną odpowiedzi serwisu GIOŚ.
 """
 
 import requests
-import sqlite3
-import json
+from database import get_connection
+from data_loader import iter_json_array, load_rows, echo_rows
+from http_cache import default_cache
 
-def get_sensors_data(stationId):
+SENSORS_URL = 'https://api.gios.gov.pl/pjp-api/rest/station/sensors/'
+
+
+def create_sensors_table(conn):
+    """
+        Tworzy tabelę 'sensors' wraz z indeksem stanowisk według stacji, o ile jeszcze nie istnieją.
+
+        Args:
+            conn (sqlite3.Connection): Połączenie z bazą danych.
+    """
+    conn.execute('''CREATE TABLE IF NOT EXISTS sensors (
+                        id INTEGER NOT NULL PRIMARY KEY,
+                        station_id INTEGER REFERENCES stations(id),
+                        param_name TEXT,
+                        param_formula TEXT,
+                        param_code TEXT,
+                        id_param INTEGER)''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_sensors_station ON sensors (station_id)')
+
+
+def fetch_sensors(stationId, session=requests):
+    """
+        Pobiera z serwisu GIOŚ (przez pamięć podręczną http_cache) listę stanowisk pomiarowych danej stacji.
+
+        Args:
+            stationId (int): Numer ID stacji pomiarowej.
+            session: Obiekt wykonujący zapytania (requests lub requests.Session), domyślnie moduł requests.
+
+        Returns:
+            list: Lista stanowisk pomiarowych w formacie zwracanym przez API.
+
+        Raises:
+            requests.exceptions.RequestException: W przypadku błędu podczas pobierania danych z serwisu GIOS.
+    """
+    return list(iter_json_array(default_cache().fetch('sensors', stationId, SENSORS_URL + str(stationId), session)))
+
+
+def sensor_rows(sensors):
+    """
+        Generator zamieniający stanowiska w formacie zwracanym przez API na krotki kolumn tabeli 'sensors'.
+    """
+    for sensor in sensors:
+        param = sensor['param']
+        yield (sensor['id'], sensor['stationId'], param['paramName'], param['paramFormula'], param['paramCode'],
+               param['idParam'])
+
+
+def save_sensors(conn, stationId, sensors):
+    """
+        Zapisuje stanowiska pomiarowe stacji do tabeli 'sensors'. Poprzednie stanowiska tej stacji są zastępowane,
+    stanowiska pozostałych stacji pozostają bez zmian. Wywołujący odpowiada za zatwierdzenie transakcji.
+
+        Args:
+            conn (sqlite3.Connection): Połączenie z bazą danych.
+            stationId (int): Numer ID stacji pomiarowej.
+            sensors (iterable): Stanowiska pomiarowe w formacie zwracanym przez API (lista lub generator).
+
+        Returns:
+            int: Liczba zapisanych stanowisk.
+    """
+    conn.execute('DELETE FROM sensors WHERE station_id = ?', (stationId,))
+    return load_rows(conn, '''INSERT OR REPLACE INTO sensors (id, station_id, param_name, param_formula, param_code,
+                                                        id_param)
+                               VALUES (?, ?, ?, ?, ?, ?)''', sensor_rows(sensors))
+
+
+def get_sensors_data(stationId, echo=False):
     """
         Funkcja pobiera listę stanowisk pomiarowych dla danej stacji pomiarowej z serwisu GIOŚ i zapisuje je do tabeli
-        'sensors' w pamięci SQLlite. W przypadku błędu podczas pobierania danych, funkcja pobiera dane z pliku
-        'sensors.json', jeśli taki istnieje.
+        'sensors' w pamięci SQLlite. Odpowiedź pobierana jest przez pamięć podręczną http_cache. W przypadku błędu
+        podczas pobierania danych i braku odpowiedzi w pamięci podręcznej, funkcja korzysta ze stanowisk tej stacji
+        zapisanych w pliku 'sensors.json'. Jeśli ani serwis, ani plik nie zwrócą stanowisk stacji, w bazie pozostają
+        poprzednio zapisane stanowiska.
 
         Args:
             stationId (int): Numer ID stacji pomiarowej.
+            echo (bool): Czy wypisać w konsoli zapisane stanowiska (domyślnie nie).
 
         Returns:
             None.
@@ -31,7 +103,7 @@ def get_sensors_data(stationId):
             requests.exceptions.RequestException: W przypadku błędu podczas pobierania danych z serwisu GIOS.
 
         Example:
-            get_sensors_data(stationId)
+            get_sensors_data(stationId, echo=True)
 
         Output:
             LISTA DOSTĘPNYCH STANOWISK POMIAROWYCH STACJI NR 11:
@@ -40,40 +112,22 @@ def get_sensors_data(stationId):
             ...
         """
 
-    conn = sqlite3.connect('database.db')
-    cursor = conn.cursor()
+    conn = get_connection()
 
-    conn.execute('''DROP TABLE IF EXISTS sensors;''')
-
-    conn.execute('''CREATE TABLE IF NOT EXISTS sensors (
-                        id INTEGER NOT NULL PRIMARY KEY,
-                        station_id INTEGER REFERENCES stations(id),
-                        param_name TEXT,
-                        param_formula TEXT,
-                        param_code TEXT,
-                        id_param INTEGER)''')
+    create_sensors_table(conn)
 
     try:
-        sensors = requests.get(('https://api.gios.gov.pl/pjp-api/rest/station/sensors/') + str(stationId)).json()
-        with open('sensors.json', 'w') as f:
-            json.dump(sensors, f)
+        # lista (a nie generator) - pusta odpowiedź nie może usunąć poprzednio zapisanych stanowisk
+        sensors = fetch_sensors(stationId)
 
     except requests.exceptions.RequestException:
         print('BŁĄD POBIERANIA. WCZYTUJĘ DANE HISTORYCZNE...')
-        with open('sensors.json', 'r') as f:
-            sensors = json.load(f)
-
-    for sensor in sensors:
-        conn.execute('''INSERT INTO sensors (id, station_id, param_name, param_formula, param_code, id_param)
-                        VALUES (?, ?, ?, ?, ?, ?)''',
-                     (sensor['id'], sensor['stationId'], sensor['param']['paramName'], sensor['param']['paramFormula'],
-                      sensor['param']['paramCode'], sensor['param']['idParam']))
-
-    print(f'LISTA DOSTĘPNYCH STANOWISK POMIAROWYCH STACJI NR {stationId}:')
-    cursor.execute("SELECT * FROM sensors")
-    for row in cursor.fetchall():
-        print(row)
+        sensors = [sensor for sensor in iter_json_array('sensors.json') if sensor['stationId'] == stationId]
 
-    conn.commit()
-    conn.close()
+    if sensors:
+        with conn:
+            save_sensors(conn, stationId, sensors)
 
+    if echo:
+        echo_rows(conn.execute("SELECT * FROM sensors WHERE station_id = ?", (stationId,)),
+                  f'LISTA DOSTĘPNYCH STANOWISK POMIAROWYCH STACJI NR {stationId}:')
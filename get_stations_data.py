@@ -2,25 +2,173 @@
 """
     Moduł zawierający funkcję get_stations, która ze strony http://api.gios.gov.pl/pjp-api/rest/station/findAll
 pobiera listę stacji pomiarowych. Dane są zapisywane w postaci tabeli SQL i przechowywane w bazie danych database.db.
-    W przypadku braku łączności lub niedostępności usługi pobrane zostaną dane "historycne".
+Odpowiedź serwisu jest parsowana strumieniowo, a stacje zapisywane partiami w jednej transakcji. Współrzędne stacji
+przechowywane są jako liczby (REAL) i dodatkowo w indeksie przestrzennym R*Tree (tabela 'stations_rtree'), dzięki
+czemu zapytania o stacje w prostokątnym obszarze mapy wykonywane są w SQLite bez przeglądania całej tabeli.
+    Odpowiedzi serwisu przechowywane są w pamięci podręcznej http_cache. W przypadku braku łączności lub
+niedostępności usługi pobrane zostaną dane "historycne" - ostatnia zapisana odpowiedź lub plik stations.json.
 
 Moduł zawiera następujące elementy:
 - requests - moduł do wykonywania zapytań sieciowych,
-- sqlite3 - moduł do łączenia z bazą danych database.db,
-- json - moduł do konwersji danych między formatem JSON a obiektami Pythona.
+- database - moduł zarządzający połączeniami z bazą danych database.db,
+- data_loader - moduł ze wspólnym potokiem strumieniowego parsowania JSON i wsadowego zapisu do bazy danych,
+- http_cache - moduł z dyskową pamięcią podręczną odpowiedzi serwisu GIOŚ,
+- geocoding - moduł zawierający funkcję build_gazetteer, budującą słownik miejscowości na podstawie stacji,
+- haversine - moduł z wektorowymi funkcjami odległości po łuku koła wielkiego,
+- station_search - moduł zawierający funkcję build_search_index, budującą indeks wyszukiwania stacji.
 """
 import requests
-import sqlite3
-import json
+from database import DB_FILE, get_connection
+from data_loader import iter_json_array, load_rows, echo_rows
+from http_cache import default_cache
+from geocoding import build_gazetteer
+from station_search import build_search_index
+from haversine import bounding_box, distances_from
 
-def get_stations_data():
+STATIONS_URL = 'http://api.gios.gov.pl/pjp-api/rest/station/findAll'
+
+
+def create_stations_table(conn):
+    """
+        Tworzy tabelę 'stations' oraz indeks przestrzenny 'stations_rtree', o ile jeszcze nie istnieją. Tabela
+    w starym formacie (współrzędne jako tekst) jest przebudowywana z zachowaniem zapisanych stacji.
+
+        Args:
+            conn (sqlite3.Connection): Połączenie z bazą danych.
+    """
+    columns = {row[1]: row[2] for row in conn.execute('PRAGMA table_info(stations)')}
+    migrate = columns.get('gegr_lat', 'REAL') != 'REAL'
+    if migrate:
+        conn.execute('ALTER TABLE stations RENAME TO stations_old')
+
+    conn.execute('''CREATE TABLE IF NOT EXISTS stations (
+                    id INTEGER NOT NULL PRIMARY KEY,
+                    station_name TEXT,
+                    gegr_lat REAL,
+                    gegr_lon REAL,
+                    city_id INTEGER,
+                    city_name TEXT,
+                    commune_name TEXT,
+                    district_name TEXT,
+                    province_name TEXT,
+                    address_street TEXT)''')
+    conn.execute('''CREATE VIRTUAL TABLE IF NOT EXISTS stations_rtree USING rtree (
+                    id,
+                    min_lat, max_lat,
+                    min_lon, max_lon)''')
+
+    if migrate:
+        with conn:
+            conn.execute('''INSERT INTO stations (id, station_name, gegr_lat, gegr_lon, city_id, city_name,
+                                                 commune_name, district_name, province_name, address_street)
+                            SELECT id, station_name, CAST(gegr_lat AS REAL), CAST(gegr_lon AS REAL), city_id,
+                                   city_name, commune_name, district_name, province_name, address_street
+                            FROM stations_old''')
+            conn.execute('DROP TABLE stations_old')
+            sync_stations_rtree(conn)
+
+
+def sync_stations_rtree(conn):
+    """
+        Odbudowuje indeks przestrzenny 'stations_rtree' na podstawie tabeli 'stations'. Funkcja nie zatwierdza
+    transakcji.
+
+        Args:
+            conn (sqlite3.Connection): Połączenie z bazą danych.
+    """
+    conn.execute('DELETE FROM stations_rtree')
+    conn.execute('''INSERT INTO stations_rtree (id, min_lat, max_lat, min_lon, max_lon)
+                    SELECT id, gegr_lat, gegr_lat, gegr_lon, gegr_lon FROM stations
+                    WHERE gegr_lat IS NOT NULL AND gegr_lon IS NOT NULL''')
+
+
+def stations_in_bbox(conn, min_lat, max_lat, min_lon, max_lon):
+    """
+        Zwraca stacje położone w prostokącie współrzędnych geograficznych. Kandydaci wybierani są przez indeks R*Tree,
+    który przechowuje współrzędne z pojedynczą precyzją, a następnie sprawdzani dokładnie na kolumnach tabeli.
+
+        Args:
+            conn (sqlite3.Connection): Połączenie z bazą danych.
+            min_lat, max_lat (float): Zakres szerokości geograficznej.
+            min_lon, max_lon (float): Zakres długości geograficznej.
+
+        Returns:
+            list: Wiersze tabeli 'stations' (krotki), posortowane według ID stacji.
+
+        Example:
+            stations_in_bbox(conn, 49.9, 50.2, 19.7, 20.2)  # stacje w okolicy Krakowa
+    """
+    return conn.execute('''SELECT s.* FROM stations_rtree r JOIN stations s ON s.id = r.id
+                           WHERE r.max_lat >= ? AND r.min_lat <= ? AND r.max_lon >= ? AND r.min_lon <= ?
+                             AND s.gegr_lat BETWEEN ? AND ? AND s.gegr_lon BETWEEN ? AND ?
+                           ORDER BY s.id''',
+                        (min_lat, max_lat, min_lon, max_lon, min_lat, max_lat, min_lon, max_lon)).fetchall()
+
+
+def stations_within(conn, latitude, longitude, radius):
+    """
+        Zwraca stacje położone nie dalej niż radius km od punktu. SQLite wybiera przez indeks R*Tree stacje
+    z prostokąta opisanego na okręgu, a dokładna odległość liczona jest tylko dla nich.
+
+        Returns:
+            list: Pary (odległość w km, wiersz stacji), od najbliższej.
+    """
+    candidates = stations_in_bbox(conn, *bounding_box(latitude, longitude, radius))
+    if not candidates:
+        return []
+    distances = distances_from(latitude, longitude, [row[2] for row in candidates], [row[3] for row in candidates])
+    return sorted((float(distance), row) for distance, row in zip(distances, candidates) if distance <= radius)
+
+
+def _coordinate(value):
+    """
+        Zamienia współrzędną stacji zwróconą przez API na liczbę. Brak współrzędnej (null lub pusty tekst) zapisywany
+    jest jako NULL, a stacja nie trafia do indeksu 'stations_rtree'.
+    """
+    return None if value is None or value == '' else float(value)
+
+
+def station_rows(stations):
+    """
+        Generator zamieniający stacje w formacie zwracanym przez API na krotki kolumn tabeli 'stations'.
+    """
+    for station in stations:
+        city = station['city']
+        commune = city['commune']
+        yield (station['id'], station['stationName'], _coordinate(station['gegrLat']), _coordinate(station['gegrLon']),
+               city['id'], city['name'], commune['communeName'], commune['districtName'], commune['provinceName'],
+               station['addressStreet'])
+
+
+def save_stations(conn, stations):
+    """
+        Zastępuje zawartość tabeli 'stations' podanymi stacjami i odbudowuje indeks 'stations_rtree'. Wywołujący
+    odpowiada za zatwierdzenie transakcji.
+
+        Args:
+            conn (sqlite3.Connection): Połączenie z bazą danych.
+            stations (iterable): Stacje w formacie zwracanym przez API (np. generator iter_json_array).
+
+        Returns:
+            int: Liczba zapisanych stacji.
+    """
+    conn.execute('DELETE FROM stations')
+    count = load_rows(conn, '''INSERT INTO stations (id, station_name, gegr_lat, gegr_lon, city_id, city_name,
+                                                     commune_name, district_name, province_name, address_street)
+                                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)''', station_rows(stations))
+    sync_stations_rtree(conn)
+    return count
+
+
+def get_stations_data(echo=False, db_file=DB_FILE):
     """
         Funkcja pobiera listę wszystkich stacji pomiarowych z serwisu GIOS i zapisuje je do tabeli 'stations'
-        w pamięci SQLlite. W przypadku błędu podczas pobierania danych, funkcja pobiera dane z pliku 'stations.json',
-        jeśli taki istnieje.
+        w pamięci SQLlite. Lista stacji pobierana jest przez pamięć podręczną http_cache. W przypadku błędu podczas
+        pobierania danych i pustej pamięci podręcznej, funkcja pobiera dane z pliku 'stations.json'.
 
         Args:
-            Brak.
+            echo (bool): Czy wypisać w konsoli zapisane stacje (domyślnie nie).
+            db_file (str): Ścieżka do pliku bazy danych.
 
         Returns:
             None.
@@ -29,58 +177,32 @@ def get_stations_data():
             requests.exceptions.RequestException: W przypadku błędu podczas pobierania danych z serwisu GIOS.
 
         Example:
-            get_stations_data()
+            get_stations_data(echo=True)
 
         Output:
             LISTA DOSTĘPNYCH STACJI:
-            (11, 'Czerniawa', '50.912475', '15.312190', 142, 'Czerniawa', 'Świeradów-Zdrój', 'lubański', 'DOLNOŚLĄSKIE', 'ul. Strażacka 7')
-            (16, 'Dzierżoniów, ul. Piłsudskiego', '50.732817', '16.648050', 198, 'Dzierżoniów', 'Dzierżoniów', 'dzierżoniowski', 'DOLNOŚLĄSKIE', 'ul. Piłsudskiego 26')
+            (11, 'Czerniawa', 50.912475, 15.31219, 142, 'Czerniawa', 'Świeradów-Zdrój', 'lubański', 'DOLNOŚLĄSKIE', 'ul. Strażacka 7')
+            (16, 'Dzierżoniów, ul. Piłsudskiego', 50.732817, 16.64805, 198, 'Dzierżoniów', 'Dzierżoniów', 'dzierżoniowski', 'DOLNOŚLĄSKIE', 'ul. Piłsudskiego 26')
+            ...
+            (..., None, None, ...)  # stacja bez współrzędnych w odpowiedzi serwisu
             ...
         """
 
-    conn = sqlite3.connect('database.db')
-    cursor = conn.cursor()
-
-    conn.execute('''DROP TABLE IF EXISTS stations''')
+    conn = get_connection(db_file)
 
-    conn.execute('''CREATE TABLE IF NOT EXISTS stations (
-                    id INTEGER NOT NULL PRIMARY KEY,
-                    station_name TEXT,
-                    gegr_lat TEXT,
-                    gegr_lon TEXT,
-                    city_id INTEGER,
-                    city_name TEXT,
-                    commune_name TEXT,
-                    district_name TEXT,
-                    province_name TEXT,
-                    address_street TEXT)''')
+    create_stations_table(conn)
 
     try:
-        stations = requests.get('http://api.gios.gov.pl/pjp-api/rest/station/findAll').json()
-        with open('stations.json', 'w') as f:
-            json.dump(stations, f)
+        stations_file = default_cache().fetch('stations', 'all', STATIONS_URL)
 
     except requests.exceptions.RequestException:
         print('BŁĄD POBIERANIA. WCZYTUJĘ DANE HISTORYCZNE...')
-        with open('stations.json', 'r') as f:
-            stations = json.load(f)
-
-    for station in stations:
-        city = station['city']
-        commune = city['commune']
-        conn.execute('''INSERT INTO stations (id, station_name, gegr_lat, gegr_lon, city_id, city_name, commune_name, district_name, province_name, address_street)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)''',
-                     (station['id'], station['stationName'], station['gegrLat'], station['gegrLon'], city['id'],
-                      city['name'], commune['communeName'], commune['districtName'], commune['provinceName'],
-                      station['addressStreet']))
-
-    print(f"LISTA DOSTĘPNYCH STACJI:")
-    cursor.execute("SELECT * FROM stations")
-    for row in cursor.fetchall():
-        print(row)
-
-    conn.commit()
-    conn.close()
-
+        stations_file = 'stations.json'
 
+    with conn:
+        save_stations(conn, iter_json_array(stations_file))
+        build_gazetteer(conn)
+        build_search_index(conn)
 
+    if echo:
+        echo_rows(conn.execute("SELECT * FROM stations"), "LISTA DOSTĘPNYCH STACJI:")
@@ -0,0 +1,162 @@
+"---------------------------------------------------MODUŁ: haversine---------------------------------------------------"
+"""
+    Moduł zawierający wektorowe (NumPy) funkcje obliczania odległości po łuku koła wielkiego metodą haversine, zgodne
+z geopy.distance.great_circle. Zamiast wywoływać great_circle osobno dla każdej pary punktów, odległości liczone są
+jednocześnie dla całych tablic współrzędnych: jeden punkt do wielu, wiele do wielu (macierz odległości) oraz najbliższy
+punkt dla każdego z wielu punktów zapytania. Macierze liczone są blokami wierszy (chunk_size), więc pamięć zużywana na
+obliczenia pośrednie jest ograniczona niezależnie od liczby punktów.
+
+Moduł zawiera następujące elementy:
+- numpy - moduł do obliczeń na tablicach.
+"""
+
+import numpy as np
+
+EARTH_RADIUS = 6371.009  # promień Ziemi w km, ten sam co w geopy.distance.great_circle
+CHUNK_SIZE = 1024
+
+
+class _Points:
+    """
+        Współrzędne punktów zamienione na radiany wraz z cosinusami szerokości, liczonymi raz dla całej tablicy.
+    """
+
+    def __init__(self, latitudes, longitudes):
+        self.lat = np.radians(np.asarray(latitudes, dtype=np.float64)).ravel()
+        self.lon = np.radians(np.asarray(longitudes, dtype=np.float64)).ravel()
+        if self.lat.shape != self.lon.shape:
+            raise ValueError('Tablice szerokości i długości geograficznej muszą mieć ten sam rozmiar')
+        self.cos_lat = np.cos(self.lat)
+
+    def __len__(self):
+        return len(self.lat)
+
+    def rows(self, start, stop):
+        return self.lat[start:stop, None], self.lon[start:stop, None], self.cos_lat[start:stop, None]
+
+
+def _haversine(lat1, lon1, cos_lat1, lat2, lon2, cos_lat2):
+    a = np.sin((lat2 - lat1) / 2) ** 2 + cos_lat1 * cos_lat2 * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def distances_from(latitude, longitude, latitudes, longitudes):
+    """
+        Zwraca odległości (w km) jednego punktu od wielu punktów.
+
+        Args:
+            latitude (float): Szerokość geograficzna punktu.
+            longitude (float): Długość geograficzna punktu.
+            latitudes (array-like): Szerokości geograficzne punktów docelowych.
+            longitudes (array-like): Długości geograficzne punktów docelowych.
+
+        Returns:
+            numpy.ndarray: Tablica odległości w km, w kolejności punktów docelowych.
+
+        Example:
+            distances_from(51.76, 19.46, [50.06, 52.23], [19.94, 21.01]) -> array([192.00..., 118.28...])
+    """
+    points = _Points(latitudes, longitudes)
+    lat, lon = np.radians(float(latitude)), np.radians(float(longitude))
+    return _haversine(lat, lon, np.cos(lat), points.lat, points.lon, points.cos_lat)
+
+
+def iter_distance_chunks(latitudes1, longitudes1, latitudes2=None, longitudes2=None, chunk_size=CHUNK_SIZE):
+    """
+        Generator zwracający kolejne bloki wierszy macierzy odległości między dwoma zbiorami punktów. Pozwala
+    przetwarzać macierze, które w całości nie zmieściłyby się w pamięci.
+
+        Args:
+            latitudes1, longitudes1 (array-like): Współrzędne punktów - wiersze macierzy.
+            latitudes2, longitudes2 (array-like): Współrzędne punktów - kolumny macierzy (domyślnie te same punkty).
+            chunk_size (int): Liczba wierszy w jednym bloku.
+
+        Yields:
+            tuple: Para (indeks pierwszego wiersza bloku, tablica odległości w km o wymiarach blok x liczba kolumn).
+    """
+    rows = _Points(latitudes1, longitudes1)
+    columns = rows if latitudes2 is None else _Points(latitudes2, longitudes2)
+    for start in range(0, len(rows), chunk_size):
+        yield start, _haversine(*rows.rows(start, start + chunk_size), columns.lat, columns.lon, columns.cos_lat)
+
+
+def distance_matrix(latitudes1, longitudes1, latitudes2=None, longitudes2=None, chunk_size=CHUNK_SIZE,
+                    dtype=np.float64):
+    """
+        Zwraca macierz odległości (w km) między dwoma zbiorami punktów, liczoną blokami wierszy.
+
+        Args:
+            latitudes1, longitudes1 (array-like): Współrzędne punktów - wiersze macierzy.
+            latitudes2, longitudes2 (array-like): Współrzędne punktów - kolumny macierzy (domyślnie te same punkty,
+                np. macierz odległości między stacjami).
+            chunk_size (int): Liczba wierszy liczonych jednocześnie.
+            dtype: Typ elementów wyniku (np.float32 zmniejsza zużycie pamięci o połowę).
+
+        Returns:
+            numpy.ndarray: Macierz odległości o wymiarach len(punkty1) x len(punkty2).
+    """
+    columns = len(np.ravel(latitudes1)) if latitudes2 is None else len(np.ravel(latitudes2))
+    result = np.empty((len(np.ravel(latitudes1)), columns), dtype=dtype)
+    for start, block in iter_distance_chunks(latitudes1, longitudes1, latitudes2, longitudes2, chunk_size):
+        result[start:start + len(block)] = block
+    return result
+
+
+def nearest_points(latitudes1, longitudes1, latitudes2, longitudes2, chunk_size=CHUNK_SIZE):
+    """
+        Dla każdego punktu pierwszego zbioru (np. tysięcy lokalizacji użytkowników) zwraca najbliższy punkt drugiego
+    zbioru (np. stację pomiarową) i odległość do niego. Pełna macierz odległości nie jest przechowywana.
+
+        Returns:
+            tuple: (tablica indeksów najbliższych punktów drugiego zbioru, tablica odległości w km).
+    """
+    count = len(np.ravel(latitudes1))
+    indices = np.empty(count, dtype=np.intp)
+    distances = np.empty(count, dtype=np.float64)
+    for start, block in iter_distance_chunks(latitudes1, longitudes1, latitudes2, longitudes2, chunk_size):
+        stop = start + len(block)
+        indices[start:stop] = block.argmin(axis=1)
+        distances[start:stop] = block[np.arange(len(block)), indices[start:stop]]
+    return indices, distances
+
+
+def pairs_within(latitudes, longitudes, radius, chunk_size=CHUNK_SIZE):
+    """
+        Zwraca wszystkie pary różnych punktów oddalonych o nie więcej niż radius km (krawędzie grafu sąsiedztwa,
+    np. stacji pomiarowych). Każda para zwracana jest raz, jako (i, j) z i < j.
+
+        Returns:
+            tuple: (tablica indeksów i, tablica indeksów j, tablica odległości w km).
+    """
+    first, second, distances = [], [], []
+    for start, block in iter_distance_chunks(latitudes, longitudes, chunk_size=chunk_size):
+        rows, columns = np.nonzero(block <= radius)
+        rows += start
+        keep = columns > rows
+        first.append(rows[keep])
+        second.append(columns[keep])
+        distances.append(block[rows[keep] - start, columns[keep]])
+    if not first:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp), np.empty(0)
+    return np.concatenate(first), np.concatenate(second), np.concatenate(distances)
+
+
+def bounding_box(latitude, longitude, radius):
+    """
+        Zwraca prostokąt współrzędnych opisany na okręgu o promieniu radius km wokół punktu, do wstępnego filtrowania
+    punktów (np. indeksem R*Tree) przed dokładnym obliczeniem odległości. Przy biegunie zakres długości obejmuje
+    wszystkie południki.
+
+        Returns:
+            tuple: (min_lat, max_lat, min_lon, max_lon) w stopniach.
+
+        Example:
+            bounding_box(52.23, 21.01, 10) -> (52.14..., 52.31..., 20.86..., 21.15...)
+    """
+    angle = np.degrees(radius / EARTH_RADIUS)
+    min_lat, max_lat = latitude - angle, latitude + angle
+    if min_lat <= -90 or max_lat >= 90:
+        return max(min_lat, -90.0), min(max_lat, 90.0), -180.0, 180.0
+    # największe odchylenie długości osiągane jest na szerokości, na której okrąg jest styczny do południka
+    delta = np.degrees(np.arcsin(min(np.sin(radius / EARTH_RADIUS) / np.cos(np.radians(latitude)), 1.0)))
+    return float(min_lat), float(max_lat), float(longitude - delta), float(longitude + delta)
@@ -0,0 +1,206 @@
+"---------------------------------------------------MODUŁ: heat_map---------------------------------------------------"
+"""
+    Moduł zawierający mapę rozkładu stężenia wybranego parametru (PM10, NO2, O3...) nad Polską. Najnowsze wartości
+stanowisk mierzących parametr interpolowane są metodą odwrotnych odległości (IDW) na siatkę pokrywającą obszar mapy
+CommandMap. Siatka liczona jest wektorowo (NumPy) kafelkami: dla każdego kafelka wybierane są tylko stacje z prostokąta
+opisanego na kafelku powiększonego o promień sąsiedztwa, a z nich co najwyżej NEIGHBOURS najbliższych w promieniu
+RADIUS km. Gotowe siatki zapamiętywane są dla bazy danych, parametru i godziny pomiaru, razem ze znacznikiem stanu
+pomiarów użytych do ich wyliczenia - siatka jest liczona ponownie, gdy późniejsze cykle pobierania dopiszą pomiary
+stacji z tej samej godziny.
+
+Moduł zawiera następujące elementy:
+- os, threading - moduły do wyznaczania ścieżki bazy danych i synchronizacji wspólnej pamięci podręcznej siatek,
+- collections - moduł zawierający OrderedDict i namedtuple,
+- datetime - moduł do wyznaczania okna czasowego pomiarów,
+- numpy - moduł do obliczeń na tablicach,
+- PIL - moduł do tworzenia obrazu nakładki mapy,
+- database - moduł zarządzający połączeniami z bazą danych database.db,
+- haversine - moduł z wektorowymi funkcjami odległości po łuku koła wielkiego,
+- map_layer - moduł zawierający prostokąt obszaru mapy (MAP_BOUNDS).
+"""
+
+import os
+import threading
+from collections import OrderedDict, namedtuple
+from datetime import datetime, timedelta
+import numpy as np
+from PIL import Image
+from database import DB_FILE, get_connection
+from haversine import bounding_box, distance_matrix
+from map_layer import MAP_BOUNDS
+
+GRID_WIDTH = 200
+GRID_HEIGHT = 200
+TILE_SIZE = 25  # bok kafelka siatki (w komórkach) liczonego jednym blokiem
+RADIUS = 100  # promień sąsiedztwa w km - dalsze stacje nie wpływają na wartość komórki
+NEIGHBOURS = 8
+POWER = 2
+MAX_AGE = 3  # w godzinach - starsze pomiary nie są brane pod uwagę
+CACHE_SIZE = 32
+# wartości parametrów (w µg/m3), którym odpowiada koniec skali kolorów nakładki
+COLOR_SCALE = {'PM10': 150, 'PM2.5': 110, 'NO2': 340, 'O3': 240, 'SO2': 500, 'CO': 21000, 'C6H6': 50}
+PARAMETERS = tuple(COLOR_SCALE)
+
+HeatMap = namedtuple('HeatMap', ['param_code', 'hour', 'raster', 'stations'])
+HeatMap.__doc__ = """
+    Siatka wartości parametru param_code dla godziny hour (tekst 'RRRR-MM-DD GG'), o wymiarach wysokość x szerokość
+(pierwszy wiersz to północna krawędź mapy; NaN tam, gdzie w promieniu RADIUS nie ma stacji), oraz liczba stacji,
+z których ją policzono.
+"""
+
+
+def idw_grid(latitudes, longitudes, values, width=GRID_WIDTH, height=GRID_HEIGHT, bounds=MAP_BOUNDS, radius=RADIUS,
+             neighbours=NEIGHBOURS, power=POWER, tile_size=TILE_SIZE):
+    """
+        Interpoluje wartości punktów pomiarowych na regularną siatkę metodą odwrotnych odległości.
+
+        Args:
+            latitudes, longitudes, values (array-like): Położenia i wartości punktów pomiarowych.
+            width, height (int): Liczba komórek siatki w poziomie i w pionie.
+            bounds (tuple): Obszar siatki (min. i maks. długość, min. i maks. szerokość geograficzna).
+            radius (float): Promień sąsiedztwa w km.
+            neighbours (int): Maksymalna liczba najbliższych punktów branych pod uwagę dla komórki.
+            power (float): Wykładnik wagi 1 / odległość ** power.
+            tile_size (int): Bok kafelka liczonego jednym blokiem.
+
+        Returns:
+            numpy.ndarray: Siatka o wymiarach height x width, wiersze od północy; NaN dla komórek bez sąsiadów.
+    """
+    latitudes = np.asarray(latitudes, dtype=np.float64)
+    longitudes = np.asarray(longitudes, dtype=np.float64)
+    values = np.asarray(values, dtype=np.float64)
+    min_lon, max_lon, min_lat, max_lat = bounds
+    # środki komórek siatki
+    cell_lons = min_lon + (np.arange(width) + 0.5) * (max_lon - min_lon) / width
+    cell_lats = max_lat - (np.arange(height) + 0.5) * (max_lat - min_lat) / height
+    raster = np.full((height, width), np.nan)
+
+    for top in range(0, height, tile_size):
+        for left in range(0, width, tile_size):
+            lats = cell_lats[top:top + tile_size]
+            lons = cell_lons[left:left + tile_size]
+            # prostokąt kafelka powiększony o promień sąsiedztwa (zakres długości liczony na północnej krawędzi
+            # kafelka, gdzie jest największy)
+            south = bounding_box(lats[-1], lons[0], radius)[0]
+            _, north, west, _ = bounding_box(lats[0], lons[0], radius)
+            east = bounding_box(lats[0], lons[-1], radius)[3]
+            candidates = np.flatnonzero((latitudes >= south) & (latitudes <= north)
+                                        & (longitudes >= west) & (longitudes <= east))
+            if not len(candidates):
+                continue
+            grid_lats, grid_lons = np.meshgrid(lats, lons, indexing='ij')
+            distances = distance_matrix(grid_lats.ravel(), grid_lons.ravel(),
+                                        latitudes[candidates], longitudes[candidates])
+            tile_values = np.broadcast_to(values[candidates], distances.shape)
+            if len(candidates) > neighbours:
+                nearest = np.argpartition(distances, neighbours - 1, axis=1)[:, :neighbours]
+                distances = np.take_along_axis(distances, nearest, axis=1)
+                tile_values = values[candidates][nearest]
+            weights = np.where(distances <= radius, 1.0 / np.maximum(distances, 1e-6) ** power, 0.0)
+            total = weights.sum(axis=1)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                tile = (weights * tile_values).sum(axis=1) / total
+            raster[top:top + len(lats), left:left + len(lons)] = np.where(total > 0, tile, np.nan).reshape(
+                len(lats), len(lons))
+    return raster
+
+
+def latest_hour(conn, param_code):
+    """
+        Zwraca godzinę ('RRRR-MM-DD GG') najnowszego zapisanego pomiaru parametru albo None, jeśli brak pomiarów.
+    Najnowszy pomiar każdego stanowiska odczytywany jest z końca klucza głównego tabeli 'measurements'.
+    """
+    date = conn.execute('''SELECT MAX((SELECT MAX(values_date) FROM measurements
+                                       WHERE sensor_id = s.id AND values_value IS NOT NULL))
+                           FROM sensors s WHERE s.param_code = ?''', (param_code,)).fetchone()[0]
+    return date[:13] if date else None
+
+
+def parameter_values(conn, param_code, hour):
+    """
+        Zwraca położenia stacji i najnowsze wartości stanowisk mierzących parametr, z pomiarów nie późniejszych niż
+    koniec godziny hour i nie starszych niż MAX_AGE godzin.
+
+        Returns:
+            tuple: Tablice szerokości, długości geograficznych i wartości.
+    """
+    rows = conn.execute('''SELECT st.gegr_lat, st.gegr_lon, m.values_value
+                           FROM sensors s
+                           JOIN stations st ON st.id = s.station_id
+                           JOIN measurements m ON m.sensor_id = s.id
+                           WHERE s.param_code = ? AND st.gegr_lat IS NOT NULL AND st.gegr_lon IS NOT NULL
+                             AND m.values_date = (SELECT MAX(values_date) FROM measurements
+                                                  WHERE sensor_id = s.id AND values_value IS NOT NULL
+                                                    AND values_date > ? AND values_date <= ?)''',
+                        (param_code,) + _window(hour))
+    columns = np.array(rows.fetchall(), dtype=np.float64).reshape(-1, 3)
+    return columns[:, 0], columns[:, 1], columns[:, 2]
+
+
+def _window(hour):
+    end = datetime.strptime(hour, '%Y-%m-%d %H')
+    start = end - timedelta(hours=MAX_AGE)
+    return start.strftime('%Y-%m-%d %H:59:59'), end.strftime('%Y-%m-%d %H:59:59')
+
+
+def data_version(conn, param_code, hour):
+    """
+        Zwraca znacznik stanu pomiarów, z których liczona jest mapa parametru dla godziny hour: liczbę pomiarów
+    z wartością z okna MAX_AGE godzin i datę najnowszego z nich. Znacznik zmienia się, gdy dopisany zostanie pomiar
+    stacji, która wcześniej nie przysłała danych, albo uzupełniona zostanie wartość pomiaru.
+    """
+    return conn.execute('''SELECT COUNT(*), MAX(m.values_date)
+                           FROM sensors s JOIN measurements m ON m.sensor_id = s.id
+                           WHERE s.param_code = ? AND m.values_value IS NOT NULL
+                             AND m.values_date > ? AND m.values_date <= ?''',
+                        (param_code,) + _window(hour)).fetchone()
+
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def heat_map(param_code, hour=None, db_file=DB_FILE):
+    """
+        Zwraca mapę rozkładu parametru (HeatMap) dla podanej godziny, domyślnie godziny najnowszego pomiaru. Siatki
+    zapamiętywane są dla bazy danych, parametru i godziny; zapamiętana siatka jest używana, dopóki nie zmieni się
+    znacznik stanu pomiarów (data_version). Pamiętanych jest CACHE_SIZE ostatnio używanych siatek.
+
+        Example:
+            result = heat_map('PM10')
+            print(result.hour, np.nanmax(result.raster))
+    """
+    conn = get_connection(db_file)
+    if hour is None:
+        hour = latest_hour(conn, param_code)
+        if hour is None:
+            return None
+    key = (os.path.abspath(db_file), param_code, hour)
+    version = data_version(conn, param_code, hour)
+    with _cache_lock:
+        cached = _cache.get(key)
+        if cached is not None and cached[0] == version:
+            _cache.move_to_end(key)
+            return cached[1]
+    latitudes, longitudes, values = parameter_values(conn, param_code, hour)
+    result = HeatMap(param_code, hour, idw_grid(latitudes, longitudes, values), len(values))
+    with _cache_lock:
+        _cache[key] = (version, result)
+        _cache.move_to_end(key)
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return result
+
+
+def raster_image(raster, maximum, size, alpha=150):
+    """
+        Zamienia siatkę wartości na półprzezroczysty obraz RGBA o rozmiarze size (skala od zieleni przez żółć do
+    czerwieni, odpowiadającej wartości maximum; komórki bez wartości są przezroczyste).
+    """
+    level = np.clip(np.nan_to_num(raster, nan=0.0) / maximum, 0.0, 1.0)
+    rgba = np.empty(raster.shape + (4,), dtype=np.uint8)
+    rgba[..., 0] = np.clip(level * 2, 0, 1) * 255
+    rgba[..., 1] = np.clip(2 - level * 2, 0, 1) * 255
+    rgba[..., 2] = 0
+    rgba[..., 3] = np.where(np.isnan(raster), 0, alpha)
+    return Image.fromarray(rgba, 'RGBA').resize(size, Image.BILINEAR)
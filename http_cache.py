@@ -0,0 +1,186 @@
+"--------------------------------------------------MODUŁ: http_cache--------------------------------------------------"
+"""
+    Moduł zawierający klasę ResponseCache - dyskową pamięć podręczną odpowiedzi serwisu GIOŚ. Odpowiedzi zapisywane są
+w katalogu http_cache, osobno dla każdego punktu końcowego (stations, sensors, measurements) i numeru ID. Każdy punkt
+końcowy ma własny czas ważności (TTL) - w tym czasie ponowne zapytanie nie wymaga połączenia z siecią. Po upływie TTL
+odpowiedź jest odświeżana zapytaniem warunkowym (If-None-Match / If-Modified-Since), a niezmienione dane nie są
+pobierane ponownie. Rozmiar pamięci podręcznej jest ograniczony - najdawniej używane odpowiedzi są usuwane (LRU).
+    W przypadku braku łączności zwracana jest ostatnia zapisana odpowiedź dla tego samego punktu końcowego i ID.
+
+Moduł zawiera następujące elementy:
+- requests - moduł do wykonywania zapytań sieciowych,
+- sqlite3 - moduł do obsługi indeksu pamięci podręcznej,
+- os, threading, time - moduły do operacji na plikach, synchronizacji wątków i odmierzania czasu,
+- data_loader - moduł zawierający funkcję write_response zapisującą odpowiedź strumieniowo do pliku.
+"""
+
+import requests
+import sqlite3
+import os
+import threading
+import time
+from data_loader import write_response
+
+CACHE_DIR = 'http_cache'
+MAX_BYTES = 256 * 1024 * 1024
+TTL = {
+    'stations': 24 * 3600,
+    'sensors': 24 * 3600,
+    'measurements': 30 * 60,
+}
+
+
+class ResponseCache:
+    """
+        Klasa przechowuje odpowiedzi serwisu GIOŚ na dysku i decyduje, czy zapytanie trzeba wysłać do sieci. Może być
+    współdzielona przez wiele wątków.
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR, ttl=TTL, max_bytes=MAX_BYTES):
+        """
+            Inicjalizuje instancję klasy ResponseCache.
+
+            Args:
+                cache_dir (str): Katalog, w którym zapisywane są odpowiedzi.
+                ttl (dict): Czas ważności odpowiedzi w sekundach dla każdego punktu końcowego.
+                max_bytes (int): Maksymalny łączny rozmiar zapisanych odpowiedzi.
+        """
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self.conn = sqlite3.connect(os.path.join(cache_dir, 'index.db'), check_same_thread=False)
+        with self.conn:
+            self.conn.execute('''CREATE TABLE IF NOT EXISTS entries (
+                                    endpoint TEXT NOT NULL,
+                                    key TEXT NOT NULL,
+                                    etag TEXT,
+                                    last_modified TEXT,
+                                    fetched_at REAL NOT NULL,
+                                    accessed_at REAL NOT NULL,
+                                    size INTEGER NOT NULL,
+                                    PRIMARY KEY (endpoint, key))''')
+
+    def path(self, endpoint, key):
+        """
+            Zwraca ścieżkę pliku z odpowiedzią dla danego punktu końcowego i ID.
+        """
+        return os.path.join(self.cache_dir, f'{endpoint}_{key}.json')
+
+    def _entry(self, endpoint, key):
+        with self._lock:
+            entry = self.conn.execute('SELECT etag, last_modified, fetched_at FROM entries '
+                                      'WHERE endpoint = ? AND key = ?', (endpoint, str(key))).fetchone()
+        if entry is None or not os.path.exists(self.path(endpoint, key)):
+            return None
+        return entry
+
+    def _touch(self, endpoint, key, fetched=False):
+        now = time.time()
+        with self._lock, self.conn:
+            if fetched:
+                self.conn.execute('UPDATE entries SET accessed_at = ?, fetched_at = ? WHERE endpoint = ? AND key = ?',
+                                  (now, now, endpoint, str(key)))
+            else:
+                self.conn.execute('UPDATE entries SET accessed_at = ? WHERE endpoint = ? AND key = ?',
+                                  (now, endpoint, str(key)))
+
+    def _store(self, endpoint, key, response):
+        now = time.time()
+        with self._lock, self.conn:
+            self.conn.execute('''INSERT OR REPLACE INTO entries
+                                 (endpoint, key, etag, last_modified, fetched_at, accessed_at, size)
+                                 VALUES (?, ?, ?, ?, ?, ?, ?)''',
+                              (endpoint, str(key), response.headers.get('ETag'),
+                               response.headers.get('Last-Modified'), now, now,
+                               os.path.getsize(self.path(endpoint, key))))
+        self.evict(keep=(endpoint, str(key)))
+
+    def fetch(self, endpoint, key, url, session=requests):
+        """
+            Zwraca ścieżkę pliku z aktualną odpowiedzią dla danego punktu końcowego i ID. Świeża odpowiedź jest
+        zwracana bez zapytania do sieci, przeterminowana - odświeżana zapytaniem warunkowym. Jeśli serwis jest
+        niedostępny, zwracana jest ostatnia zapisana odpowiedź (niezależnie od jej wieku).
+
+            Args:
+                endpoint (str): Nazwa punktu końcowego ('stations', 'sensors' lub 'measurements').
+                key: Numer ID stacji lub stanowiska (dla listy stacji - 'all').
+                url (str): Adres zapytania.
+                session: Obiekt wykonujący zapytania (requests lub requests.Session), domyślnie moduł requests.
+
+            Returns:
+                str: Ścieżka do pliku JSON z odpowiedzią.
+
+            Raises:
+                requests.exceptions.RequestException: Gdy pobranie się nie powiodło, a pamięć podręczna nie zawiera
+                    odpowiedzi dla tego punktu końcowego i ID.
+        """
+        file_path = self.path(endpoint, key)
+        entry = self._entry(endpoint, key)
+
+        if entry is not None and time.time() - entry[2] < self.ttl.get(endpoint, 0):
+            self._touch(endpoint, key)
+            return file_path
+
+        headers = {}
+        if entry is not None:
+            if entry[0]:
+                headers['If-None-Match'] = entry[0]
+            if entry[1]:
+                headers['If-Modified-Since'] = entry[1]
+
+        try:
+            with session.get(url, headers=headers, stream=True, timeout=30) as response:
+                if response.status_code == 304 and entry is not None:
+                    self._touch(endpoint, key, fetched=True)
+                    return file_path
+                response.raise_for_status()
+                write_response(response, file_path)
+        except requests.exceptions.RequestException:
+            if entry is None:
+                raise
+            print('BŁĄD POBIERANIA. WCZYTUJĘ DANE Z PAMIĘCI PODRĘCZNEJ...')
+            self._touch(endpoint, key)
+            return file_path
+
+        self._store(endpoint, key, response)
+        return file_path
+
+    def evict(self, keep=None):
+        """
+            Usuwa najdawniej używane odpowiedzi, dopóki łączny rozmiar pamięci podręcznej przekracza max_bytes.
+
+            Args:
+                keep (tuple): Para (endpoint, key) odpowiedzi, której nie wolno usunąć (np. właśnie zapisanej).
+        """
+        with self._lock, self.conn:
+            total = self.conn.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+            if total <= self.max_bytes:
+                return
+            for endpoint, key, size in self.conn.execute('SELECT endpoint, key, size FROM entries '
+                                                         'ORDER BY accessed_at').fetchall():
+                if total <= self.max_bytes:
+                    break
+                if (endpoint, key) == keep:
+                    continue
+                if os.path.exists(self.path(endpoint, key)):
+                    os.remove(self.path(endpoint, key))
+                self.conn.execute('DELETE FROM entries WHERE endpoint = ? AND key = ?', (endpoint, key))
+                total -= size
+
+
+_default_cache = None
+_default_lock = threading.Lock()
+
+
+def default_cache():
+    """
+        Zwraca wspólną dla całej aplikacji instancję ResponseCache (tworzoną przy pierwszym użyciu).
+    """
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = ResponseCache()
+        return _default_cache
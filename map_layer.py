@@ -0,0 +1,240 @@
+"---------------------------------------------------MODUŁ: map_layer---------------------------------------------------"
+"""
+    Moduł zawierający warstwę mapy stacji pomiarowych używaną przez CommandMap. Położenia stacji przeliczane są na
+piksele mapy (rzut równoodległościowy na prostokąt MAP_BOUNDS) raz dla całej listy stacji i zapamiętywane, a bliskie
+sobie stacje łączone są w zbiorcze znaczniki (klastry) osobno dla każdego poziomu przybliżenia. Podkład mapy
+przeskalowywany jest raz na poziom przybliżenia (piramida obrazów), więc przybliżanie i przesuwanie mapy wymaga jedynie
+wycięcia widocznego fragmentu gotowego obrazu i narysowania znaczników z widocznego obszaru.
+    Warstwa i piramida obrazów są współdzielone między kolejnymi otwarciami mapy - warstwa budowana jest ponownie tylko
+wtedy, gdy rejestr stacji wczytał nową listę stacji.
+
+Moduł zawiera następujące elementy:
+- threading - moduł do synchronizacji przebudowy wspólnej warstwy,
+- collections - moduł zawierający namedtuple (klastry stacji dla poziomu przybliżenia),
+- numpy - moduł do obliczeń na tablicach,
+- PIL - moduł do wczytywania i skalowania obrazu mapy,
+- database - moduł zarządzający połączeniami z bazą danych,
+- station_registry - moduł udostępniający zapisaną listę stacji pomiarowych,
+- get_stations_data - moduł zawierający funkcję stations_in_bbox, wybierającą stacje z obszaru mapy.
+"""
+
+import threading
+from collections import namedtuple
+import numpy as np
+from PIL import Image
+from database import get_connection
+from station_registry import get_stations
+from get_stations_data import stations_in_bbox
+
+MAP_IMAGE = 'Poland_map.png'
+MAP_BOUNDS = (14.15, 24.2, 49, 54.9)  # min. i maks. długość, min. i maks. szerokość geograficzna krawędzi mapy
+ZOOM_LEVELS = (1, 2, 4)
+CLUSTER_SIZE = 24  # bok komórki (w pikselach ekranu), w której stacje łączone są w jeden znacznik
+HIT_RADIUS = 12  # maks. odległość kursora od znacznika (w pikselach ekranu), przy której znacznik jest wskazany
+
+ClusterLevel = namedtuple('ClusterLevel', ['x', 'y', 'counts', 'members'])
+ClusterLevel.__doc__ = """
+    Znaczniki mapy dla jednego poziomu przybliżenia: położenia (w pikselach mapy bazowej, jako środek ciężkości
+stacji), liczby stacji i tablice ID stacji należących do każdego znacznika.
+"""
+
+
+class Projection:
+    """
+        Rzut równoodległościowy współrzędnych geograficznych na piksele mapy o podanym rozmiarze.
+    """
+
+    def __init__(self, width, height, bounds=MAP_BOUNDS):
+        self.width = width
+        self.height = height
+        self.min_lon, self.max_lon, self.min_lat, self.max_lat = bounds
+        self.x_scale = width / (self.max_lon - self.min_lon)
+        self.y_scale = height / (self.max_lat - self.min_lat)
+
+    def to_pixels(self, latitudes, longitudes):
+        """
+            Zwraca tablice współrzędnych x, y (w pikselach mapy bazowej) dla tablic współrzędnych geograficznych.
+        """
+        x = (np.asarray(longitudes, dtype=np.float64) - self.min_lon) * self.x_scale
+        y = (self.max_lat - np.asarray(latitudes, dtype=np.float64)) * self.y_scale
+        return x, y
+
+    def to_geo(self, x, y):
+        """
+            Zwraca współrzędne geograficzne (szerokość, długość) punktu mapy bazowej.
+        """
+        return self.max_lat - y / self.y_scale, self.min_lon + x / self.x_scale
+
+
+class MarkerGrid:
+    """
+        Indeks znaczników jednego poziomu przybliżenia w siatce pikseli o boku cell. Znacznik pod kursorem wyszukiwany
+    jest tylko wśród znaczników z komórki kursora i komórek sąsiednich, bez przeglądania wszystkich znaczników.
+
+        Args:
+            x, y (numpy.ndarray): Położenia znaczników w pikselach przybliżonej mapy.
+            cell (int): Bok komórki siatki w pikselach, nie mniejszy niż promień wyszukiwania.
+    """
+
+    def __init__(self, x, y, cell=HIT_RADIUS):
+        self.x = x
+        self.y = y
+        self.cell = cell
+        self.cells = {}
+        for index, key in enumerate(zip((x // cell).astype(np.int64).tolist(), (y // cell).astype(np.int64).tolist())):
+            self.cells.setdefault(key, []).append(index)
+
+    def nearest(self, x, y, radius=HIT_RADIUS):
+        """
+            Zwraca indeks znacznika najbliższego punktowi (x, y), o ile leży nie dalej niż radius pikseli, inaczej None.
+        """
+        column, row = int(x // self.cell), int(y // self.cell)
+        reach = int(radius // self.cell) + 1
+        best, best_distance = None, radius * radius
+        for key_column in range(column - reach, column + reach + 1):
+            for key_row in range(row - reach, row + reach + 1):
+                for index in self.cells.get((key_column, key_row), ()):
+                    distance = (self.x[index] - x) ** 2 + (self.y[index] - y) ** 2
+                    if distance <= best_distance:
+                        best, best_distance = index, distance
+        return best
+
+
+class MapLayer:
+    """
+        Zrzutowane położenia stacji wraz z klastrami znaczników liczonymi raz dla każdego poziomu przybliżenia.
+
+        Args:
+            stations (list): Wiersze tabeli 'stations' (ID, nazwa, szerokość, długość, ...).
+            projection (Projection): Rzut na piksele mapy bazowej.
+            cluster_size (int): Bok komórki klastra w pikselach ekranu.
+    """
+
+    def __init__(self, stations, projection, cluster_size=CLUSTER_SIZE):
+        rows = [row for row in stations if row[2] is not None and row[3] is not None]
+        self.projection = projection
+        self.cluster_size = cluster_size
+        self.ids = np.array([row[0] for row in rows], dtype=np.int64)
+        self.x, self.y = projection.to_pixels([row[2] for row in rows], [row[3] for row in rows])
+        self._levels = {}
+        self._grids = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.ids)
+
+    def clusters(self, zoom):
+        """
+            Zwraca znaczniki (ClusterLevel) dla poziomu przybliżenia zoom. Stacje łączone są według komórek siatki
+        o boku cluster_size pikseli ekranu, więc przy większym przybliżeniu klastry rozpadają się na pojedyncze stacje.
+        """
+        with self._lock:
+            if zoom not in self._levels:
+                self._levels[zoom] = self._cluster(zoom)
+            return self._levels[zoom]
+
+    def _cluster(self, zoom):
+        if not len(self.ids):
+            empty = np.empty(0)
+            return ClusterLevel(empty, empty, np.empty(0, dtype=np.intp), [])
+        cell = self.cluster_size / zoom
+        columns = np.floor(self.x / cell).astype(np.int64)
+        rows = np.floor(self.y / cell).astype(np.int64)
+        _, inverse, counts = np.unique(np.stack([rows, columns], axis=1), axis=0,
+                                       return_inverse=True, return_counts=True)
+        inverse = inverse.ravel()
+        x = np.bincount(inverse, weights=self.x) / counts
+        y = np.bincount(inverse, weights=self.y) / counts
+        order = np.argsort(inverse, kind='stable')
+        members = np.split(self.ids[order], np.cumsum(counts)[:-1])
+        return ClusterLevel(x, y, counts, members)
+
+    def marker_at(self, zoom, x, y, radius=HIT_RADIUS):
+        """
+            Zwraca indeks znacznika poziomu zoom pod punktem (x, y) przybliżonej mapy albo None. Indeks siatki
+        znaczników budowany jest raz dla poziomu przybliżenia.
+        """
+        level = self.clusters(zoom)
+        with self._lock:
+            if zoom not in self._grids:
+                self._grids[zoom] = MarkerGrid(level.x * zoom, level.y * zoom)
+            grid = self._grids[zoom]
+        return grid.nearest(x, y, radius)
+
+    def visible(self, zoom, left, top, width, height, margin=CLUSTER_SIZE):
+        """
+            Zwraca indeksy znaczników poziomu zoom leżących w widoku o lewym górnym rogu (left, top) i podanym rozmiarze
+        (w pikselach przybliżonej mapy), powiększonym o margin, by znaczniki na krawędzi nie znikały.
+        """
+        level = self.clusters(zoom)
+        x, y = level.x * zoom, level.y * zoom
+        return np.flatnonzero((x >= left - margin) & (x <= left + width + margin)
+                              & (y >= top - margin) & (y <= top + height + margin))
+
+
+class ImagePyramid:
+    """
+        Obraz mapy przeskalowany na kolejne poziomy przybliżenia. Poziomy tworzone są przy pierwszym użyciu
+    i zapamiętywane.
+    """
+
+    def __init__(self, path=MAP_IMAGE, levels=ZOOM_LEVELS):
+        self.base = Image.open(path)
+        self.base.load()
+        self.levels = levels
+        self._images = {1: self.base}
+        self._lock = threading.Lock()
+
+    @property
+    def size(self):
+        return self.base.size
+
+    def level(self, zoom):
+        """
+            Zwraca obraz mapy dla poziomu przybliżenia zoom.
+        """
+        with self._lock:
+            if zoom not in self._images:
+                width, height = self.base.size
+                self._images[zoom] = self.base.resize((width * zoom, height * zoom), Image.LANCZOS)
+            return self._images[zoom]
+
+    def crop(self, zoom, left, top, width, height):
+        """
+            Zwraca widoczny fragment mapy dla poziomu przybliżenia zoom (bez kopiowania całego przeskalowanego obrazu).
+        """
+        return self.level(zoom).crop((left, top, left + width, top + height))
+
+
+_layer = None
+_layer_rows = None
+_pyramid = None
+_layer_lock = threading.Lock()
+
+
+def map_pyramid():
+    """
+        Zwraca wspólną piramidę obrazów mapy Polski.
+    """
+    global _pyramid
+    with _layer_lock:
+        if _pyramid is None:
+            _pyramid = ImagePyramid()
+        return _pyramid
+
+
+def map_layer():
+    """
+        Zwraca warstwę stacji z obszaru mapy, zrzutowaną na mapę bazową. Warstwa (wraz z klastrami) budowana jest
+    ponownie tylko wtedy, gdy rejestr stacji wczytał nową listę stacji.
+    """
+    global _layer, _layer_rows
+    stations = get_stations()
+    width, height = map_pyramid().size
+    with _layer_lock:
+        if stations is not _layer_rows:
+            min_lon, max_lon, min_lat, max_lat = MAP_BOUNDS
+            rows = stations_in_bbox(get_connection(), min_lat, max_lat, min_lon, max_lon)
+            _layer = MapLayer(rows, Projection(width, height))
+            _layer_rows = stations
+        return _layer
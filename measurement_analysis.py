@@ -1,85 +1,240 @@
 "-------------------------------------------------measurement_analysis-------------------------------------------------"
 """
     Moduł stanowiący analizę danych. Zawiera klasę MeasurementAnalysis, która generuje wykres zawierający pomiary 
-wybranego parametru, a także dokonuje prostej analizy danych, w tym pokazuje trend.
+wybranego parametru, a także dokonuje prostej analizy danych, w tym pokazuje trend. Na wykresach rysowane są tylko
+punkty wybrane z widocznego zakresu w liczbie odpowiadającej szerokości wykresu (moduł decimation), więc wykres długiej
+historii rysuje się równie szybko jak wykres kilku dni.
+    Pomiary stanowiska odczytywane są z serii odwzorowanej w pamięci (moduł series_store), uaktualnianej przyrostowo po
+zapisie nowych pomiarów, więc wykres, analiza i kolejne instancje MeasurementAnalysis nie wczytują ich ponownie z bazy.
+Ramka danych całej tabeli 'measurements' (z typowanymi kolumnami: datą i liczbą zmiennoprzecinkową) wczytywana jest
+raz i zapamiętywana w pamięci procesu do czasu dopisania do bazy nowych pomiarów.
+    Wykres długiej historii stanowiska (dłuższej niż trends.RAW_RANGE) rysowany jest ze średnich dobowych lub
+miesięcznych odczytanych z tabel statystyk okresowych, a nie z pomiarów; trend długiej historii liczony jest ze średnich
+godzinowych, więc okno trendu ma to samo znaczenie niezależnie od rozdzielczości wykresu. Linia trendu wyznaczana jest
+jedną z metod modułu trends (średnia krocząca o stałym czasie trwania okna, EWMA, średnie 24- i 8-godzinne).
+    Na wykresach stanowiska rysowana jest także prognoza na kolejne godziny wraz z przedziałem prognozy (moduł
+forecasting), liczona z modelu stanowiska aktualizowanego przy zapisie pomiarów.
 
 Moduł zawiera następujące elementy:
-- sqlite3 - moduł do łączenia z bazą danych database.db,
+- os, threading, collections - moduły do obsługi wspólnej pamięci podręcznej ramek danych,
+- numpy - moduł do obliczeń na tablicach,
+- database - moduł zarządzający połączeniami z bazą danych database.db,
+- measurement_stats - moduł ze statystykami pomiarów aktualizowanymi przy zapisie pomiarów,
+- series_store - moduł z seriami pomiarów stanowisk odwzorowanymi w pamięci (numpy.memmap),
+- decimation - moduł zmniejszający liczbę rysowanych punktów do szerokości wykresu (LTTB, min/max),
+- trends - moduł z metodami wyznaczania linii trendu i odczytem serii zagregowanych,
+- forecasting - moduł z prognozami pomiarów stanowisk,
 - pandas - moduł, który został wykorzystany do generowania dataframe,
 - matplotlib - moduł, który został wykorzystany w celu generowania wykresów
 """
 
-import sqlite3
+import os
+import threading
+from collections import OrderedDict
+import numpy as np
+from database import get_connection
+from measurement_stats import sensor_statistics
+from series_store import data_version, open_series
+from decimation import DecimatedLine
+from trends import TREND_METHODS, resolution_for, rollup, trend as trend_line
+from forecasting import HORIZON, forecast as forecast_frame
 import pandas as pd
 from matplotlib import pyplot as plt
 
+DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+FRAME_CACHE_SIZE = 4
+SERIES_LABELS = {'raw': 'Dane', 'day': 'Średnie dobowe', 'month': 'Średnie miesięczne'}
+
+_frames = OrderedDict()
+_frames_lock = threading.Lock()
+
+
+def read_frame(conn):
+    """
+        Wczytuje pomiary całej tabeli 'measurements' do ramki danych z kolumnami 'values_date' (datetime64)
+    i 'values_value' (float64, NaN dla pomiarów bez wartości), posortowanej według daty.
+    """
+    rows = conn.execute('SELECT values_date, values_value FROM measurements ORDER BY values_date').fetchall()
+    dates, values = zip(*rows) if rows else ((), ())
+    return pd.DataFrame({'values_date': pd.to_datetime(pd.Series(dates, dtype=object), format=DATE_FORMAT),
+                         'values_value': np.array(values, dtype=np.float64)})
+
+
+def measurement_frame(db_file):
+    """
+        Zwraca zapamiętaną ramkę danych całej tabeli 'measurements', wczytując ją ponownie, jeśli od jej wczytania
+    do bazy dopisano pomiary. Ramka jest wspólna dla wszystkich użytkowników i nie powinna być modyfikowana.
+    """
+    conn = get_connection(db_file)
+    key = os.path.abspath(db_file)
+    version = data_version(conn)
+    with _frames_lock:
+        cached = _frames.get(key)
+        if cached is not None and cached[0] == version:
+            _frames.move_to_end(key)
+            return cached[1]
+    frame = read_frame(conn)
+    with _frames_lock:
+        _frames[key] = (version, frame)
+        _frames.move_to_end(key)
+        while len(_frames) > FRAME_CACHE_SIZE:
+            _frames.popitem(last=False)
+    return frame
+
+
 class MeasurementAnalysis():
     """"
     Klasa łączy się z bazą danych i pobiera dane pomiarowe wybranego paramtru. Wykonuje wykresy i analizę danych.
     """
-    def __init__(self, db_file='database.db'):
+    def __init__(self, db_file='database.db', sensor_id=None, decimation='minmax'):
         """
             Inicjalizuje instancję klasy MeasurementAnalysis.
+
+            Args:
+                db_file (str): Ścieżka do pliku bazy danych.
+                sensor_id (int): Numer ID stanowiska pomiarowego. Dla None analizowana jest cała tabela 'measurements'.
+                decimation (str): Metoda zmniejszania liczby rysowanych pomiarów: 'minmax' (zachowuje wartości
+                    skrajne) lub 'lttb' (zachowuje kształt przebiegu).
         """
-        self.conn = sqlite3.connect(db_file)
+        self.db_file = db_file
+        self.decimation = decimation
+        self.conn = get_connection(db_file)
         self.cursor = self.conn.cursor()
+        self.sensor_id = sensor_id
 
     def get_data(self):
         """
-            Pobiera dane, tworzy i zwraca ramkę danych.
+            Zwraca ramkę danych (kolumny 'values_date' i 'values_value'): dla stanowiska - utworzoną z serii
+        odwzorowanej w pamięci, dla całej tabeli - zapamiętaną ramkę modułu.
+        """
+        if self.sensor_id is None:
+            return measurement_frame(self.db_file)
+        series = open_series(self.db_file, self.sensor_id).series()
+        return pd.DataFrame({'values_date': series.index.to_numpy(),
+                             'values_value': series.to_numpy(dtype=np.float64)})
+
+    def statistics(self):
         """
-        self.cursor.execute('SELECT * FROM measurements')
-        data = self.cursor.fetchall()
-        df = pd.DataFrame(data)
-        df[0] = pd.to_datetime(df[0])
-        df[1] = pd.to_numeric(df[1])
-        return df
+            Zwraca podstawowe statystyki pomiarów. Dla stanowiska odczytywane są statystyki utrzymywane przy zapisie
+        pomiarów (jeden wiersz tabeli 'sensor_stats'), dla całej tabeli - liczone z ramki danych.
+
+        Returns:
+            dict: Wartość największa i najmniejsza, ich daty, średnia, odchylenie standardowe i liczba pomiarów.
+        """
+        stats = None if self.sensor_id is None else sensor_statistics(self.conn, self.sensor_id)
+        if stats is not None:
+            return {'max_value': stats['max_value'],
+                    'min_value': stats['min_value'],
+                    'min_date': stats['min_date'],
+                    'max_date': stats['max_date'],
+                    'data_mean': stats['mean'],
+                    'data_std': stats['std'],
+                    'count': stats['count']}
+        df = self.get_data()
+        return {'max_value': df['values_value'].max(),
+                'min_value': df['values_value'].min(),
+                'min_date': df.loc[df['values_value'].idxmin(), 'values_date'] if df['values_value'].count() else None,
+                'max_date': df.loc[df['values_value'].idxmax(), 'values_date'] if df['values_value'].count() else None,
+                'data_mean': df['values_value'].mean(),
+                'data_std': df['values_value'].std(),
+                'count': int(df['values_value'].count())}
+
+    def series(self):
+        """
+            Zwraca serię do wykresu i wyznaczania trendu: pomiary, jeśli historia stanowiska jest krótka, a dla długiej
+        historii - średnie dobowe lub miesięczne z tabel statystyk okresowych (bez wczytywania pomiarów). Pomiary
+        stanowiska odczytywane są z serii odwzorowanej w pamięci (series_store), pomiary całej tabeli - z ramki danych.
+
+            Returns:
+                tuple: Seria wartości z indeksem dat (pandas.Series) i jej rozdzielczość ('raw', 'day' lub 'month').
+        """
+        stats = None if self.sensor_id is None else sensor_statistics(self.conn, self.sensor_id)
+        if stats is not None:
+            resolution = resolution_for(pd.Timestamp(stats['last_date']) - pd.Timestamp(stats['first_date']))
+            if resolution != 'raw':
+                return rollup(self.conn, self.sensor_id, resolution)['mean'], resolution
+        if self.sensor_id is not None:
+            return open_series(self.db_file, self.sensor_id).series(), 'raw'
+        df = self.get_data()
+        return df.set_index('values_date')['values_value'], 'raw'
+
+    def trend(self, method='rolling', **options):
+        """
+            Zwraca linię trendu (pandas.Series z indeksem dat) wyznaczoną metodą method (klucz trends.TREND_METHODS).
+        Trend długiej historii (rysowanej ze średnich dobowych lub miesięcznych) liczony jest ze średnich godzinowych,
+        ponieważ okna metod (np. 7 dni średniej kroczącej) są krótsze od okresu serii miesięcznej.
+
+            Args:
+                method (str): Metoda wyznaczania trendu.
+                **options: Parametry metody przekazywane do trends.trend (window, halflife).
+        """
+        series, resolution = self.series()
+        if resolution != 'raw':
+            series = rollup(self.conn, self.sensor_id, 'hour')['mean']
+        return trend_line(series, method, **options)
+
+    def forecast(self, hours=HORIZON):
+        """
+            Zwraca prognozę stanowiska na hours godzin (ramka danych z kolumnami 'forecast', 'lower', 'upper' i indeksem
+        dat) albo None, jeśli analizowana jest cała tabela lub model stanowiska ma za krótką historię.
+        """
+        if self.sensor_id is None:
+            return None
+        return forecast_frame(self.conn, self.sensor_id, hours)
+
+    def draw_forecast(self, hours=HORIZON):
+        """
+            Rysuje na bieżącym wykresie prognozę stanowiska jako linię z pasmem przedziału prognozy.
+        """
+        frame = self.forecast(hours)
+        if frame is None:
+            return
+        dates = frame.index.to_numpy()
+        plt.fill_between(dates, frame['lower'].to_numpy(), frame['upper'].to_numpy(), color='tab:green', alpha=0.25,
+                         label='Przedział prognozy')
+        plt.plot(dates, frame['forecast'].to_numpy(), color='tab:green', label=f'Prognoza {hours} h')
 
     def chart(self):
         """
             Tworzy wykres.
         """
-        df = self.get_data()
+        series, resolution = self.series()
         plt.figure(num='Wykres danych', figsize=(14, 7))
         plt.grid(True, which='both')
         plt.title('Wyniki pomiarów')
         plt.xlabel('Data pomiaru [miesiąc-dzień godzina]')
         plt.xticks(rotation=90)
         plt.ylabel('Wartości pomiarowe')
-        plt.plot(df[0], df[1], label='Dane')
+        self.lines = [DecimatedLine(plt.gca(), series.index.to_numpy(), series.to_numpy(), self.decimation,
+                                    label=SERIES_LABELS[resolution])]
+        self.draw_forecast()
         plt.legend()
         plt.subplots_adjust(bottom=0.2)
         plt.show()
 
-    def analyze(self):
+    def analyze(self, method='rolling'):
         """
-            Dokonuje prostej analizy danych i rysuje linię trendu metodą średniej kroczącej.
+            Dokonuje prostej analizy danych i rysuje linię trendu oraz prognozę.
+
+            Args:
+                method (str): Metoda wyznaczania trendu (klucz trends.TREND_METHODS).
         """
-        df = self.get_data()
+        series, resolution = self.series()
+        trend = self.trend(method)
         plt.figure(num="Analiza danych",figsize=(14, 7))
         plt.grid(True, which='both')
-        plt.title('Wyznaczanie linii trendu metodą średniej kroczącej')
+        plt.title(f'Wyznaczanie linii trendu: {TREND_METHODS[method]}')
         plt.xlabel('Data pomiaru [miesiąc-dzień godzina]')
         plt.xticks(rotation=90)
         plt.ylabel('Wartości pomiarowe')
-        max_value = df[1].max()
-        min_value = df[1].min()
-        min_date = df.loc[df[1].idxmin(), 0]
-        max_date = df.loc[df[1].idxmax(), 0]
-        data_mean = df[1].mean()
-        window_size = len(df) // 10
-        trend = df[1].rolling(window=window_size, center=True).mean()
-        plt.plot(df[0], df[1], label='Dane')
-        plt.plot(df[0], trend, label='Trend')
+        self.lines = [DecimatedLine(plt.gca(), series.index.to_numpy(), series.to_numpy(), self.decimation,
+                                    label=SERIES_LABELS[resolution]),
+                      DecimatedLine(plt.gca(), trend.index.to_numpy(), trend.to_numpy(), 'lttb', label='Trend')]
+        self.draw_forecast()
         plt.legend()
         plt.subplots_adjust(bottom=0.2)
         plt.show()
-        self.conn.close()
 
-        return {'max_value': max_value,
-                'min_value': min_value,
-                'min_date': min_date,
-                'max_date': max_date,
-                'data_mean': data_mean}
+        return self.statistics()
 
 if __name__ == '__main__': MeasurementAnalysis()
\ No newline at end of file
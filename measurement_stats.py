@@ -0,0 +1,195 @@
+"-----------------------------------------------MODUŁ: measurement_stats-----------------------------------------------"
+"""
+    Moduł zawierający statystyki pomiarów utrzymywane w bazie danych w trakcie zapisu pomiarów. Dla każdego stanowiska
+(tabela 'sensor_stats') oraz dla każdej godziny, dnia i miesiąca (tabele 'sensor_hourly_stats', 'sensor_daily_stats'
+i 'sensor_monthly_stats') zapisywane są: liczba pomiarów, suma, suma kwadratów, średnia i suma kwadratów odchyleń
+od średniej (metoda Welforda), wartość najmniejsza i największa wraz z datami oraz data pierwszego i ostatniego
+pomiaru.
+    Nowe pomiary łączone są z zapisanymi statystykami wzorem Chana dla wariancji łączonej, więc aktualizacja zależy
+tylko od liczby nowych pomiarów, a odczyt statystyk - niezależnie od długości historii - to odczyt jednego wiersza.
+Liczone są tylko pomiary z wartością; save_measurements zapisuje każdą wartość dokładnie raz (pomiary bez wartości są
+liczone dopiero po uzupełnieniu).
+
+Moduł zawiera następujące elementy:
+- math - moduł funkcji matematycznych,
+- itertools - moduł zawierający funkcję groupby (podział pomiarów na godziny, dni i miesiące).
+"""
+
+import math
+from itertools import groupby
+
+STATS_COLUMNS = ('count', 'sum', 'sumsq', 'mean', 'm2', 'min_value', 'min_date', 'max_value', 'max_date',
+                 'first_date', 'last_date')
+# tabela statystyk okresowych, kolumna okresu i długość prefiksu daty pomiaru wyznaczającego okres
+PERIOD_TABLES = (('sensor_hourly_stats', 'hour', 13), ('sensor_daily_stats', 'day', 10),
+                 ('sensor_monthly_stats', 'month', 7))
+
+
+def _stats_columns_sql():
+    return '''count INTEGER NOT NULL,
+              sum REAL NOT NULL,
+              sumsq REAL NOT NULL,
+              mean REAL NOT NULL,
+              m2 REAL NOT NULL,
+              min_value REAL,
+              min_date DATETIME,
+              max_value REAL,
+              max_date DATETIME,
+              first_date DATETIME,
+              last_date DATETIME'''
+
+
+def create_stats_tables(conn):
+    """
+        Tworzy tabele statystyk, o ile jeszcze nie istnieją. Jeśli tabele powstają w bazie, w której są już pomiary,
+    statystyki nowych tabel są od razu wyliczane z zapisanej historii (także gdy do istniejącej bazy dochodzi nowa
+    tabela okresowa).
+
+        Args:
+            conn (sqlite3.Connection): Połączenie z bazą danych.
+    """
+    existing = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+    created = [table for table in ('sensor_stats',) + tuple(table for table, _, _ in PERIOD_TABLES)
+               if table not in existing]
+    if not created:
+        return
+    conn.execute(f'''CREATE TABLE IF NOT EXISTS sensor_stats (
+                     sensor_id INTEGER NOT NULL PRIMARY KEY,
+                     {_stats_columns_sql()})''')
+    for table, period, _ in PERIOD_TABLES:
+        conn.execute(f'''CREATE TABLE IF NOT EXISTS {table} (
+                         sensor_id INTEGER NOT NULL,
+                         {period} TEXT NOT NULL,
+                         {_stats_columns_sql()},
+                         PRIMARY KEY (sensor_id, {period})) WITHOUT ROWID''')
+    if 'measurements' in existing:
+        sensors = [row[0] for row in conn.execute(
+            'SELECT DISTINCT sensor_id FROM measurements WHERE values_value IS NOT NULL')]
+        for sensor_id in sensors:
+            update_statistics(conn, sensor_id, conn.execute(
+                '''SELECT values_date, values_value FROM measurements
+                   WHERE sensor_id = ? AND values_value IS NOT NULL ORDER BY values_date''', (sensor_id,)),
+                tables=created)
+
+
+def summarize(rows):
+    """
+        Zwraca statystyki (słownik o kluczach STATS_COLUMNS) dla pomiarów (data, wartość) posortowanych według daty,
+    liczone jednym przejściem metodą Welforda. Dla pustej listy zwraca None.
+    """
+    stats = None
+    for date, value in rows:
+        if stats is None:
+            stats = {'count': 0, 'sum': 0.0, 'sumsq': 0.0, 'mean': 0.0, 'm2': 0.0, 'min_value': value,
+                     'min_date': date, 'max_value': value, 'max_date': date, 'first_date': date}
+        stats['count'] += 1
+        stats['sum'] += value
+        stats['sumsq'] += value * value
+        delta = value - stats['mean']
+        stats['mean'] += delta / stats['count']
+        stats['m2'] += delta * (value - stats['mean'])
+        if value < stats['min_value']:
+            stats['min_value'], stats['min_date'] = value, date
+        if value > stats['max_value']:
+            stats['max_value'], stats['max_date'] = value, date
+        stats['last_date'] = date
+    return stats
+
+
+def merge(old, new):
+    """
+        Łączy statystyki wcześniejszych pomiarów (old) ze statystykami nowszych pomiarów (new). Przy równych wartościach
+    skrajnych zachowywana jest data wcześniejszego pomiaru.
+    """
+    if old is None:
+        return new
+    count = old['count'] + new['count']
+    delta = new['mean'] - old['mean']
+    merged = {'count': count,
+              'sum': old['sum'] + new['sum'],
+              'sumsq': old['sumsq'] + new['sumsq'],
+              'mean': old['mean'] + delta * new['count'] / count,
+              'm2': old['m2'] + new['m2'] + delta * delta * old['count'] * new['count'] / count,
+              'first_date': min(old['first_date'], new['first_date']),
+              'last_date': max(old['last_date'], new['last_date'])}
+    for kind, better in (('min', lambda a, b: a < b), ('max', lambda a, b: a > b)):
+        first, second = (old, new) if old[f'{kind}_date'] <= new[f'{kind}_date'] else (new, old)
+        winner = second if better(second[f'{kind}_value'], first[f'{kind}_value']) else first
+        merged[f'{kind}_value'], merged[f'{kind}_date'] = winner[f'{kind}_value'], winner[f'{kind}_date']
+    return merged
+
+
+def _read(conn, table, where, key):
+    row = conn.execute(f'SELECT {", ".join(STATS_COLUMNS)} FROM {table} WHERE {where}', key).fetchone()
+    return dict(zip(STATS_COLUMNS, row)) if row else None
+
+
+def _write(conn, table, key_columns, key, stats):
+    columns = key_columns + STATS_COLUMNS
+    conn.execute(f'INSERT OR REPLACE INTO {table} ({", ".join(columns)}) VALUES ({", ".join("?" * len(columns))})',
+                 key + tuple(stats[column] for column in STATS_COLUMNS))
+
+
+def update_statistics(conn, sensor_id, rows, tables=None):
+    """
+        Dołącza nowe pomiary stanowiska do statystyk całej historii, godzin, dni i miesięcy. Pomiary bez wartości są
+    pomijane. Funkcja nie zatwierdza transakcji - wywoływana jest przez save_measurements w transakcji zapisu pomiarów.
+
+        Args:
+            conn (sqlite3.Connection): Połączenie z bazą danych.
+            sensor_id (int): Numer ID stanowiska pomiarowego.
+            rows (iterable): Nowe pomiary (data, wartość).
+            tables (list): Nazwy aktualizowanych tabel statystyk (None - wszystkie).
+
+        Returns:
+            int: Liczba pomiarów dołączonych do statystyk.
+    """
+    rows = sorted((date, float(value)) for date, value in rows if value is not None)
+    if not rows:
+        return 0
+    if tables is None or 'sensor_stats' in tables:
+        _write(conn, 'sensor_stats', ('sensor_id',), (sensor_id,),
+               merge(_read(conn, 'sensor_stats', 'sensor_id = ?', (sensor_id,)), summarize(rows)))
+    for table, period, length in PERIOD_TABLES:
+        if tables is not None and table not in tables:
+            continue
+        for key, group in groupby(rows, key=lambda row: row[0][:length]):
+            old = _read(conn, table, f'sensor_id = ? AND {period} = ?', (sensor_id, key))
+            _write(conn, table, ('sensor_id', period), (sensor_id, key), merge(old, summarize(group)))
+    return len(rows)
+
+
+def _with_derived(stats):
+    if stats is None:
+        return None
+    stats['variance'] = stats['m2'] / (stats['count'] - 1) if stats['count'] > 1 else 0.0
+    stats['std'] = math.sqrt(stats['variance'])
+    return stats
+
+
+def sensor_statistics(conn, sensor_id):
+    """
+        Zwraca statystyki całej historii stanowiska (słownik o kluczach STATS_COLUMNS oraz 'variance' i 'std' -
+    wariancja i odchylenie standardowe z próby) albo None, jeśli stanowisko nie ma pomiarów z wartością.
+
+        Example:
+            stats = sensor_statistics(conn, 3584)
+            print(stats['max_value'], stats['max_date'], round(stats['mean'], 2))
+    """
+    return _with_derived(_read(conn, 'sensor_stats', 'sensor_id = ?', (sensor_id,)))
+
+
+def period_statistics(conn, sensor_id, period='day', start=None, end=None):
+    """
+        Zwraca statystyki stanowiska dla kolejnych godzin (period='hour', klucz 'RRRR-MM-DD GG'), dni (period='day',
+    klucz 'RRRR-MM-DD') lub miesięcy (period='month', klucz 'RRRR-MM'), opcjonalnie ograniczone do okresów od start
+    do end włącznie.
+
+        Returns:
+            list: Pary (okres, słownik statystyk), posortowane według okresu.
+    """
+    table = {name: table for table, name, _ in PERIOD_TABLES}[period]
+    rows = conn.execute(f'''SELECT {period}, {", ".join(STATS_COLUMNS)} FROM {table}
+                            WHERE sensor_id = ? AND {period} >= ? AND {period} <= ?
+                            ORDER BY {period}''', (sensor_id, start or '', end or '￿'))
+    return [(row[0], _with_derived(dict(zip(STATS_COLUMNS, row[1:])))) for row in rows]
@@ -0,0 +1,243 @@
+"------------------------------------------------MODUŁ: parquet_archive------------------------------------------------"
+"""
+    Moduł zawierający archiwum historii pomiarów w plikach Parquet (format kolumnowy), przeznaczone do analiz
+wieloletnich wszystkich stanowisk bez odczytu tabeli 'measurements'. Archiwum podzielone jest na partycje według kodu
+parametru i miesiąca (katalogi param_code=PM10/month=2024-03), a każdy wiersz zawiera pomiar z wartością wraz z danymi
+stanowiska i stacji (sensor_id, station_id, param_name, station_name, city_name, province_name). Wiersze w plikach
+posortowane są według stanowiska i daty, więc statystyki grup wierszy pozwalają pomijać fragmenty plików
+przy filtrowaniu.
+    Eksport jest przyrostowy: dla każdej partycji w pliku _manifest.json zapisywana jest liczba wierszy i data
+najnowszego pomiaru, a bieżący stan partycji odczytywany jest z tabeli statystyk miesięcznych (moduł
+measurement_stats). Partycje bez zmian są pomijane; jeśli w partycji doszły tylko pomiary nowsze od zapisanych,
+dopisywany jest kolejny plik z nowymi wierszami, a w przeciwnym razie (uzupełnienia dawnych luk) partycja jest
+zapisywana od nowa.
+    Funkcja read_archive odczytuje archiwum z filtrowaniem po stronie czytnika: pomijane są partycje spoza wybranych
+parametrów i zakresu miesięcy oraz kolumny, które nie zostały wybrane.
+
+Moduł zawiera następujące elementy:
+- os, shutil, json, argparse - moduły do operacji na plikach i katalogach, zapisu manifestu i obsługi argumentów
+  wiersza poleceń,
+- urllib.parse - moduł do kodowania nazw katalogów partycji,
+- numpy - moduł do obliczeń na tablicach,
+- pandas - moduł, który został wykorzystany do generowania dataframe,
+- pyarrow - moduł do zapisu i odczytu plików Parquet,
+- database - moduł zarządzający połączeniami z bazą danych database.db,
+- get_sensors_data, get_stations_data, get_measurements_data - moduły tworzące tabele stanowisk, stacji i pomiarów.
+"""
+
+import os
+import shutil
+import json
+import argparse
+from urllib.parse import quote
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+from database import get_connection
+from get_sensors_data import create_sensors_table
+from get_stations_data import create_stations_table
+from get_measurements_data import create_measurements_table
+
+ARCHIVE_DIR = 'archive'
+MANIFEST = '_manifest.json'
+SCHEMA = pa.schema([('sensor_id', pa.int32()),
+                    ('station_id', pa.int32()),
+                    ('values_date', pa.timestamp('s')),
+                    ('values_value', pa.float64()),
+                    ('param_name', pa.string()),
+                    ('station_name', pa.string()),
+                    ('city_name', pa.string()),
+                    ('province_name', pa.string())])
+PARTITIONING = ds.partitioning(pa.schema([('param_code', pa.string()), ('month', pa.string())]), flavor='hive')
+ROW_GROUP_SIZE = 64 * 1024
+COMPRESSION = 'zstd'
+
+
+def partition_dir(path, param_code, month):
+    """
+        Zwraca katalog partycji parametru param_code i miesiąca month ('RRRR-MM').
+    """
+    return os.path.join(path, f'param_code={quote(param_code, safe="")}', f'month={month}')
+
+
+def _month_bounds(month):
+    year, number = int(month[:4]), int(month[5:7])
+    following = f'{year + number // 12:04d}-{number % 12 + 1:02d}'
+    return f'{month}-01 00:00:00', f'{following}-01 00:00:00'
+
+
+def _load_manifest(path):
+    file = os.path.join(path, MANIFEST)
+    if not os.path.exists(file):
+        return {}
+    with open(file, encoding='utf-8') as handle:
+        return json.load(handle)
+
+
+def _save_manifest(path, manifest):
+    file = os.path.join(path, MANIFEST)
+    with open(file + '.tmp', 'w', encoding='utf-8') as handle:
+        json.dump(manifest, handle, indent=1, sort_keys=True)
+    os.replace(file + '.tmp', file)
+
+
+def partition_state(conn):
+    """
+        Zwraca bieżący stan partycji odczytany z tabeli statystyk miesięcznych: słownik {(kod parametru, miesiąc):
+    (liczba pomiarów z wartością, data najnowszego pomiaru)}.
+    """
+    rows = conn.execute('''SELECT s.param_code, ms.month, SUM(ms.count), MAX(ms.last_date)
+                           FROM sensor_monthly_stats ms JOIN sensors s ON s.id = ms.sensor_id
+                           WHERE s.param_code IS NOT NULL
+                           GROUP BY s.param_code, ms.month''')
+    return {(param_code, month): (count, last_date) for param_code, month, count, last_date in rows}
+
+
+def _partition_rows(conn, param_code, start, end, after=''):
+    rows = conn.execute('''SELECT m.sensor_id, s.station_id, m.values_date, m.values_value, s.param_name,
+                                  st.station_name, st.city_name, st.province_name
+                           FROM sensors s
+                           JOIN measurements m ON m.sensor_id = s.id
+                           LEFT JOIN stations st ON st.id = s.station_id
+                           WHERE s.param_code = ? AND m.values_date >= ? AND m.values_date < ? AND m.values_date > ?
+                             AND m.values_value IS NOT NULL
+                           ORDER BY m.sensor_id, m.values_date''', (param_code, start, end, after)).fetchall()
+    columns = list(zip(*rows)) if rows else [()] * len(SCHEMA)
+    arrays = [pa.array(np.array(column, dtype='datetime64[s]')) if field.name == 'values_date'
+              else pa.array(column, type=field.type) for field, column in zip(SCHEMA, columns)]
+    return pa.Table.from_arrays(arrays, schema=SCHEMA)
+
+
+def _count_until(conn, param_code, start, end):
+    return conn.execute('''SELECT COUNT(*) FROM sensors s JOIN measurements m ON m.sensor_id = s.id
+                           WHERE s.param_code = ? AND m.values_date >= ? AND m.values_date <= ?
+                             AND m.values_value IS NOT NULL''', (param_code, start, end)).fetchone()[0]
+
+
+def export_archive(conn, path=ARCHIVE_DIR, full=False):
+    """
+        Eksportuje historię pomiarów do archiwum Parquet, zapisując tylko partycje, które zmieniły się od poprzedniego
+    eksportu.
+
+        Args:
+            conn (sqlite3.Connection): Połączenie z bazą danych.
+            path (str): Katalog archiwum.
+            full (bool): True - zapisanie wszystkich partycji od nowa (np. po zmianie danych stacji); wcześniej usuwane
+                są wszystkie katalogi partycji, także partycji nieobecnych w manifeście.
+
+        Returns:
+            dict: Liczby partycji 'appended' (dopisane nowe wiersze), 'rewritten' (zapisane od nowa), 'removed'
+            (usunięte) i 'unchanged' (pominięte).
+    """
+    create_sensors_table(conn)
+    create_stations_table(conn)
+    create_measurements_table(conn)
+    os.makedirs(path, exist_ok=True)
+    manifest = _load_manifest(path)
+    if full:
+        # po usunięciu katalogów żadna partycja nie jest pomijana ani uzupełniana, a partycje z manifestu, których
+        # nie ma już w bazie, liczone są jako usunięte
+        for name in os.listdir(path):
+            if name.startswith('param_code='):
+                shutil.rmtree(os.path.join(path, name))
+    state = partition_state(conn)
+    summary = {'appended': 0, 'rewritten': 0, 'removed': 0, 'unchanged': 0}
+
+    for key in sorted(state):
+        param_code, month = key
+        count, last_date = state[key]
+        name = f'{param_code}/{month}'
+        directory = partition_dir(path, param_code, month)
+        saved = manifest.get(name)
+        if saved and (saved['rows'], saved['last_date']) == (count, last_date) and os.path.isdir(directory):
+            summary['unchanged'] += 1
+            continue
+        start, end = _month_bounds(month)
+        if saved and os.path.isdir(directory) and last_date > saved['last_date'] \
+                and _count_until(conn, param_code, start, saved['last_date']) == saved['rows']:
+            table = _partition_rows(conn, param_code, start, end, saved['last_date'])
+            files = saved['files'] + 1
+            summary['appended'] += 1
+        else:
+            if os.path.isdir(directory):
+                for file in os.listdir(directory):
+                    os.remove(os.path.join(directory, file))
+            table = _partition_rows(conn, param_code, start, end)
+            files = 1
+            summary['rewritten'] += 1
+        os.makedirs(directory, exist_ok=True)
+        pq.write_table(table, os.path.join(directory, f'part-{files - 1}.parquet'), row_group_size=ROW_GROUP_SIZE,
+                       compression=COMPRESSION)
+        manifest[name] = {'rows': count, 'last_date': last_date, 'files': files}
+
+    for name in sorted(set(manifest) - {f'{param_code}/{month}' for param_code, month in state}):
+        param_code, month = name.rsplit('/', 1)
+        directory = partition_dir(path, param_code, month)
+        if os.path.isdir(directory):
+            for file in os.listdir(directory):
+                os.remove(os.path.join(directory, file))
+            os.rmdir(directory)
+        del manifest[name]
+        summary['removed'] += 1
+    _save_manifest(path, manifest)
+    return summary
+
+
+def read_archive(path=ARCHIVE_DIR, columns=None, param_codes=None, start=None, end=None, sensors=None,
+                 stations=None):
+    """
+        Odczytuje pomiary z archiwum Parquet. Warunki na parametr i zakres dat pomijają całe partycje, warunki
+    na stanowiska i stacje - grupy wierszy, których statystyki wykluczają dopasowanie; odczytywane są tylko wybrane
+    kolumny.
+
+        Args:
+            path (str): Katalog archiwum.
+            columns (list): Odczytywane kolumny (None - wszystkie, łącznie z 'param_code' i 'month').
+            param_codes (list): Kody parametrów, np. ['PM10', 'PM2.5'] (None - wszystkie).
+            start, end (str): Zakres dat pomiarów (włącznie), np. '2023-01-01' - '2023-12-31 23:00:00'.
+            sensors (list): Numery ID stanowisk (None - wszystkie).
+            stations (list): Numery ID stacji (None - wszystkie).
+
+        Returns:
+            pandas.DataFrame: Odczytane pomiary.
+
+        Example:
+            frame = read_archive(columns=['sensor_id', 'values_date', 'values_value'], param_codes=['PM10'],
+                                 start='2022-01-01', end='2023-12-31')
+    """
+    conditions = []
+    if param_codes is not None:
+        conditions.append(ds.field('param_code').isin(list(param_codes)))
+    if start is not None:
+        start = pd.Timestamp(start)
+        conditions += [ds.field('month') >= start.strftime('%Y-%m'),
+                       ds.field('values_date') >= pa.scalar(start.to_pydatetime(), type=pa.timestamp('s'))]
+    if end is not None:
+        end = pd.Timestamp(end)
+        conditions += [ds.field('month') <= end.strftime('%Y-%m'),
+                       ds.field('values_date') <= pa.scalar(end.to_pydatetime(), type=pa.timestamp('s'))]
+    if sensors is not None:
+        conditions.append(ds.field('sensor_id').isin([int(sensor_id) for sensor_id in sensors]))
+    if stations is not None:
+        conditions.append(ds.field('station_id').isin([int(station_id) for station_id in stations]))
+    condition = None
+    for item in conditions:
+        condition = item if condition is None else condition & item
+
+    if not os.path.isdir(path):
+        return pd.DataFrame(columns=columns or SCHEMA.names + PARTITIONING.schema.names)
+    dataset = ds.dataset(path, format='parquet', partitioning=PARTITIONING)
+    return dataset.to_table(columns=columns, filter=condition).to_pandas()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Eksport historii pomiarów do archiwum Parquet.')
+    parser.add_argument('--output', default=ARCHIVE_DIR, help='katalog archiwum')
+    parser.add_argument('--full', action='store_true', help='zapisanie wszystkich partycji od nowa')
+    args = parser.parse_args()
+
+    result = export_archive(get_connection(), args.output, args.full)
+    print(f'DOPISANO {result["appended"]}, ZAPISANO OD NOWA {result["rewritten"]}, USUNIĘTO {result["removed"]}, '
+          f'BEZ ZMIAN {result["unchanged"]} PARTYCJI ARCHIWUM {args.output}')
@@ -6,24 +6,29 @@ okna do analizy danych wybranego parametru.
 Moduł zawiera następujące elementy:
 - Tkinter - moduł do tworzenia interfejsu użytkownika,
 - matplotlib - moduł, który został wykorzystany w celu generowania wykresów,
-- measurement_analysis - moduł zawierający klasę MeasurementAnalysis, która generuje wykresy i przelicza wartości.
+- measurement_analysis - moduł zawierający klasę MeasurementAnalysis, która generuje wykresy i przelicza wartości,
+- trends - moduł z metodami wyznaczania linii trendu.
 """
 import tkinter as tk
 from measurement_analysis import MeasurementAnalysis
+from trends import TREND_METHODS
 
 class AnalysisWindow(tk.Tk):
     """
         Klasa wyświetla okienko GUI do analizy danych, które jest podpięte do każdej z czterech opcji nawigacji po
     aplikacji.
     """
-    def __init__(self):
+    def __init__(self, sensor_id=None):
         """
             Inicjalizuje instancję klasy AnalysisWindow.
+
+            Args:
+                sensor_id (int): Numer ID analizowanego stanowiska pomiarowego.
         """
         super().__init__()
-        self.analysis = MeasurementAnalysis('database.db')
+        self.analysis = MeasurementAnalysis('database.db', sensor_id)
         self.title('Analiza pomiarów')
-        self.geometry('300x200')
+        self.geometry('300x270')
 
         max_value_label = tk.Label(self, text='Największa wartość:')
         max_value_label.grid(column=0, row=0)
@@ -55,22 +60,47 @@ class AnalysisWindow(tk.Tk):
         self.data_mean_entry = tk.Entry(self, width=20)
         self.data_mean_entry.grid(column=1, row=4)
 
+        data_std_label = tk.Label(self, text='Odchylenie standardowe:')
+        data_std_label.grid(column=0, row=5)
+
+        self.data_std_entry = tk.Entry(self, width=20)
+        self.data_std_entry.grid(column=1, row=5)
+
+        count_label = tk.Label(self, text='Liczba pomiarów:')
+        count_label.grid(column=0, row=6)
+
+        self.count_entry = tk.Entry(self, width=20)
+        self.count_entry.grid(column=1, row=6)
+
+        trend_label = tk.Label(self, text='Linia trendu:')
+        trend_label.grid(column=0, row=7)
+
+        self.trend_var = tk.StringVar(self, value=TREND_METHODS['rolling'])
+        trend_menu = tk.OptionMenu(self, self.trend_var, *TREND_METHODS.values())
+        trend_menu.grid(column=1, row=7)
+
         analyze_button = tk.Button(self, text='Analizuj', command=self.command_analyze)
-        analyze_button.grid(column=0, row=6, columnspan=2)
+        analyze_button.grid(column=0, row=8, columnspan=2)
 
     def command_analyze(self):
         """
             Pobiera wyniki analizy danych  przeprowadzonych przez metodę analyze z klasy MeasurementsAnalysis (moduł
-        measurement_analysis) i aktualizuje wartości w Entry, wpisując te wyniki.
+        measurement_analysis), z linią trendu wybraną w menu, i aktualizuje wartości w Entry, wpisując te wyniki.
 
         Wartości aktualizowane w Entry:
         - max_value_entry: maksymalna wartość,
         - min_value_entry: minimalna wartość,
         - min_date_entry: data odpowiadająca minimalnej wartości,
         - max_date_entry: data odpowiadająca maksymalnej wartości,
-        - data_mean_entry: średnia wartość danych.
+        - data_mean_entry: średnia wartość danych,
+        - data_std_entry: odchylenie standardowe,
+        - count_entry: liczba pomiarów z wartością.
+
+        Wartości dla stanowiska odczytywane są ze statystyk utrzymywanych przy zapisie pomiarów, bez przeliczania
+        całej historii.
         """
-        analysis_results = self.analysis.analyze()
+        method = next(key for key, label in TREND_METHODS.items() if label == self.trend_var.get())
+        analysis_results = self.analysis.analyze(method)
 
         self.max_value_entry.delete(0, tk.END)
         self.max_value_entry.insert(0, str(analysis_results['max_value']))
@@ -87,6 +117,12 @@ class AnalysisWindow(tk.Tk):
         self.data_mean_entry.delete(0, tk.END)
         self.data_mean_entry.insert(0, str(analysis_results['data_mean']))
 
+        self.data_std_entry.delete(0, tk.END)
+        self.data_std_entry.insert(0, str(analysis_results['data_std']))
+
+        self.count_entry.delete(0, tk.END)
+        self.count_entry.insert(0, str(analysis_results['count']))
+
 if __name__ == '__main__':
     app = AnalysisWindow()
     app.mainloop()
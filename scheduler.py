@@ -0,0 +1,258 @@
+"---------------------------------------------------MODUŁ: scheduler---------------------------------------------------"
+"""
+    Moduł zawierający klasę PollingScheduler - proces działający w tle (bez interfejsu graficznego), który cyklicznie
+pobiera z serwisu GIOŚ listę stacji, stanowiska pomiarowe i dane pomiarowe, tak aby okna aplikacji korzystały z danych
+zapisanych już w bazie database.db i pamięci podręcznej http_cache zamiast czekać na sieć.
+    Dane pomiarowe pobierane są raz na godzinę (zgodnie z cyklem publikacji GIOŚ), z losowym przesunięciem (jitter),
+lista stacji i stanowisk - raz na dobę. Dla każdego stanowiska w tabeli 'sensor_watermarks' zapisywany jest czas
+ostatniego pobrania, dzięki czemu po ponownym uruchomieniu procesu nie są pobierane dane już aktualne. Stanowiska,
+których nie udało się pobrać, są ponawiane z wykładniczo rosnącym opóźnieniem; tak samo wydłużana jest przerwa po
+nieudanym całym cyklu. Opóźnienie ponowienia stanowiska może przekroczyć odstęp między cyklami (do doby), a proces
+budzi się przed zwykłym terminem, jeśli wcześniej przypada ponowienie któregoś stanowiska.
+
+Moduł zawiera następujące elementy:
+- requests - moduł do wykonywania zapytań sieciowych,
+- sqlite3 - moduł obsługi bazy danych (wyjątki),
+- database - moduł zarządzający połączeniami z bazą danych database.db,
+- argparse - moduł do obsługi argumentów wiersza poleceń,
+- random, threading, time - moduły do losowania przesunięć, obsługi zatrzymania procesu i odmierzania czasu,
+- concurrent.futures - moduł udostępniający pulę wątków,
+- bulk_crawler - moduł zawierający współdzieloną sesję HTTP z ograniczeniem liczby zapytań,
+- get_stations_data, get_sensors_data, get_measurements_data - moduły pobierające i zapisujące dane,
+- air_quality_index - moduł obliczający indeks jakości powietrza stacji (odświeżany po każdym cyklu).
+"""
+
+import requests
+import sqlite3
+import argparse
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from database import get_connection
+from bulk_crawler import RateLimiter, RateLimitedSession
+from air_quality_index import refresh_station_index
+from get_stations_data import get_stations_data
+from get_sensors_data import create_sensors_table, fetch_sensors, save_sensors
+from get_measurements_data import create_measurements_table, fetch_measurements, save_measurements, \
+    latest_measurement_date
+
+
+def create_scheduler_tables(conn):
+    """
+        Tworzy tabele 'sensor_watermarks' (stan pobierania każdego stanowiska) oraz 'scheduler_state' (czas
+    ostatniego odświeżenia listy stacji i stanowisk), o ile jeszcze nie istnieją.
+
+        Args:
+            conn (sqlite3.Connection): Połączenie z bazą danych.
+    """
+    conn.execute('''CREATE TABLE IF NOT EXISTS sensor_watermarks (
+                    sensor_id INTEGER NOT NULL PRIMARY KEY,
+                    last_fetched REAL,
+                    last_value_date DATETIME,
+                    failures INTEGER NOT NULL DEFAULT 0,
+                    next_attempt REAL NOT NULL DEFAULT 0)''')
+    conn.execute('''CREATE TABLE IF NOT EXISTS scheduler_state (
+                    name TEXT NOT NULL PRIMARY KEY,
+                    value REAL)''')
+
+
+class PollingScheduler:
+    """
+        Klasa cyklicznie odświeża dane GIOŚ w bazie danych. Może działać jako osobny proces (run_forever) lub wykonać
+    pojedynczy cykl (run_cycle).
+    """
+
+    def __init__(self, db_file='database.db', interval=3600, offset=20 * 60, jitter=5 * 60,
+                 metadata_interval=24 * 3600, max_workers=8, requests_per_second=10,
+                 retry_delay=60, max_retry_delay=24 * 3600):
+        """
+            Inicjalizuje instancję klasy PollingScheduler.
+
+            Args:
+                db_file (str): Ścieżka do pliku bazy danych.
+                interval (int): Odstęp między cyklami pobierania danych pomiarowych w sekundach.
+                offset (int): Przesunięcie cyklu względem pełnej godziny (GIOŚ publikuje dane z opóźnieniem).
+                jitter (int): Maksymalne losowe przesunięcie startu cyklu w sekundach.
+                metadata_interval (int): Odstęp między odświeżeniami listy stacji i stanowisk w sekundach.
+                max_workers (int): Maksymalna liczba równoczesnych zapytań.
+                requests_per_second (float): Maksymalna liczba zapytań na sekundę do jednego hosta.
+                retry_delay (int): Początkowe opóźnienie ponowienia po błędzie w sekundach.
+                max_retry_delay (int): Maksymalne opóźnienie ponowienia po błędzie w sekundach.
+        """
+        self.db_file = db_file
+        self.interval = interval
+        self.offset = offset
+        self.jitter = jitter
+        self.metadata_interval = metadata_interval
+        self.max_workers = max_workers
+        self.requests_per_second = requests_per_second
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self._stop = threading.Event()
+
+    def backoff(self, failures):
+        """
+            Zwraca opóźnienie ponowienia po kolejnym błędzie: retry_delay * 2^(failures-1), nie więcej niż
+        max_retry_delay, z losowym rozrzutem do 10%.
+        """
+        delay = min(self.retry_delay * 2 ** max(failures - 1, 0), self.max_retry_delay)
+        return delay * random.uniform(0.9, 1.0)
+
+    def next_run(self, now):
+        """
+            Zwraca czas startu następnego cyklu: najbliższa wielokrotność interval z przesunięciem offset, powiększona
+        o losowy jitter.
+        """
+        start = (now - self.offset) // self.interval * self.interval + self.interval + self.offset
+        return start + random.uniform(0, self.jitter)
+
+    def due_sensors(self, conn, now):
+        """
+            Zwraca ID stanowisk, które należy pobrać w bieżącym cyklu: nigdy niepobrane lub pobrane przed początkiem
+        bieżącego cyklu, o ile nie czekają na ponowienie po błędzie.
+        """
+        cycle_start = (now - self.offset) // self.interval * self.interval + self.offset
+        return [row[0] for row in conn.execute('''SELECT s.id FROM sensors s
+                                                  LEFT JOIN sensor_watermarks w ON w.sensor_id = s.id
+                                                  WHERE (w.last_fetched IS NULL OR w.last_fetched < ?)
+                                                    AND COALESCE(w.next_attempt, 0) <= ?''', (cycle_start, now))]
+
+    def next_retry(self, conn, now):
+        """
+            Zwraca najbliższy przyszły termin ponowienia stanowiska po błędzie albo None, jeśli żadne stanowisko nie
+        czeka na ponowienie.
+        """
+        return conn.execute('SELECT MIN(next_attempt) FROM sensor_watermarks WHERE failures > 0 AND next_attempt > ?',
+                            (now,)).fetchone()[0]
+
+    def refresh_metadata(self, conn, session, pool, now):
+        """
+            Odświeża listę stacji oraz stanowiska pomiarowe wszystkich stacji, jeśli od ostatniego odświeżenia minęło
+        więcej niż metadata_interval.
+
+            Returns:
+                int: Liczba stacji, których stanowisk nie udało się pobrać.
+        """
+        refreshed = conn.execute("SELECT value FROM scheduler_state WHERE name = 'metadata'").fetchone()
+        if refreshed is not None and now - refreshed[0] < self.metadata_interval:
+            return 0
+
+        get_stations_data(db_file=self.db_file)
+        station_ids = [row[0] for row in conn.execute('SELECT id FROM stations')]
+        futures = {pool.submit(fetch_sensors, station_id, session): station_id for station_id in station_ids}
+        errors = 0
+        for future in as_completed(futures):
+            try:
+                save_sensors(conn, futures[future], future.result())
+            except requests.exceptions.RequestException:
+                errors += 1
+        if not errors:
+            conn.execute("INSERT OR REPLACE INTO scheduler_state (name, value) VALUES ('metadata', ?)", (now,))
+        conn.commit()
+        return errors
+
+    def run_cycle(self):
+        """
+            Wykonuje pojedynczy cykl: odświeża listę stacji i stanowisk (jeśli trzeba) oraz pobiera dane pomiarowe
+        stanowisk, które tego wymagają. Zapisuje stan każdego stanowiska w tabeli 'sensor_watermarks'.
+
+            Returns:
+                dict: Podsumowanie cyklu - liczba pobranych stanowisk, nowych pomiarów i błędów.
+        """
+        now = time.time()
+        summary = {'sensors': 0, 'measurements': 0, 'errors': 0}
+        conn = get_connection(self.db_file)
+        create_sensors_table(conn)
+        create_measurements_table(conn)
+        create_scheduler_tables(conn)
+
+        session = RateLimitedSession(RateLimiter(self.requests_per_second), self.max_workers)
+        with session, ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            summary['errors'] += self.refresh_metadata(conn, session, pool, now)
+
+            futures = {pool.submit(fetch_measurements, sensor_id, session): sensor_id
+                       for sensor_id in self.due_sensors(conn, now)}
+            for future in as_completed(futures):
+                sensor_id = futures[future]
+                try:
+                    measurements = future.result()
+                except requests.exceptions.RequestException:
+                    summary['errors'] += 1
+                    failures = conn.execute('SELECT failures FROM sensor_watermarks WHERE sensor_id = ?',
+                                            (sensor_id,)).fetchone()
+                    failures = (failures[0] if failures else 0) + 1
+                    conn.execute('''INSERT INTO sensor_watermarks (sensor_id, failures, next_attempt)
+                                    VALUES (?, ?, ?)
+                                    ON CONFLICT (sensor_id) DO UPDATE SET failures = excluded.failures,
+                                                                          next_attempt = excluded.next_attempt''',
+                                 (sensor_id, failures, time.time() + self.backoff(failures)))
+                    continue
+                summary['sensors'] += 1
+                summary['measurements'] += save_measurements(conn, sensor_id, measurements)
+                conn.execute('''INSERT OR REPLACE INTO sensor_watermarks
+                                (sensor_id, last_fetched, last_value_date, failures, next_attempt)
+                                VALUES (?, ?, ?, 0, 0)''',
+                             (sensor_id, time.time(), latest_measurement_date(conn, sensor_id)))
+
+        refresh_station_index(conn)
+        conn.commit()
+
+        print(f"CYKL ZAKOŃCZONY: {summary['sensors']} STANOWISK, {summary['measurements']} NOWYCH POMIARÓW, "
+              f"{summary['errors']} BŁĘDÓW")
+        return summary
+
+    def run_forever(self):
+        """
+            Wykonuje kolejne cykle aż do wywołania stop() lub przerwania procesu (Ctrl+C). Jeśli cykl zakończył się
+        niepowodzeniem (wyjątek lub wyłącznie błędy pobierania), następny jest uruchamiany po wykładniczo rosnącej
+        przerwie, nie później niż w zwykłym terminie. Jeśli przed zwykłym terminem przypada ponowienie stanowiska
+        (next_attempt w tabeli 'sensor_watermarks'), cykl uruchamiany jest w terminie ponowienia.
+        """
+        failed_cycles = 0
+        try:
+            while not self._stop.is_set():
+                try:
+                    summary = self.run_cycle()
+                    failed = summary['errors'] > 0 and summary['sensors'] == 0
+                except (requests.exceptions.RequestException, sqlite3.Error) as error:
+                    print(f'BŁĄD CYKLU: {error}')
+                    failed = True
+
+                now = time.time()
+                failed_cycles = failed_cycles + 1 if failed else 0
+                wake_up = self.next_run(now)
+                if failed_cycles:
+                    wake_up = min(wake_up, now + self.backoff(failed_cycles))
+                try:
+                    retry = self.next_retry(get_connection(self.db_file), now)
+                except sqlite3.Error:
+                    retry = None
+                if retry is not None:
+                    wake_up = min(wake_up, retry)
+                self._stop.wait(max(wake_up - now, 0))
+        except KeyboardInterrupt:
+            pass
+
+    def stop(self):
+        """
+            Zatrzymuje pętlę run_forever po zakończeniu bieżącego cyklu.
+        """
+        self._stop.set()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Cykliczne pobieranie danych GIOŚ w tle.')
+    parser.add_argument('--interval', type=int, default=3600, help='odstęp między cyklami [s]')
+    parser.add_argument('--jitter', type=int, default=300, help='maksymalne losowe przesunięcie cyklu [s]')
+    parser.add_argument('--workers', type=int, default=8, help='maksymalna liczba równoczesnych zapytań')
+    parser.add_argument('--rate', type=float, default=10, help='maksymalna liczba zapytań na sekundę')
+    parser.add_argument('--once', action='store_true', help='wykonaj jeden cykl i zakończ')
+    args = parser.parse_args()
+
+    scheduler = PollingScheduler(interval=args.interval, jitter=args.jitter, max_workers=args.workers,
+                                 requests_per_second=args.rate)
+    if args.once:
+        scheduler.run_cycle()
+    else:
+        scheduler.run_forever()
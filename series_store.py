@@ -0,0 +1,204 @@
+"-------------------------------------------------MODUŁ: series_store-------------------------------------------------"
+"""
+    Moduł zawierający zwarty zapis serii pomiarów stanowisk na dysku, odczytywany przez odwzorowanie pliku w pamięci
+(numpy.memmap). Dla każdego stanowiska zapisywane są dwa pliki o stałej szerokości elementu: daty pomiarów jako liczby
+sekund od 1970-01-01 (int64, plik <sensor_id>.time) i wartości (float32, plik <sensor_id>.value, NaN dla pomiarów bez
+wartości), posortowane według daty. Plik <sensor_id>.json przechowuje liczbę zapisanych pomiarów i znacznik stanu
+pomiarów stanowiska w bazie danych (data_version).
+    Odczyt nie kopiuje danych: wybór zakresu dat to wyszukiwanie binarne w tablicy dat (numpy.searchsorted), a wynikiem
+są widoki na odwzorowane pliki, więc analiza wieloletniej historii nie wczytuje do pamięci niczego poza wybranym
+fragmentem. Zapis jest przyrostowy: po zapisie nowych pomiarów do bazy dopisywane są tylko pomiary nowsze od ostatniego
+zapisanego pomiaru z wartością (save_measurements nie zmienia pomiarów wcześniejszych); jeśli liczba wcześniejszych
+pomiarów w bazie się zmieniła, seria zapisywana jest od nowa.
+
+Moduł zawiera następujące elementy:
+- os, json, threading - moduły do operacji na plikach, zapisu metadanych i synchronizacji wątków,
+- numpy - moduł do obliczeń na tablicach,
+- pandas - moduł, który został wykorzystany do generowania dataframe,
+- database - moduł zarządzający połączeniami z bazą danych database.db.
+"""
+
+import os
+import json
+import threading
+import numpy as np
+import pandas as pd
+from database import get_connection
+
+TIME_DTYPE = np.dtype('<i8')
+VALUE_DTYPE = np.dtype('<f4')
+FETCH_SIZE = 50000
+
+_store_lock = threading.Lock()
+
+
+def data_version(conn, sensor_id=None):
+    """
+        Zwraca znacznik stanu pomiarów stanowiska: datę najnowszego pomiaru i datę najnowszego pomiaru z wartością.
+    Znacznik zmienia się przy każdym zapisie nowych pomiarów (także przy uzupełnieniu wartości pomiaru bez wartości),
+    a jego odczyt wymaga jedynie wyszukania końca klucza głównego (lub indeksu dat) tabeli 'measurements'.
+        Dla całej tabeli (sensor_id=None) daty najnowszych pomiarów nie wystarczą - zapis pomiarów jednego stanowiska
+    do daty osiągniętej już przez inne stanowisko ich nie zmienia - więc znacznik zawiera także liczbę pomiarów i liczbę
+    pomiarów z wartością (odczyt wymaga przejrzenia indeksu dat).
+    """
+    if sensor_id is None:
+        return conn.execute('''SELECT COUNT(*), COUNT(values_value), MAX(values_date),
+                                       (SELECT MAX(values_date) FROM measurements WHERE values_value IS NOT NULL)
+                                FROM measurements''').fetchone()
+    return conn.execute('''SELECT MAX(values_date),
+                                   (SELECT MAX(values_date) FROM measurements
+                                    WHERE sensor_id = ? AND values_value IS NOT NULL)
+                            FROM measurements WHERE sensor_id = ?''', (sensor_id, sensor_id)).fetchone()
+
+
+def store_dir(db_file):
+    """
+        Zwraca katalog serii stanowisk bazy danych db_file (np. database_series dla database.db).
+    """
+    return os.path.splitext(db_file)[0] + '_series'
+
+
+def _paths(path, sensor_id):
+    return tuple(os.path.join(path, f'{sensor_id}.{suffix}') for suffix in ('time', 'value', 'json'))
+
+
+def _load_meta(path, sensor_id):
+    meta_file = _paths(path, sensor_id)[2]
+    if not os.path.exists(meta_file):
+        return None
+    with open(meta_file, encoding='utf-8') as handle:
+        return json.load(handle)
+
+
+def _map(file, dtype, length):
+    if length == 0:
+        return np.empty(0, dtype=dtype)
+    return np.memmap(file, dtype=dtype, mode='r', shape=(length,))
+
+
+def _write(path, sensor_id, position, cursor):
+    """
+        Zapisuje pomiary z kursora (data, wartość) w plikach serii od pozycji position i zwraca długość serii.
+    """
+    time_file, value_file, _ = _paths(path, sensor_id)
+    with open(time_file, 'r+b' if os.path.exists(time_file) else 'wb') as times, \
+            open(value_file, 'r+b' if os.path.exists(value_file) else 'wb') as values:
+        times.seek(position * TIME_DTYPE.itemsize)
+        values.seek(position * VALUE_DTYPE.itemsize)
+        while True:
+            rows = cursor.fetchmany(FETCH_SIZE)
+            if not rows:
+                break
+            dates, numbers = zip(*rows)
+            times.write(np.array(dates, dtype='datetime64[s]').astype(TIME_DTYPE).tobytes())
+            values.write(np.array(numbers, dtype=np.float64).astype(VALUE_DTYPE).tobytes())
+            position += len(rows)
+    return position
+
+
+def sync_series(conn, sensor_id, path):
+    """
+        Uaktualnia zapis serii stanowiska do stanu bazy danych, dopisując tylko nowe pomiary, o ile to możliwe.
+
+        Args:
+            conn (sqlite3.Connection): Połączenie z bazą danych.
+            sensor_id (int): Numer ID stanowiska pomiarowego.
+            path (str): Katalog serii stanowisk.
+
+        Returns:
+            dict: Metadane serii - liczba pomiarów 'length' i znacznik stanu 'version'.
+    """
+    version = list(data_version(conn, sensor_id))
+    with _store_lock:
+        meta = _load_meta(path, sensor_id)
+        if meta is not None and meta['version'] == version:
+            return meta
+        os.makedirs(path, exist_ok=True)
+        position, after = 0, ''
+        if meta is not None and meta['version'][1] is not None:
+            # pomiary do ostatniego zapisanego pomiaru z wartością nie zmieniają się - dopisywane jest wszystko po nim
+            last = meta['version'][1]
+            times = _map(_paths(path, sensor_id)[0], TIME_DTYPE, meta['length'])
+            kept = int(np.searchsorted(times, np.datetime64(last, 's').astype(TIME_DTYPE), side='right'))
+            stored = conn.execute('SELECT COUNT(*) FROM measurements WHERE sensor_id = ? AND values_date <= ?',
+                                  (sensor_id, last)).fetchone()[0]
+            del times
+            if stored == kept:
+                position, after = kept, last
+        cursor = conn.execute('''SELECT values_date, values_value FROM measurements
+                                 WHERE sensor_id = ? AND values_date > ? ORDER BY values_date''', (sensor_id, after))
+        meta = {'length': _write(path, sensor_id, position, cursor), 'version': version}
+        meta_file = _paths(path, sensor_id)[2]
+        with open(meta_file + '.tmp', 'w', encoding='utf-8') as handle:
+            json.dump(meta, handle)
+        os.replace(meta_file + '.tmp', meta_file)
+        return meta
+
+
+class SensorSeries():
+    """
+        Klasa udostępnia serię pomiarów stanowiska odwzorowaną w pamięci: tablice times (sekundy od 1970-01-01, int64)
+    i values (float32, NaN dla pomiarów bez wartości).
+    """
+    def __init__(self, path, sensor_id, length):
+        """
+            Odwzorowuje w pamięci length pierwszych pomiarów serii stanowiska sensor_id zapisanej w katalogu path.
+        """
+        time_file, value_file, _ = _paths(path, sensor_id)
+        self.sensor_id = sensor_id
+        self.times = _map(time_file, TIME_DTYPE, length)
+        self.values = _map(value_file, VALUE_DTYPE, length)
+
+    def __len__(self):
+        return len(self.times)
+
+    def bounds(self, start=None, end=None):
+        """
+            Zwraca pozycje (początek, koniec) pomiarów z zakresu dat od start do end (włącznie), wyznaczone
+        wyszukiwaniem binarnym.
+        """
+        first = 0 if start is None else int(np.searchsorted(self.times, _seconds(start), side='left'))
+        last = len(self) if end is None else int(np.searchsorted(self.times, _seconds(end), side='right'))
+        return first, max(first, last)
+
+    def slice(self, start=None, end=None):
+        """
+            Zwraca widoki (bez kopiowania) dat i wartości pomiarów z zakresu dat od start do end (włącznie): daty jako
+        datetime64[s], wartości jako float32.
+
+            Example:
+                dates, values = open_series('database.db', 3584).slice('2023-01-01', '2023-12-31 23:00:00')
+        """
+        first, last = self.bounds(start, end)
+        return self.times[first:last].view('datetime64[s]'), self.values[first:last]
+
+    def valid(self, start=None, end=None):
+        """
+            Zwraca maskę pomiarów z wartością z zakresu dat od start do end (włącznie).
+        """
+        return ~np.isnan(self.slice(start, end)[1])
+
+    def series(self, start=None, end=None):
+        """
+            Zwraca pomiary z zakresu dat od start do end (włącznie) jako pandas.Series z indeksem dat.
+        """
+        dates, values = self.slice(start, end)
+        return pd.Series(values, index=pd.DatetimeIndex(dates, name='values_date'), name='values_value')
+
+
+def _seconds(date):
+    return np.datetime64(pd.Timestamp(date).to_datetime64(), 's').astype(TIME_DTYPE)
+
+
+def open_series(db_file, sensor_id):
+    """
+        Zwraca serię pomiarów stanowiska (SensorSeries) odwzorowaną w pamięci, uaktualniając wcześniej jej zapis
+    do stanu bazy danych.
+
+        Args:
+            db_file (str): Ścieżka do pliku bazy danych.
+            sensor_id (int): Numer ID stanowiska pomiarowego.
+    """
+    path = store_dir(db_file)
+    meta = sync_series(get_connection(db_file), sensor_id, path)
+    return SensorSeries(path, sensor_id, meta['length'])
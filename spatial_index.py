@@ -0,0 +1,176 @@
+"-------------------------------------------------MODUŁ: spatial_index-------------------------------------------------"
+"""
+    Moduł zawierający klasę StationIndex - indeks przestrzenny stacji pomiarowych, który odpowiada na pytania
+"k najbliższych stacji" oraz "stacje w promieniu r km" bez przeglądania wszystkich stacji i bez zmian w bazie danych.
+    Położenia stacji zamieniane są na wektory jednostkowe na sferze i umieszczane w drzewie k-wymiarowym (KD-tree).
+Odległość euklidesowa (cięciwa) między wektorami rośnie razem z odległością po łuku koła wielkiego, więc drzewo można
+przeszukiwać w przestrzeni 3D, a wynik przeliczyć na kilometry bez przybliżeń.
+
+Moduł zawiera następujące elementy:
+- math - moduł funkcji matematycznych,
+- heapq - moduł kolejki priorytetowej (wyszukiwanie k najbliższych stacji),
+- threading - moduł do synchronizacji przebudowy wspólnego indeksu,
+- station_registry - moduł udostępniający zapisaną listę stacji pomiarowych.
+"""
+
+import math
+import heapq
+import threading
+from station_registry import get_stations
+
+EARTH_RADIUS = 6371.009  # promień Ziemi w km, ten sam co w geopy.distance.great_circle
+LEAF_SIZE = 8
+LAT_COLUMN = 2
+LON_COLUMN = 3
+
+
+def to_unit_vector(latitude, longitude):
+    """
+        Zamienia współrzędne geograficzne (w stopniach) na wektor jednostkowy (x, y, z).
+    """
+    lat = math.radians(float(latitude))
+    lon = math.radians(float(longitude))
+    return (math.cos(lat) * math.cos(lon), math.cos(lat) * math.sin(lon), math.sin(lat))
+
+
+def chord_to_km(chord):
+    """
+        Zamienia długość cięciwy między wektorami jednostkowymi na odległość po łuku koła wielkiego w km.
+    """
+    return 2 * EARTH_RADIUS * math.asin(min(chord / 2, 1.0))
+
+
+def km_to_chord(distance):
+    """
+        Zamienia odległość po łuku koła wielkiego w km na długość cięciwy między wektorami jednostkowymi.
+    """
+    return 2 * math.sin(min(distance / EARTH_RADIUS, math.pi) / 2)
+
+
+class StationIndex:
+    """
+        Klasa buduje drzewo KD nad położeniami stacji i wyszukuje w nim najbliższe stacje. Wyniki zawierają odległość
+    w km oraz oryginalny wiersz stacji, posortowane rosnąco według odległości.
+    """
+
+    def __init__(self, stations, lat_column=LAT_COLUMN, lon_column=LON_COLUMN):
+        """
+            Inicjalizuje instancję klasy StationIndex.
+
+            Args:
+                stations (list): Wiersze stacji (np. z tabeli 'stations'). Wiersze bez współrzędnych są pomijane.
+                lat_column (int): Indeks kolumny z szerokością geograficzną.
+                lon_column (int): Indeks kolumny z długością geograficzną.
+        """
+        self.stations = [row for row in stations if row[lat_column] not in (None, '') and
+                         row[lon_column] not in (None, '')]
+        self.points = [to_unit_vector(row[lat_column], row[lon_column]) for row in self.stations]
+        self.root = self._build(list(range(len(self.points))))
+
+    def _build(self, indices):
+        """
+            Buduje węzeł drzewa: liść z listą punktów albo podział według osi o największym rozrzucie.
+        """
+        if len(indices) <= LEAF_SIZE:
+            return ('leaf', indices)
+        axis = max(range(3), key=lambda a: max(self.points[i][a] for i in indices) -
+                   min(self.points[i][a] for i in indices))
+        indices.sort(key=lambda i: self.points[i][axis])
+        middle = len(indices) // 2
+        split = self.points[indices[middle]][axis]
+        return ('node', axis, split, self._build(indices[:middle]), self._build(indices[middle:]))
+
+    def _search(self, node, point, limit, visit):
+        """
+            Przeszukuje drzewo w głąb, odwiedzając najpierw bliższą gałąź. limit() zwraca bieżący promień
+        przeszukiwania (kwadrat cięciwy), visit(i, d2) otrzymuje kandydatów.
+        """
+        if node[0] == 'leaf':
+            for i in node[1]:
+                p = self.points[i]
+                visit(i, (p[0] - point[0]) ** 2 + (p[1] - point[1]) ** 2 + (p[2] - point[2]) ** 2)
+            return
+        _, axis, split, left, right = node
+        diff = point[axis] - split
+        near, far = (left, right) if diff < 0 else (right, left)
+        self._search(near, point, limit, visit)
+        if diff * diff <= limit():
+            self._search(far, point, limit, visit)
+
+    def nearest(self, latitude, longitude, k=1):
+        """
+            Zwraca k stacji najbliższych podanemu punktowi.
+
+            Args:
+                latitude (float): Szerokość geograficzna punktu.
+                longitude (float): Długość geograficzna punktu.
+                k (int): Liczba stacji.
+
+            Returns:
+                list: Pary (odległość w km, wiersz stacji), od najbliższej.
+        """
+        if k <= 0 or not self.points:
+            return []
+        point = to_unit_vector(latitude, longitude)
+        heap = []  # max-kopiec k najlepszych kandydatów: (-d2, i)
+
+        def limit():
+            return -heap[0][0] if len(heap) == k else math.inf
+
+        def visit(i, d2):
+            if len(heap) < k:
+                heapq.heappush(heap, (-d2, i))
+            elif d2 < -heap[0][0]:
+                heapq.heapreplace(heap, (-d2, i))
+
+        self._search(self.root, point, limit, visit)
+        return [(chord_to_km(math.sqrt(-d2)), self.stations[i]) for d2, i in sorted(heap, reverse=True)]
+
+    def within_radius(self, latitude, longitude, radius):
+        """
+            Zwraca stacje położone nie dalej niż radius km od podanego punktu.
+
+            Args:
+                latitude (float): Szerokość geograficzna punktu.
+                longitude (float): Długość geograficzna punktu.
+                radius (float): Promień wyszukiwania w km.
+
+            Returns:
+                list: Pary (odległość w km, wiersz stacji), od najbliższej.
+        """
+        if radius < 0 or not self.points:
+            return []
+        point = to_unit_vector(latitude, longitude)
+        limit2 = km_to_chord(radius) ** 2
+        found = []
+
+        def visit(i, d2):
+            if d2 <= limit2:
+                found.append((d2, i))
+
+        self._search(self.root, point, lambda: limit2, visit)
+        found.sort()
+        return [(chord_to_km(math.sqrt(d2)), self.stations[i]) for d2, i in found]
+
+
+_index = None
+_index_rows = None
+_index_lock = threading.Lock()
+
+
+def station_index():
+    """
+        Zwraca indeks przestrzenny stacji ze wspólnego rejestru stacji. Indeks budowany jest ponownie tylko wtedy, gdy
+    rejestr wczytał nową listę stacji.
+
+        Example:
+            for distance, row in station_index().within_radius(50.06, 19.94, 10):
+                print(round(distance, 2), row[1])
+    """
+    global _index, _index_rows
+    stations = get_stations()
+    with _index_lock:
+        if stations is not _index_rows:
+            _index = StationIndex(stations)
+            _index_rows = stations
+        return _index
@@ -0,0 +1,146 @@
+"-----------------------------------------------MODUŁ: station_registry-----------------------------------------------"
+"""
+    Moduł zawierający klasę StationRegistry - rejestr stacji pomiarowych przechowywany w pamięci procesu oraz na dysku
+(tabela 'stations' w bazie danych database.db). Lista stacji zmienia się rzadko, dlatego okna aplikacji korzystają
+z zapisanej listy, a jej odświeżenie z serwisu GIOŚ (get_stations_data) następuje dopiero po upływie czasu ważności
+(TTL) i odbywa się w osobnym wątku, nie blokując otwierania okien. Tylko przy pierwszym uruchomieniu, gdy tabela
+'stations' jest pusta, lista pobierana jest od razu.
+
+Moduł zawiera następujące elementy:
+- threading, time - moduły do odświeżania listy w tle i odmierzania czasu,
+- database - moduł zarządzający połączeniami z bazą danych database.db,
+- get_stations_data - funkcja pobiera listę wszystkich stacji pomiarowych i zapisuje ją w bazie danych SQL.
+"""
+
+import threading
+import time
+from database import DB_FILE, get_connection, close_connection
+from get_stations_data import get_stations_data, create_stations_table
+
+STATIONS_TTL = 7 * 24 * 3600
+
+
+def create_registry_table(conn):
+    """
+        Tworzy tabelę 'registry_state' przechowującą czas ostatniego odświeżenia listy stacji, o ile jeszcze nie
+    istnieje.
+
+        Args:
+            conn (sqlite3.Connection): Połączenie z bazą danych.
+    """
+    conn.execute('''CREATE TABLE IF NOT EXISTS registry_state (
+                    name TEXT NOT NULL PRIMARY KEY,
+                    loaded_at REAL NOT NULL)''')
+
+
+class StationRegistry:
+    """
+        Klasa udostępnia listę stacji pomiarowych (wiersze tabeli 'stations') bez czekania na sieć i dba o jej
+    odświeżanie w tle.
+    """
+
+    def __init__(self, db_file=DB_FILE, ttl=STATIONS_TTL):
+        """
+            Inicjalizuje instancję klasy StationRegistry.
+
+            Args:
+                db_file (str): Ścieżka do pliku bazy danych.
+                ttl (int): Czas ważności listy stacji w sekundach.
+        """
+        self.db_file = db_file
+        self.ttl = ttl
+        self._rows = None
+        self._loaded_at = None
+        self._lock = threading.Lock()
+        self._refreshing = None
+
+    def _stored_loaded_at(self, conn):
+        row = conn.execute("SELECT loaded_at FROM registry_state WHERE name = 'stations'").fetchone()
+        return row[0] if row else None
+
+    def _load_from_disk(self, conn):
+        self._rows = conn.execute('SELECT * FROM stations ORDER BY id').fetchall()
+        self._loaded_at = self._stored_loaded_at(conn)
+
+    def get_stations(self):
+        """
+            Zwraca listę stacji pomiarowych. Listę z pamięci procesu zwraca od razu; jeśli na dysku zapisano nowszą
+        (np. przez scheduler), wczytuje ją z bazy danych. Jeśli lista jest przeterminowana, uruchamia odświeżanie
+        w tle i zwraca dotychczasową listę.
+
+            Returns:
+                list: Wiersze tabeli 'stations' (krotki), posortowane według ID stacji.
+        """
+        conn = get_connection(self.db_file)
+        create_stations_table(conn)
+        create_registry_table(conn)
+
+        with self._lock:
+            stored_loaded_at = self._stored_loaded_at(conn)
+            if self._rows is None or stored_loaded_at != self._loaded_at:
+                self._load_from_disk(conn)
+
+            if not self._rows:
+                self._refresh()
+                self._load_from_disk(conn)
+            elif self._loaded_at is None or time.time() - self._loaded_at > self.ttl:
+                self.refresh_in_background()
+
+            return self._rows
+
+    def _refresh(self):
+        """
+            Pobiera listę stacji z serwisu GIOŚ i zapisuje czas odświeżenia w tabeli 'registry_state'.
+        """
+        get_stations_data(db_file=self.db_file)
+        conn = get_connection(self.db_file)
+        create_registry_table(conn)
+        with conn:
+            conn.execute("INSERT OR REPLACE INTO registry_state (name, loaded_at) VALUES ('stations', ?)",
+                         (time.time(),))
+
+    def _refresh_in_thread(self):
+        try:
+            self._refresh()
+        finally:
+            close_connection(self.db_file)
+
+    def refresh_in_background(self):
+        """
+            Uruchamia odświeżanie listy stacji w osobnym wątku, o ile nie trwa już inne odświeżanie.
+
+            Returns:
+                threading.Thread: Wątek odświeżający listę.
+        """
+        if self._refreshing is not None and self._refreshing.is_alive():
+            return self._refreshing
+        self._refreshing = threading.Thread(target=self._refresh_in_thread, name='station-registry-refresh',
+                                            daemon=True)
+        self._refreshing.start()
+        return self._refreshing
+
+
+_default_registry = None
+_default_lock = threading.Lock()
+
+
+def default_registry():
+    """
+        Zwraca wspólną dla całej aplikacji instancję StationRegistry (tworzoną przy pierwszym użyciu).
+    """
+    global _default_registry
+    with _default_lock:
+        if _default_registry is None:
+            _default_registry = StationRegistry()
+        return _default_registry
+
+
+def get_stations():
+    """
+        Zwraca listę stacji pomiarowych ze wspólnego rejestru stacji.
+
+        Example:
+            for row in get_stations():
+                listbox.insert(tk.END, row)
+    """
+    return default_registry().get_stations()
@@ -0,0 +1,148 @@
+"------------------------------------------------MODUŁ: station_search------------------------------------------------"
+"""
+    Moduł zawierający wyszukiwarkę stacji pomiarowych po nazwie miejscowości, gminy, powiatu, stacji lub ulicy.
+Wyszukiwanie nie zależy od wielkości liter i polskich znaków ("lodz" znajduje "Łódź"), obsługuje początki słów
+("krak" znajduje "Kraków") i literówki ("krakw", "warzsawa").
+    Znormalizowane nazwy (fold_text) zapisywane są w indeksie pełnotekstowym FTS5 z tokenizerem trygramowym (tabela
+'station_search', wymaga SQLite 3.34 lub nowszego), budowanym razem z zapisem listy stacji. Indeks zwraca kandydatów
+mających wspólne trygramy z zapytaniem, a kandydaci oceniani są według dopasowania słów: całe słowo, początek słowa,
+fragment słowa lub słowo podobne (literówka). Nazwa miejscowości waży więcej niż nazwa stacji, gminy, powiatu i ulicy.
+
+Moduł zawiera następujące elementy:
+- difflib - moduł do oceny podobieństwa słów (dopasowanie mimo literówek),
+- database - moduł zarządzający połączeniami z bazą danych database.db,
+- text_utils - moduł zawierający funkcję fold_text normalizującą nazwy.
+"""
+
+from difflib import SequenceMatcher
+from database import DB_FILE, get_connection
+from text_utils import fold_text
+
+# przeszukiwane kolumny tabeli 'stations' i ich waga w ocenie wyniku
+SEARCH_FIELDS = (('city', 'city_name', 1.0), ('station', 'station_name', 0.9), ('commune', 'commune_name', 0.8),
+                 ('district', 'district_name', 0.7), ('street', 'address_street', 0.6))
+CANDIDATES = 200
+FUZZY_THRESHOLD = 0.75  # minimalne podobieństwo słowa uznawanego za literówkę
+
+
+def create_search_table(conn):
+    """
+        Tworzy tabelę pełnotekstową 'station_search', o ile jeszcze nie istnieje. Numer wiersza (rowid) jest numerem
+    ID stacji.
+
+        Args:
+            conn (sqlite3.Connection): Połączenie z bazą danych.
+    """
+    columns = ', '.join(name for name, _, _ in SEARCH_FIELDS)
+    conn.execute(f"CREATE VIRTUAL TABLE IF NOT EXISTS station_search USING fts5({columns}, tokenize='trigram')")
+
+
+def build_search_index(conn):
+    """
+        Przebudowuje indeks wyszukiwania na podstawie tabeli 'stations'. Funkcja nie zatwierdza transakcji -
+    wywoływana jest przez get_stations_data w transakcji zapisu stacji.
+
+        Args:
+            conn (sqlite3.Connection): Połączenie z bazą danych.
+
+        Returns:
+            int: Liczba stacji w indeksie.
+    """
+    create_search_table(conn)
+    conn.execute('DELETE FROM station_search')
+    columns = ', '.join(column for _, column, _ in SEARCH_FIELDS)
+    rows = [(row[0],) + tuple(fold_text(value or '') for value in row[1:])
+            for row in conn.execute(f'SELECT id, {columns} FROM stations')]
+    names = ', '.join(name for name, _, _ in SEARCH_FIELDS)
+    conn.executemany(f'INSERT INTO station_search (rowid, {names}) VALUES (?{", ?" * len(SEARCH_FIELDS)})', rows)
+    return len(rows)
+
+
+def _match_expression(key):
+    """
+        Zwraca zapytanie FTS5 dopasowujące wiersze zawierające dowolny trygram zapytania (ocena - bm25).
+    """
+    trigrams = {key[i:i + 3] for i in range(len(key) - 2)}
+    return ' OR '.join('"{}"'.format(trigram.replace('"', '""')) for trigram in sorted(trigrams))
+
+
+def word_score(query_word, words):
+    """
+        Ocenia dopasowanie słowa zapytania do słów nazwy: 1.0 - całe słowo, 0.9 - początek słowa, 0.7 - fragment
+    słowa, do 0.8 - słowo podobne (literówka, także w początku słowa; tylko dla słów zapytania z co najmniej trzema
+    literami), 0 - brak dopasowania.
+    """
+    best = 0.0
+    for word in words:
+        if word == query_word:
+            return 1.0
+        if word.startswith(query_word):
+            best = max(best, 0.9)
+        elif query_word in word:
+            best = max(best, 0.7)
+        elif best < 0.8 and len(query_word) >= 3:
+            similarity = max(SequenceMatcher(None, query_word, word).ratio(),
+                             SequenceMatcher(None, query_word, word[:len(query_word)]).ratio() * 0.95)
+            if similarity >= FUZZY_THRESHOLD:
+                best = max(best, similarity * 0.8)
+    return best
+
+
+def score_row(query_words, fields):
+    """
+        Ocenia wiersz indeksu: średnia po słowach zapytania z najlepszego dopasowania ważonego wagą kolumny. Wiersz,
+    do którego nie pasuje któreś słowo zapytania, dostaje ocenę 0.
+    """
+    fields = [(value.split(), weight) for value, (_, _, weight) in zip(fields, SEARCH_FIELDS)]
+    total = 0.0
+    for query_word in query_words:
+        best = max(word_score(query_word, words) * weight for words, weight in fields)
+        if best == 0:
+            return 0.0
+        total += best
+    return total / len(query_words)
+
+
+def search_stations(query, limit=20, db_file=DB_FILE):
+    """
+        Wyszukuje stacje pomiarowe pasujące do zapytania, od najlepiej dopasowanych.
+
+        Args:
+            query (str): Nazwa (lub jej początek) miejscowości, gminy, powiatu, stacji lub ulicy.
+            limit (int): Maksymalna liczba wyników.
+            db_file (str): Ścieżka do pliku bazy danych.
+
+        Returns:
+            list: Wiersze tabeli 'stations' (krotki).
+
+        Example:
+            for row in search_stations('lodz'):
+                print(row[0], row[1])
+    """
+    key = fold_text(query)
+    if not key:
+        return []
+    conn = get_connection(db_file)
+    create_search_table(conn)
+    if conn.execute('SELECT 1 FROM station_search LIMIT 1').fetchone() is None:
+        # stacje zapisano przed wprowadzeniem wyszukiwarki - indeks budowany jest przy pierwszym wyszukiwaniu
+        with conn:
+            build_search_index(conn)
+
+    names = ', '.join(name for name, _, _ in SEARCH_FIELDS)
+    if len(key) >= 3:
+        candidates = conn.execute(f'''SELECT rowid, {names} FROM station_search WHERE station_search MATCH ?
+                                      ORDER BY rank LIMIT ?''', (_match_expression(key), CANDIDATES)).fetchall()
+    else:
+        # zapytanie krótsze niż trygram - wystarczy porównanie początków słów we wszystkich wierszach indeksu
+        candidates = conn.execute(f'SELECT rowid, {names} FROM station_search').fetchall()
+
+    query_words = key.split()
+    scored = sorted((-score, row[0]) for row in candidates for score in (score_row(query_words, row[1:]),)
+                    if score > 0)[:limit]
+    if not scored:
+        return []
+    ids = [id for _, id in scored]
+    rows = {row[0]: row for row in conn.execute(
+        f'SELECT * FROM stations WHERE id IN ({", ".join("?" * len(ids))})', ids)}
+    return [rows[id] for id in ids if id in rows]
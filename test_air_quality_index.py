@@ -0,0 +1,77 @@
+"-----------------------------------------------test_air_quality_index-----------------------------------------------"
+"""
+    Moduł zawierający klasę TestAirQualityIndex, która testuje wyznaczanie indeksu jakości powietrza stacji.
+
+Moduł zawiera następujące elementy:
+- unittest - moduł do przeprowadzania testów,
+- sqlite3 - moduł do tworzenia bazy danych w pamięci,
+- numpy - moduł do obliczeń na tablicach,
+- get_sensors_data, get_measurements_data - moduły tworzące tabele stanowisk i zapisujące pomiary,
+- air_quality_index - moduł zawierający obliczanie indeksu jakości powietrza.
+"""
+import unittest
+import sqlite3
+import numpy as np
+from get_sensors_data import create_sensors_table
+from get_measurements_data import create_measurements_table, save_measurements
+from air_quality_index import (PARAMETERS, sub_indices, refresh_station_index, station_index,
+                               station_index_levels)
+
+
+class TestAirQualityIndex(unittest.TestCase):
+    """
+        Klasa testuje progi indeksów cząstkowych, wybór najgorszego indeksu stacji, pomijanie nieaktualnych wartości
+    oraz przyrostowe odświeżanie indeksów.
+    """
+
+    def setUp(self):
+        self.conn = sqlite3.connect(':memory:')
+        create_sensors_table(self.conn)
+        create_measurements_table(self.conn)
+        self.conn.executemany('INSERT INTO sensors (id, station_id, param_code) VALUES (?, ?, ?)',
+                              [(1, 10, 'PM10'), (2, 10, 'NO2'), (3, 10, 'O3'), (4, 20, 'PM10'), (5, 20, 'C6H6')])
+
+    def tearDown(self):
+        self.conn.close()
+
+    def save(self, sensor_id, *measurements):
+        save_measurements(self.conn, sensor_id, [{'date': date, 'value': value} for date, value in measurements])
+
+    def test_sub_indices(self):
+        pm10 = PARAMETERS.index('PM10')
+        values = [0, 20, 20.1, 50, 80.5, 110, 150, 151, 1000]
+        self.assertEqual(list(sub_indices(np.full(len(values), pm10), values)), [0, 0, 1, 1, 3, 3, 4, 5, 5])
+        co = PARAMETERS.index('CO')
+        self.assertEqual(list(sub_indices(np.array([co, pm10]), [3000, 3000])), [0, 5])
+        no2 = PARAMETERS.index('NO2')
+        values = [40, 90, 90.5, 120, 121, 230, 340, 341]
+        self.assertEqual(list(sub_indices(np.full(len(values), no2), values)), [0, 1, 2, 2, 3, 3, 4, 5])
+
+    def test_station_index(self):
+        self.save(1, ('2024-03-01 10:00:00', 35.0))
+        self.save(2, ('2024-03-01 10:00:00', 160.0))
+        self.save(3, ('2024-03-01 06:00:00', 250.0))  # wartość starsza niż MAX_AGE godzin - pomijana
+        self.save(4, ('2024-03-01 09:00:00', 10.0))
+        self.save(5, ('2024-03-01 09:00:00', 99.0))
+        self.assertEqual(refresh_station_index(self.conn), 2)
+        index = station_index(self.conn, 10)
+        self.assertEqual((index['index_level'], index['dominant'], index['values_date']),
+                         (3, 'NO2', '2024-03-01 10:00:00'))
+        self.assertEqual((index['PM10'], index['NO2'], index['O3'], index['CO']), (1, 3, None, None))
+        self.assertEqual(station_index_levels(self.conn), {10: 3, 20: 0})
+        self.assertIsNone(station_index(self.conn, 30))
+
+    def test_incremental_refresh(self):
+        self.save(1, ('2024-03-01 10:00:00', 35.0))
+        self.save(4, ('2024-03-01 10:00:00', 10.0))
+        self.assertEqual(refresh_station_index(self.conn), 2)
+        self.assertEqual(refresh_station_index(self.conn), 0)
+        self.save(4, ('2024-03-01 11:00:00', 120.0))
+        self.save(5, ('2024-03-01 11:00:00', 999.0))
+        self.assertEqual(refresh_station_index(self.conn), 1)
+        self.assertEqual(station_index_levels(self.conn), {10: 1, 20: 4})
+        self.assertEqual(refresh_station_index(self.conn), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+"-----------------------------------------------test_anomaly_detection-----------------------------------------------"
+"""
+    Moduł zawierający klasę TestAnomalyDetection, która testuje wykrywanie nietypowych pomiarów w trakcie zapisu
+pomiarów.
+
+Moduł zawiera następujące elementy:
+- unittest - moduł do przeprowadzania testów,
+- sqlite3 - moduł do tworzenia bazy danych w pamięci,
+- datetime - moduł do generowania dat pomiarów,
+- numpy - moduł do obliczeń na tablicach,
+- get_measurements_data - moduł zapisujący pomiary do bazy danych,
+- anomaly_detection - moduł zawierający funkcje anomalies i load_state.
+"""
+import unittest
+import sqlite3
+from datetime import datetime, timedelta
+import numpy as np
+from get_measurements_data import create_measurements_table, save_measurements
+from anomaly_detection import anomalies, load_state, WINDOW_SIZE
+
+
+class TestAnomalyDetection(unittest.TestCase):
+    """
+        Klasa testuje rodzaje wykrywanych pomiarów nietypowych oraz to, że zapis pomiarów partiami (ze stanem detektora
+    zapisanym w bazie między partiami) daje te same wyniki co zapis całej serii naraz.
+    """
+
+    def setUp(self):
+        generator = np.random.default_rng(1)
+        values = generator.normal(30, 3, 24 * 20).round(1)
+        values[200] = 95.0
+        values[250] = -4.0
+        values[300:300 + WINDOW_SIZE + 3] = 30.0
+        # epizod: stopniowy wzrost do poziomu znacznie wyższego niż zwykle, utrzymanie przez dobę i stopniowy spadek
+        values[400:430] += np.linspace(0, 50, 30)
+        values[430:454] += 50
+        values[454:478] += np.linspace(50, 0, 24)
+        start = datetime(2024, 2, 1)
+        self.series = [((start + timedelta(hours=i)).strftime('%Y-%m-%d %H:%M:%S'), float(value))
+                       for i, value in enumerate(values)]
+
+    def database(self):
+        conn = sqlite3.connect(':memory:')
+        create_measurements_table(conn)
+        return conn
+
+    def test_kinds(self):
+        conn = self.database()
+        save_measurements(conn, 1, [{'date': date, 'value': value} for date, value in self.series])
+        found = {(date, kind) for _, date, _, kind, _, _ in anomalies(conn, 1)}
+        dates = [date for date, _ in self.series]
+        self.assertIn((dates[200], 'spike'), found)
+        self.assertIn((dates[250], 'negative'), found)
+        self.assertIn((dates[300 + WINDOW_SIZE], 'flat'), found)
+        self.assertNotIn((dates[300 + WINDOW_SIZE - 1], 'flat'), found)
+        self.assertGreater(len({date for date, kind in found if kind == 'episode' and dates[400] <= date < dates[478]}),
+                           10)
+        self.assertFalse({kind for date, kind in found if dates[400] <= date < dates[478]} - {'episode'})
+        self.assertLessEqual(len({date for date, _ in found if not dates[200] <= date < dates[478]}), 2)
+        self.assertEqual([row[3] for row in anomalies(conn, kinds=('negative',))], ['negative'])
+        self.assertEqual(len(anomalies(conn, start=dates[201], end=dates[260])), 1)
+        conn.close()
+
+    def test_batches_match_single_pass(self):
+        """
+            Sprawdza, czy zapis partiami (z najnowszym pomiarem partii uzupełnianym w kolejnej partii) wykrywa te same
+        pomiary nietypowe co zapis całej serii, a ponowny zapis tych samych danych niczego nie zmienia.
+        """
+        single = self.database()
+        save_measurements(single, 1, [{'date': date, 'value': value} for date, value in self.series])
+        batched = self.database()
+        for end in range(30, len(self.series) + 30, 30):
+            part = [{'date': date, 'value': value} for date, value in self.series[max(0, end - 31):end]]
+            if end < len(self.series):
+                part[-1] = {'date': part[-1]['date'], 'value': None}
+            save_measurements(batched, 1, reversed(part))
+        save_measurements(batched, 1, [{'date': date, 'value': value} for date, value in self.series])
+        self.assertEqual(anomalies(batched, 1), anomalies(single, 1))
+        state = load_state(batched, 1)
+        self.assertEqual((state.count, state.last_date), (len(self.series), self.series[-1][0]))
+        self.assertAlmostEqual(state.mean, load_state(single, 1).mean)
+        single.close()
+        batched.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
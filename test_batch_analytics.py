@@ -0,0 +1,116 @@
+"------------------------------------------------test_batch_analytics------------------------------------------------"
+"""
+    Moduł zawierający klasę TestBatchAnalytics, która porównuje wyniki analizy wielu stanowisk z analizą pojedynczego
+stanowiska w klasie MeasurementAnalysis.
+
+Moduł zawiera następujące elementy:
+- unittest - moduł do przeprowadzania testów,
+- os, shutil, tempfile - moduły do tworzenia tymczasowej bazy danych,
+- datetime - moduł do generowania dat pomiarów,
+- numpy - moduł do obliczeń na tablicach,
+- database - moduł zarządzający połączeniami z bazą danych,
+- get_sensors_data, get_measurements_data - moduły zapisujące stanowiska i pomiary do bazy danych,
+- measurement_analysis - moduł zawierający klasę MeasurementAnalysis,
+- series_store - moduł z seriami pomiarów stanowisk odwzorowanymi w pamięci,
+- pandas - moduł, który został wykorzystany do generowania dataframe,
+- trends - moduł z metodami wyznaczania linii trendu,
+- batch_analytics - moduł zawierający funkcje batch_analyze i rolling_trend.
+"""
+import unittest
+import os
+import shutil
+import tempfile
+from datetime import datetime, timedelta
+import numpy as np
+import pandas as pd
+import measurement_analysis
+from database import get_connection, close_connection
+from get_sensors_data import create_sensors_table, save_sensors
+from get_measurements_data import create_measurements_table, save_measurements
+from measurement_analysis import MeasurementAnalysis
+from series_store import store_dir
+from trends import trend
+from batch_analytics import batch_analyze, rolling_trend
+
+
+class TestBatchAnalytics(unittest.TestCase):
+    """
+        Klasa testuje wybór stanowisk, statystyki i trend liczone dla wielu stanowisk naraz oraz obliczenia w puli
+    procesów.
+    """
+
+    def setUp(self):
+        handle, self.db_file = tempfile.mkstemp(suffix='.db')
+        os.close(handle)
+        self.conn = get_connection(self.db_file)
+        create_sensors_table(self.conn)
+        create_measurements_table(self.conn)
+        generator = np.random.default_rng(11)
+        start = datetime(2024, 1, 1)
+        sensors = {1: (10, 'PM10'), 2: (10, 'NO2'), 3: (20, 'PM10'), 4: (20, 'PM10')}
+        with self.conn:
+            for station_id in (10, 20):
+                save_sensors(self.conn, station_id, [{'id': sensor_id, 'stationId': station_id,
+                                                      'param': {'paramName': code, 'paramFormula': code,
+                                                                'paramCode': code, 'idParam': sensor_id}}
+                                                     for sensor_id, (station, code) in sensors.items()
+                                                     if station == station_id])
+            for sensor_id, length in ((1, 300), (2, 45), (3, 120), (4, 5)):
+                values = generator.normal(30 + sensor_id, 8, length).round(1)
+                measurements = [{'date': (start + timedelta(hours=i)).strftime('%Y-%m-%d %H:%M:%S'),
+                                 'value': None if i % 17 == 3 else float(value)} for i, value in enumerate(values)]
+                save_measurements(self.conn, sensor_id, measurements)
+
+    def tearDown(self):
+        measurement_analysis._frames.clear()
+        close_connection(self.db_file)
+        os.remove(self.db_file)
+        shutil.rmtree(store_dir(self.db_file), ignore_errors=True)
+
+    def test_rolling_trend_matches_pandas(self):
+        generator = np.random.default_rng(3)
+        values = generator.normal(0, 1, 95)
+        values[[7, 60]] = np.nan
+        hours = np.cumsum(generator.integers(1, 30, 95))
+        dates = pd.Timestamp('2024-01-01') + pd.to_timedelta(hours, unit='h')
+        groups = np.repeat([0, 1, 2], [50, 10, 35])
+        expected = np.concatenate([trend(pd.Series(values[groups == group], index=dates[groups == group]), 'rolling',
+                                         '2D').to_numpy() for group in range(3)])
+        seconds = dates.to_numpy().astype('datetime64[s]').astype(np.int64)
+        np.testing.assert_allclose(rolling_trend(seconds, values, groups, '2D'), expected)
+
+    def test_results_match_single_sensor_analysis(self):
+        """
+            Sprawdza, czy statystyki i trend każdego stanowiska są takie jak w analizie pojedynczego stanowiska.
+        """
+        report = batch_analyze(db_file=self.db_file, workers=1, shard_size=3)
+        self.assertEqual(report.index.tolist(), [1, 2, 3, 4])
+        for sensor_id, row in report.iterrows():
+            analysis = MeasurementAnalysis(self.db_file, sensor_id)
+            stats = analysis.statistics()
+            for column in ('max_value', 'min_value', 'min_date', 'max_date', 'count'):
+                self.assertEqual(row[column], stats[column])
+            self.assertAlmostEqual(row['data_mean'], stats['data_mean'])
+            self.assertAlmostEqual(row['data_std'], stats['data_std'])
+            # analiza stanowiska liczy trend z wartości zapisanych jako float32 (series_store)
+            line = analysis.trend('rolling').dropna()
+            self.assertAlmostEqual(row['trend_start'], line.iloc[0], places=5)
+            self.assertAlmostEqual(row['trend_end'], line.iloc[-1], places=5)
+            days = (line.index - line.index[0]).total_seconds() / 86400
+            self.assertAlmostEqual(row['trend_slope'], np.polyfit(days, line.to_numpy(), 1)[0], places=5)
+
+    def test_selection(self):
+        self.assertEqual(batch_analyze(param_code='PM10', db_file=self.db_file, workers=1).index.tolist(), [1, 3, 4])
+        self.assertEqual(batch_analyze(stations=[(20, 'Stacja')], db_file=self.db_file, workers=1)
+                         ['param_code'].tolist(), ['PM10', 'PM10'])
+        self.assertEqual(batch_analyze([2, 3], param_code='PM10', db_file=self.db_file, workers=1).index.tolist(), [3])
+        self.assertEqual(len(batch_analyze([99], db_file=self.db_file, workers=1)), 0)
+
+    def test_process_pool_gives_same_results(self):
+        single = batch_analyze(db_file=self.db_file, workers=1, shard_size=1)
+        pooled = batch_analyze(db_file=self.db_file, workers=2, shard_size=1)
+        self.assertTrue(single.equals(pooled))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+"--------------------------------------------------test_bulk_crawler--------------------------------------------------"
+"""
+    Moduł zawierający klasę TestBulkCrawler, która testuje moduł bulk_crawler, pobierający równolegle stanowiska
+i dane pomiarowe wszystkich stacji.
+
+Moduł zawiera następujące elementy:
+- unittest - moduł do przeprowadzania testów,
+- sqlite3 - moduł do łączenia z bazą danych,
+- os, tempfile - moduły do tworzenia tymczasowej bazy danych,
+- time - moduł do pomiaru czasu,
+- bulk_crawler - moduł zawierający funkcję crawl_all oraz klasę RateLimiter.
+"""
+import unittest
+import sqlite3
+import os
+import tempfile
+from database import close_connection
+import time
+from unittest import mock
+import bulk_crawler
+from bulk_crawler import RateLimiter, crawl_all
+
+
+class TestBulkCrawler(unittest.TestCase):
+    """
+        Klasa testuje ogranicznik zapytań oraz zapis danych pobranych przez crawl_all.
+    """
+
+    def setUp(self):
+        """
+            Tworzy tymczasową bazę danych z dwiema stacjami pomiarowymi.
+        """
+        handle, self.db_file = tempfile.mkstemp(suffix='.db')
+        os.close(handle)
+        conn = sqlite3.connect(self.db_file)
+        conn.execute('CREATE TABLE stations (id INTEGER NOT NULL PRIMARY KEY, station_name TEXT)')
+        conn.executemany('INSERT INTO stations VALUES (?, ?)', [(1, 'Station 1'), (2, 'Station 2')])
+        conn.commit()
+        conn.close()
+
+    def tearDown(self):
+        """
+            Zamyka połączenie z tymczasową bazą danych i usuwa ją.
+        """
+        close_connection(self.db_file)
+        os.remove(self.db_file)
+
+    def test_rate_limiter_spaces_requests_per_host(self):
+        """
+            Sprawdza, czy kolejne zapytania do tego samego hosta są rozłożone w czasie, a zapytania do innego hosta
+        nie czekają.
+        """
+        limiter = RateLimiter(20)
+        start = time.monotonic()
+        for _ in range(3):
+            limiter.wait('https://api.gios.gov.pl/a')
+        self.assertGreaterEqual(time.monotonic() - start, 0.09)
+
+        start = time.monotonic()
+        limiter.wait('https://example.org/b')
+        self.assertLess(time.monotonic() - start, 0.05)
+
+    def test_crawl_all_saves_sensors_and_measurements(self):
+        """
+            Sprawdza, czy crawl_all zapisuje stanowiska i pomiary wszystkich stacji do bazy danych.
+        """
+        def fake_sensors(station_id, session):
+            return [{'id': station_id * 10, 'stationId': station_id,
+                     'param': {'paramName': 'ozon', 'paramFormula': 'O3', 'paramCode': 'O3', 'idParam': 5}}]
+
+        def fake_measurements(sensor_id, session):
+            return [{'date': '2023-05-17 12:00:00', 'value': float(sensor_id)},
+                    {'date': '2023-05-17 11:00:00', 'value': None}]
+
+        with mock.patch.object(bulk_crawler, 'fetch_sensors', fake_sensors), \
+                mock.patch.object(bulk_crawler, 'fetch_measurements', fake_measurements):
+            summary = crawl_all(max_workers=4, requests_per_second=0, db_file=self.db_file)
+
+        self.assertEqual(summary['stations'], 2)
+        self.assertEqual(summary['errors'], 0)
+
+        conn = sqlite3.connect(self.db_file)
+        sensors = conn.execute('SELECT id, station_id FROM sensors ORDER BY id').fetchall()
+        values = conn.execute('SELECT sensor_id, values_value FROM measurements '
+                              'WHERE values_value IS NOT NULL ORDER BY sensor_id').fetchall()
+        conn.close()
+        self.assertEqual(sensors, [(10, 1), (20, 2)])
+        self.assertEqual(values, [(10, 10.0), (20, 20.0)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+"---------------------------------------------------test_data_loader---------------------------------------------------"
+"""
+    Moduł zawierający klasę TestDataLoader, która testuje moduł data_loader - strumieniowe parsowanie plików JSON
+oraz wsadowy zapis wierszy do bazy danych.
+
+Moduł zawiera następujące elementy:
+- unittest - moduł do przeprowadzania testów,
+- sqlite3 - moduł do łączenia z bazą danych,
+- json - moduł do konwersji danych między formatem JSON a obiektami Pythona,
+- os, tempfile - moduły do tworzenia plików tymczasowych,
+- data_loader - moduł zawierający funkcje iter_json_array i load_rows.
+"""
+import unittest
+import sqlite3
+import json
+import os
+import tempfile
+from unittest import mock
+import data_loader
+from data_loader import iter_json_array, load_rows
+
+
+class TestDataLoader(unittest.TestCase):
+    """
+        Klasa testuje strumieniowe parsowanie JSON i zapis partiami.
+    """
+
+    def setUp(self):
+        """
+            Tworzy tymczasowy plik JSON.
+        """
+        handle, self.file_path = tempfile.mkstemp(suffix='.json')
+        os.close(handle)
+
+    def tearDown(self):
+        """
+            Usuwa tymczasowy plik JSON.
+        """
+        os.remove(self.file_path)
+
+    def write_json(self, data):
+        with open(self.file_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=1)
+
+    def test_iter_json_array_across_chunks(self):
+        """
+            Sprawdza, czy elementy tablicy dzielone między porcjami odczytu są poprawnie składane.
+        """
+        stations = [{'id': i, 'stationName': f'Łódź {i}', 'gegrLat': 51.7 + i / 1000} for i in range(50)]
+        self.write_json(stations)
+
+        with mock.patch.object(data_loader, 'CHUNK_SIZE', 7):
+            self.assertEqual(list(iter_json_array(self.file_path)), stations)
+
+    def test_iter_json_array_with_key(self):
+        """
+            Sprawdza, czy zwracane są elementy tablicy zapisanej pod wskazanym kluczem obiektu.
+        """
+        measurements = {'key': 'NO2', 'meta': {'values': [0]},
+                        'values': [{'date': '2023-05-17 12:00:00', 'value': None},
+                                   {'date': '2023-05-17 11:00:00', 'value': 3.68007}]}
+        self.write_json(measurements)
+
+        with mock.patch.object(data_loader, 'CHUNK_SIZE', 5):
+            self.assertEqual(list(iter_json_array(self.file_path, key='values')), measurements['values'])
+
+        self.write_json({'key': 'NO2', 'values': []})
+        self.assertEqual(list(iter_json_array(self.file_path, key='values')), [])
+
+    def test_load_rows_in_batches(self):
+        """
+            Sprawdza, czy load_rows zapisuje wszystkie wiersze generatora partiami.
+        """
+        conn = sqlite3.connect(':memory:')
+        conn.execute('CREATE TABLE t (a INTEGER)')
+        with conn:
+            count = load_rows(conn, 'INSERT INTO t VALUES (?)', ((i,) for i in range(2500)), batch_size=1000)
+        self.assertEqual(count, 2500)
+        self.assertEqual(conn.execute('SELECT COUNT(*), SUM(a) FROM t').fetchone(), (2500, sum(range(2500))))
+        conn.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+"----------------------------------------------------test_database----------------------------------------------------"
+"""
+    Moduł zawierający klasę TestDatabase, która testuje moduł database - wspólną warstwę połączeń z bazą danych.
+
+Moduł zawiera następujące elementy:
+- unittest - moduł do przeprowadzania testów,
+- os, tempfile - moduły do tworzenia tymczasowej bazy danych,
+- threading - moduł do uruchamiania wątków,
+- database - moduł zawierający funkcje get_connection i close_connection.
+"""
+import unittest
+import os
+import tempfile
+import threading
+from database import get_connection, close_connection
+
+
+class TestDatabase(unittest.TestCase):
+    """
+        Klasa testuje przydział połączeń do wątków oraz parametry PRAGMA ustawiane przy otwarciu połączenia.
+    """
+
+    def setUp(self):
+        self.db_dir = tempfile.mkdtemp()
+        self.db_file = os.path.join(self.db_dir, 'test.db')
+
+    def tearDown(self):
+        close_connection(self.db_file)
+        for name in os.listdir(self.db_dir):
+            os.remove(os.path.join(self.db_dir, name))
+        os.rmdir(self.db_dir)
+
+    def test_connection_is_tuned(self):
+        """
+            Sprawdza, czy połączenie korzysta z dziennika WAL i trybu synchronous=NORMAL.
+        """
+        conn = get_connection(self.db_file)
+        self.assertEqual(conn.execute('PRAGMA journal_mode').fetchone()[0], 'wal')
+        self.assertEqual(conn.execute('PRAGMA synchronous').fetchone()[0], 1)
+
+    def test_connection_is_reused_per_thread(self):
+        """
+            Sprawdza, czy wątek otrzymuje za każdym razem to samo połączenie, a inny wątek - własne.
+        """
+        conn = get_connection(self.db_file)
+        self.assertIs(get_connection(self.db_file), conn)
+
+        def other_thread():
+            other.append(get_connection(self.db_file))
+            close_connection(self.db_file)
+
+        other = []
+        thread = threading.Thread(target=other_thread)
+        thread.start()
+        thread.join()
+        self.assertIsNot(other[0], conn)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+"--------------------------------------------------test_decimation--------------------------------------------------"
+"""
+    Moduł zawierający klasę TestDecimation, która testuje zmniejszanie liczby punktów serii metodami LTTB i min/max
+oraz linię wykresu przeliczaną po zmianie zakresu osi.
+
+Moduł zawiera następujące elementy:
+- unittest - moduł do przeprowadzania testów,
+- numpy - moduł do obliczeń na tablicach,
+- matplotlib - moduł do tworzenia wykresów (bez wyświetlania okna),
+- decimation - moduł zawierający funkcje lttb_indices, minmax_indices, decimate i klasę DecimatedLine.
+"""
+import unittest
+import numpy as np
+import matplotlib
+matplotlib.use('Agg')
+from matplotlib import pyplot as plt
+from decimation import lttb_indices, minmax_indices, decimate, DecimatedLine
+
+
+def reference_lttb(x, y, threshold):
+    """
+        Bezpośrednia (pętla po punktach) implementacja LTTB, z tym samym podziałem na kubełki.
+    """
+    size = len(y)
+    bounds = np.linspace(1, size - 1, threshold - 1).astype(int)
+    selected, previous = [0], 0
+    for bucket in range(threshold - 2):
+        start, stop = bounds[bucket], bounds[bucket + 1]
+        if bucket + 2 < len(bounds):
+            next_start, next_stop = bounds[bucket + 1], bounds[bucket + 2]
+            average_x, average_y = np.mean(x[next_start:next_stop]), np.mean(y[next_start:next_stop])
+        else:
+            average_x, average_y = x[-1], y[-1]
+        best, best_area = start, -1.0
+        for i in range(start, stop):
+            area = abs((x[previous] - average_x) * (y[i] - y[previous])
+                       - (x[previous] - x[i]) * (average_y - y[previous]))
+            if area > best_area:
+                best, best_area = i, area
+        selected.append(best)
+        previous = best
+    return selected + [size - 1]
+
+
+class TestDecimation(unittest.TestCase):
+    """
+        Klasa testuje wybór punktów i pamiętanie wyników dla zakresów osi.
+    """
+
+    def setUp(self):
+        generator = np.random.default_rng(2)
+        self.x = np.arange('2024-01-01T00', '2024-05-01T00', dtype='datetime64[h]')
+        self.y = np.sin(np.arange(len(self.x)) / 40) * 30 + generator.normal(40, 5, len(self.x))
+
+    def test_lttb_matches_reference(self):
+        x = np.arange(3000, dtype=float)
+        self.assertEqual(lttb_indices(x, self.y[:3000], 200).tolist(), reference_lttb(x, self.y[:3000], 200))
+        self.assertEqual(len(lttb_indices(self.x, self.y, 500)), 500)
+
+    def test_minmax_keeps_extremes_of_every_bucket(self):
+        indices = minmax_indices(self.y, 100)
+        self.assertTrue(np.all(np.diff(indices) > 0))
+        self.assertLessEqual(len(indices), 100)
+        buckets = np.arange(len(self.y)) * 50 // len(self.y)
+        for bucket in range(50):
+            values = self.y[buckets == bucket]
+            self.assertIn(values.min(), self.y[indices])
+            self.assertIn(values.max(), self.y[indices])
+
+    def test_decimate_skips_missing_values(self):
+        y = self.y.copy()
+        y[::7] = np.nan
+        x, result = decimate(self.x, y, 300, 'minmax')
+        self.assertFalse(np.isnan(result).any())
+        self.assertEqual(result.max(), np.nanmax(y))
+        self.assertEqual(len(decimate(self.x[:10], self.y[:10], 300)[0]), 10)
+
+    def test_line_follows_axis_range(self):
+        """
+            Sprawdza, czy po przybliżeniu linia zawiera punkty tylko z widocznego zakresu i czy wynik dla zakresu jest
+        pamiętany.
+        """
+        figure = plt.figure(figsize=(6, 4))
+        ax = figure.gca()
+        line = DecimatedLine(ax, self.x, self.y, 'lttb')
+        self.assertLessEqual(len(line.line.get_xdata()), int(ax.bbox.width))
+        ax.set_xlim(self.x[100], self.x[400])
+        shown = line.line.get_xdata()
+        self.assertEqual((shown[0], shown[-1]), (self.x[99], self.x[401]))
+        cached = line.points(*line.visible_range())
+        self.assertIs(line.points(*line.visible_range()), cached)
+        plt.close(figure)
+
+
+if __name__ == '__main__':
+    unittest.main()
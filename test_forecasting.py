@@ -0,0 +1,151 @@
+"--------------------------------------------------test_forecasting--------------------------------------------------"
+"""
+    Moduł zawierający klasę TestForecasting, która testuje prognozy pomiarów stanowisk metodą Holta-Wintersa.
+
+Moduł zawiera następujące elementy:
+- unittest - moduł do przeprowadzania testów,
+- os, shutil, tempfile - moduły do tworzenia tymczasowej bazy danych,
+- sqlite3 - moduł do tworzenia bazy danych w pamięci,
+- datetime - moduł do generowania dat pomiarów,
+- numpy - moduł do obliczeń na tablicach,
+- database - moduł zarządzający połączeniami z bazą danych,
+- get_sensors_data, get_measurements_data - moduły zapisujące stanowiska i pomiary do bazy danych,
+- series_store - moduł z seriami pomiarów stanowisk odwzorowanymi w pamięci,
+- measurement_analysis - moduł zawierający klasę MeasurementAnalysis,
+- forecasting - moduł zawierający funkcję forecast i model ForecastModel,
+- batch_analytics - moduł zawierający funkcję batch_forecast.
+"""
+import unittest
+import os
+import shutil
+import tempfile
+import sqlite3
+from datetime import datetime, timedelta
+import numpy as np
+import measurement_analysis
+from database import get_connection, close_connection
+from get_sensors_data import create_sensors_table
+from get_measurements_data import create_measurements_table, save_measurements
+from series_store import store_dir
+from measurement_analysis import MeasurementAnalysis
+from forecasting import MIN_HISTORY, WARM_UP, ForecastModel, forecast, load_model
+from batch_analytics import batch_forecast
+
+
+def daily_cycle(hours, start=datetime(2024, 3, 1)):
+    """
+        Zwraca pomiary godzinowe z powtarzalnym przebiegiem dobowym (wartość zależy tylko od godziny doby).
+    """
+    return [((start + timedelta(hours=step)).strftime('%Y-%m-%d %H:%M:%S'),
+             30.0 + 10.0 * np.sin(2 * np.pi * ((start + timedelta(hours=step)).hour) / 24)) for step in range(hours)]
+
+
+class TestForecastModel(unittest.TestCase):
+    """
+        Klasa testuje dopasowanie modelu do przebiegu dobowego, przedział prognozy i aktualizację modelu przy zapisie
+    pomiarów (partiami oraz z godzinami bez pomiarów).
+    """
+
+    def test_daily_seasonality(self):
+        model = ForecastModel()
+        for date, value in daily_cycle(24 * 21):
+            model.update(date, value)
+        frame = model.predict(48)
+        self.assertEqual(len(frame), 48)
+        self.assertEqual(str(frame.index[0]), '2024-03-22 00:00:00')
+        expected = 30.0 + 10.0 * np.sin(2 * np.pi * frame.index.hour / 24)
+        np.testing.assert_allclose(frame['forecast'], expected, atol=1.0)
+        self.assertTrue((frame['lower'] <= frame['forecast']).all() and (frame['forecast'] <= frame['upper']).all())
+        spread = (frame['upper'] - frame['lower']).to_numpy()
+        self.assertTrue((np.diff(spread) >= 0).all())
+
+    def test_incremental_updates(self):
+        """
+            Sprawdza, czy model aktualizowany przy zapisie kolejnych partii pomiarów jest taki sam jak model dopasowany
+        do całej serii, a pomiary bez wartości i powtórzone nie zmieniają modelu.
+        """
+        series = daily_cycle(24 * 10)
+        series[100] = (series[100][0], None)
+        conn = sqlite3.connect(':memory:')
+        create_measurements_table(conn)
+        for start in range(0, len(series), 17):
+            save_measurements(conn, 5, [{'date': date, 'value': value} for date, value in series[start:start + 17]])
+        save_measurements(conn, 5, [{'date': date, 'value': value} for date, value in series[-5:]])
+        model = ForecastModel()
+        for date, value in series:
+            if value is not None:
+                model.update(date, value)
+        stored = load_model(conn, 5)
+        self.assertEqual((stored.count, stored.last_date), (len(series) - 1, series[-1][0]))
+        self.assertAlmostEqual(stored.level, model.level)
+        np.testing.assert_allclose(stored.season, model.season)
+        self.assertIsNotNone(forecast(conn, 5))
+        self.assertIsNone(forecast(conn, 6))
+        conn.close()
+
+
+class TestBatchForecast(unittest.TestCase):
+    """
+        Klasa testuje prognozy wielu stanowisk (z uzupełnieniem modeli o historię zapisaną przed ich utworzeniem) oraz
+    prognozę na wykresie MeasurementAnalysis.
+    """
+
+    def setUp(self):
+        handle, self.db_file = tempfile.mkstemp(suffix='.db')
+        os.close(handle)
+        self.conn = get_connection(self.db_file)
+        create_sensors_table(self.conn)
+        create_measurements_table(self.conn)
+        with self.conn:
+            self.conn.executemany('INSERT INTO sensors (id, station_id, param_code) VALUES (?, ?, ?)',
+                                  [(1, 10, 'PM10'), (2, 10, 'NO2'), (3, 20, 'PM10')])
+            for sensor_id, hours in ((1, 24 * 10), (2, 24 * 8), (3, 24)):
+                save_measurements(self.conn, sensor_id, [{'date': date, 'value': value}
+                                                         for date, value in daily_cycle(hours)])
+
+    def tearDown(self):
+        measurement_analysis._frames.clear()
+        close_connection(self.db_file)
+        os.remove(self.db_file)
+        shutil.rmtree(store_dir(self.db_file), ignore_errors=True)
+
+    def test_batch_forecast(self):
+        with self.conn:
+            self.conn.execute('DELETE FROM forecast_state WHERE sensor_id = 1')
+        frame = batch_forecast(db_file=self.db_file, hours=24, workers=1, shard_size=2)
+        self.assertEqual(sorted(set(frame.index.get_level_values('sensor_id'))), [1, 2])
+        self.assertEqual(len(frame.loc[1]), 24)
+        self.assertEqual(load_model(self.conn, 1).count, 24 * 10)
+        self.assertLess(load_model(self.conn, 3).count, MIN_HISTORY)
+        np.testing.assert_allclose(frame.loc[2]['forecast'].to_numpy(), forecast(self.conn, 2, 24)['forecast'])
+        parallel = batch_forecast(param_code='PM10', db_file=self.db_file, hours=24, workers=2, shard_size=1)
+        np.testing.assert_allclose(parallel.loc[1].to_numpy(), frame.loc[1].to_numpy())
+
+    def test_batch_forecast_warm_up(self):
+        """
+            Sprawdza, czy nowy model stanowiska z długą historią dopasowywany jest tylko do ostatnich WARM_UP godzin.
+        """
+        series = daily_cycle(24 * 35)
+        with self.conn:
+            self.conn.execute("INSERT INTO sensors (id, station_id, param_code) VALUES (4, 30, 'O3')")
+            save_measurements(self.conn, 4, [{'date': date, 'value': value} for date, value in series])
+            self.conn.execute('DELETE FROM forecast_state WHERE sensor_id = 4')
+        batch_forecast(sensors=[4], db_file=self.db_file, hours=24, workers=1)
+        model = load_model(self.conn, 4)
+        self.assertEqual((model.count, model.last_date), (WARM_UP + 1, series[-1][0]))
+
+    def test_chart_band(self):
+        import matplotlib
+        matplotlib.use('Agg')
+        from matplotlib import pyplot as plt
+        plt.show = lambda: None
+        analysis = MeasurementAnalysis(self.db_file, 1)
+        analysis.chart()
+        labels = plt.gca().get_legend_handles_labels()[1]
+        self.assertIn('Przedział prognozy', labels)
+        plt.close('all')
+        self.assertIsNone(MeasurementAnalysis(self.db_file, 3).forecast())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+"---------------------------------------------------test_geocoding---------------------------------------------------"
+"""
+    Moduł zawierający klasę TestGeocoding, która testuje lokalny słownik miejscowości oraz pamięć podręczną geokodera.
+
+Moduł zawiera następujące elementy:
+- unittest - moduł do przeprowadzania testów,
+- os, tempfile - moduły do tworzenia tymczasowej bazy danych,
+- database - moduł zarządzający połączeniami z bazą danych,
+- geocoding - moduł zawierający funkcje build_gazetteer, lookup_local i geocode.
+"""
+import unittest
+import os
+import tempfile
+from unittest import mock
+import geocoding
+from database import get_connection, close_connection
+from get_stations_data import create_stations_table
+from geocoding import build_gazetteer, lookup_local, geocode
+
+
+class TestGeocoding(unittest.TestCase):
+    """
+        Klasa testuje wyszukiwanie współrzędnych bez użycia sieci i zapamiętywanie wyników geokodera.
+    """
+
+    def setUp(self):
+        """
+            Tworzy tymczasową bazę danych z trzema stacjami (dwie w Łodzi) i buduje słownik miejscowości.
+        """
+        handle, self.db_file = tempfile.mkstemp(suffix='.db')
+        os.close(handle)
+        conn = get_connection(self.db_file)
+        create_stations_table(conn)
+        with conn:
+            conn.executemany('''INSERT INTO stations (id, gegr_lat, gegr_lon, city_name, commune_name, district_name)
+                                VALUES (?, ?, ?, ?, ?, ?)''',
+                             [(1, '51.70', '19.40', 'Łódź', 'Łódź', 'Łódź'),
+                              (2, '51.80', '19.50', 'Łódź', 'Łódź', 'Łódź'),
+                              (3, '50.00', '20.00', 'Niepołomice', 'Niepołomice', 'wielicki')])
+            build_gazetteer(conn)
+
+    def tearDown(self):
+        geocoding._memory.clear()
+        close_connection(self.db_file)
+        os.remove(self.db_file)
+
+    def test_local_lookup_uses_station_centroid(self):
+        """
+            Sprawdza, czy miejscowość jest znajdowana bez polskich znaków, a jej współrzędne to środek jej stacji.
+        """
+        latitude, longitude = lookup_local('lodz', self.db_file)
+        self.assertAlmostEqual(latitude, 51.75)
+        self.assertAlmostEqual(longitude, 19.45)
+        self.assertEqual(lookup_local('Wielicki', self.db_file), (50.0, 20.0))
+        self.assertEqual(lookup_local('NIEPOŁOMICE, ul. Kościuszki', self.db_file), (50.0, 20.0))
+        self.assertIsNone(lookup_local('Gdańsk', self.db_file))
+
+    def test_remote_result_is_cached(self):
+        """
+            Sprawdza, czy geokoder Nominatim jest pytany tylko raz o ten sam nieznany adres.
+        """
+        location = mock.Mock(latitude=54.35, longitude=18.65)
+        with mock.patch('geopy.geocoders.Nominatim') as nominatim:
+            nominatim.return_value.geocode.return_value = location
+            self.assertEqual(geocode('Gdańsk', self.db_file), (54.35, 18.65))
+            self.assertEqual(geocode('gdansk', self.db_file), (54.35, 18.65))
+        self.assertEqual(nominatim.return_value.geocode.call_count, 1)
+
+        geocoding._memory.clear()
+        self.assertEqual(lookup_local('GDAŃSK', self.db_file), (54.35, 18.65))
+
+    def test_memory_is_kept_per_database(self):
+        """
+            Sprawdza, czy zapytania do innej bazy danych nie korzystają ze słownika wczytanego z pierwszej bazy.
+        """
+        self.assertIsNotNone(lookup_local('lodz', self.db_file))
+        handle, other_file = tempfile.mkstemp(suffix='.db')
+        os.close(handle)
+        try:
+            conn = get_connection(other_file)
+            create_stations_table(conn)
+            with conn:
+                conn.execute('''INSERT INTO stations (id, gegr_lat, gegr_lon, city_name, commune_name, district_name)
+                                VALUES (1, 54.35, 18.65, 'Gdańsk', 'Gdańsk', 'Gdańsk')''')
+            self.assertIsNone(lookup_local('lodz', other_file))
+            self.assertEqual(lookup_local('gdansk', other_file), (54.35, 18.65))
+            self.assertIsNone(lookup_local('gdansk', self.db_file))
+        finally:
+            close_connection(other_file)
+            os.remove(other_file)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -14,7 +14,8 @@ import unittest
 import sqlite3
 import json
 import os
-from get_measurements_data import get_measurements_data
+from get_sensors_data import create_sensors_table
+from get_measurements_data import get_measurements_data, save_measurements, latest_station_values
 
 class TestGetMeasurementsData(unittest.TestCase):
     """
@@ -32,8 +33,10 @@ class TestGetMeasurementsData(unittest.TestCase):
         self.conn = sqlite3.connect(':memory:')
         self.cursor = self.conn.cursor()
         self.cursor.execute('''CREATE TABLE IF NOT EXISTS measurements (
+                                sensor_id INTEGER NOT NULL,
                                 values_date DATETIME NOT NULL,
-                                values_value FLOAT)''')
+                                values_value FLOAT,
+                                PRIMARY KEY (sensor_id, values_date)) WITHOUT ROWID''')
 
     def tearDown(self):
         """
@@ -126,13 +129,52 @@ class TestGetMeasurementsData(unittest.TestCase):
         cursor.execute("PRAGMA table_info(measurements)")
         result = cursor.fetchall()
         expected_result = [
-            (0, 'values_date', 'DATETIME', 1, None, 0),
-            (1, 'values_value', 'FLOAT', 0, None, 0),
+            (0, 'sensor_id', 'INTEGER', 1, None, 1),
+            (1, 'values_date', 'DATETIME', 1, None, 2),
+            (2, 'values_value', 'FLOAT', 0, None, 0),
         ]
         self.assertEqual(result, expected_result)
 
         conn.close()
 
+    def test_save_measurements_is_incremental(self):
+        """
+            Testuje dopisywanie pomiarów do tabeli 'measurements'.
+        W tym celu:
+        - Zapisuje dwa pomiary, z których najnowszy nie ma jeszcze wartości,
+        - Sprawdza, czy ponowny zapis tych samych danych zapisuje jedynie pomiar bez wartości,
+        - Sprawdza, czy uzupełniona wartość nadpisała pomiar bez wartości, a starszy pomiar pozostał w tabeli.
+        """
+        first = {"key": "NO2", "values": [{"date": "2023-05-17 12:00:00", "value": None},
+                                          {"date": "2023-05-17 11:00:00", "value": 3.68007}]}
+        second = {"key": "NO2", "values": [{"date": "2023-05-17 12:00:00", "value": 2.81276}]}
+
+        self.assertEqual(save_measurements(self.conn, 50, first['values']), 2)
+        self.assertEqual(save_measurements(self.conn, 50, first['values']), 1)
+        self.assertEqual(save_measurements(self.conn, 50, second['values']), 1)
+        self.assertEqual(save_measurements(self.conn, 50, second['values']), 0)
+
+        self.cursor.execute("SELECT values_date, values_value FROM measurements WHERE sensor_id = 50 "
+                            "ORDER BY values_date")
+        self.assertEqual(self.cursor.fetchall(), [("2023-05-17 11:00:00", 3.68007),
+                                                  ("2023-05-17 12:00:00", 2.81276)])
+
+    def test_latest_station_values(self):
+        """
+            Testuje odczyt najnowszych wartości stanowisk stacji (podpowiedź na mapie): pomiar bez wartości jest
+        pomijany, a stanowiska innych stacji nie są zwracane.
+        """
+        create_sensors_table(self.conn)
+        self.conn.executemany("INSERT INTO sensors (id, station_id, param_code) VALUES (?, ?, ?)",
+                              [(50, 1, "NO2"), (51, 1, "PM10"), (52, 2, "O3")])
+        save_measurements(self.conn, 50, [{"date": "2023-05-17 12:00:00", "value": None},
+                                          {"date": "2023-05-17 11:00:00", "value": 3.5}])
+        save_measurements(self.conn, 51, [{"date": "2023-05-17 12:00:00", "value": 20.0}])
+        save_measurements(self.conn, 52, [{"date": "2023-05-17 12:00:00", "value": 60.0}])
+
+        self.assertEqual(latest_station_values(self.conn, 1), [("NO2", 3.5, "2023-05-17 11:00:00"),
+                                                               ("PM10", 20.0, "2023-05-17 12:00:00")])
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -8,6 +8,9 @@ Moduł zawiera następujące elementy:
 - sqlite3 - moduł do łączenia z bazą danych database.db,
 - json - moduł do konwersji danych między formatem JSON a obiektami Pythona,
 - os - moduł do wykonywania operacji na plikach,
+- tempfile - moduł do tworzenia tymczasowej bazy danych,
+- requests - moduł do wykonywania zapytań sieciowych (wyjątki),
+- database - moduł zarządzający połączeniami z bazą danych,
 - get_sensors_data - moduł zawierający funkcję get_sensors_data.
 """
 
@@ -15,6 +18,11 @@ import unittest
 import sqlite3
 import json
 import os
+import tempfile
+from unittest import mock
+import requests
+import get_sensors_data as sensors_module
+from database import get_connection, close_connection
 from get_sensors_data import get_sensors_data
 
 class TestGetSensorsData(unittest.TestCase):
@@ -163,5 +171,57 @@ class TestGetSensorsData(unittest.TestCase):
         conn.close()
 
 
+
+class TestSavedSensorsAreKept(unittest.TestCase):
+    """
+        Klasa testuje, czy poprzednio zapisane stanowiska stacji pozostają w bazie, gdy ani serwis, ani plik
+    'sensors.json' nie zwrócą stanowisk tej stacji.
+    """
+
+    def setUp(self):
+        handle, self.db_file = tempfile.mkstemp(suffix='.db')
+        os.close(handle)
+        self.conn = get_connection(self.db_file)
+        sensors_module.create_sensors_table(self.conn)
+        with self.conn:
+            self.conn.execute("INSERT INTO sensors (id, station_id, param_code) VALUES (1, 999999, 'PM10')")
+
+    def tearDown(self):
+        close_connection(self.db_file)
+        os.remove(self.db_file)
+
+    def saved_sensors(self):
+        return self.conn.execute('SELECT id FROM sensors WHERE station_id = 999999').fetchall()
+
+    def test_empty_response(self):
+        """
+            Sprawdza, czy pusta lista stanowisk zwrócona przez serwis nie usuwa zapisanych stanowisk stacji.
+        """
+        handle, response = tempfile.mkstemp(suffix='.json')
+        with os.fdopen(handle, 'w') as file:
+            file.write('[]')
+        cache = mock.Mock()
+        cache.fetch.return_value = response
+        try:
+            with mock.patch.object(sensors_module, 'get_connection', lambda: self.conn), \
+                    mock.patch.object(sensors_module, 'default_cache', lambda: cache):
+                get_sensors_data(999999)
+        finally:
+            os.remove(response)
+        self.assertEqual(self.saved_sensors(), [(1,)])
+
+    def test_fallback_without_station(self):
+        """
+            Sprawdza, czy przy błędzie pobierania i braku stacji w pliku 'sensors.json' stanowiska pozostają w bazie.
+        """
+        def failing_fetch(station_id):
+            raise requests.exceptions.ConnectionError()
+
+        with mock.patch.object(sensors_module, 'get_connection', lambda: self.conn), \
+                mock.patch.object(sensors_module, 'fetch_sensors', failing_fetch):
+            get_sensors_data(999999)
+        self.assertEqual(self.saved_sensors(), [(1,)])
+
+
 if __name__ == '__main__':
     unittest.main()
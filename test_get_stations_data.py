@@ -8,13 +8,21 @@ Moduł zawiera następujące elementy:
 - sqlite3 - moduł do łączenia z bazą danych database.db,
 - json - moduł do konwersji danych między formatem JSON a obiektami Pythona,
 - os - moduł do wykonywania operacji na plikach,
-- get_stations_data - moduł zawierający funkcję get_stations_data.
+- tempfile - moduł do tworzenia tymczasowej bazy danych,
+- random - moduł do losowania położeń stacji,
+- geopy - moduł do geolokalizacji (wzorcowa odległość great_circle),
+- database - moduł zarządzający połączeniami z bazą danych,
+- get_stations_data - moduł zawierający funkcje get_stations_data, stations_in_bbox i stations_within.
 """
 import unittest
 import sqlite3
 import json
 import os
-from get_stations_data import get_stations_data
+import tempfile
+import random
+from geopy.distance import great_circle
+from database import get_connection, close_connection
+from get_stations_data import get_stations_data, create_stations_table, save_stations, stations_in_bbox, stations_within
 
 class TestGetStationsData(unittest.TestCase):
     """
@@ -34,8 +42,8 @@ class TestGetStationsData(unittest.TestCase):
         self.cursor.execute('''CREATE TABLE stations (
                                 id INTEGER NOT NULL PRIMARY KEY,
                                 station_name TEXT,
-                                gegr_lat TEXT,
-                                gegr_lon TEXT,
+                                gegr_lat REAL,
+                                gegr_lon REAL,
                                 city_id INTEGER,
                                 city_name TEXT,
                                 commune_name TEXT,
@@ -128,8 +136,8 @@ class TestGetStationsData(unittest.TestCase):
         for json_station, db_station in zip(json_data, db_data):
             self.assertEqual(json_station['id'], db_station[0])
             self.assertEqual(json_station['stationName'], db_station[1])
-            self.assertEqual(json_station['gegrLat'], db_station[2])
-            self.assertEqual(json_station['gegrLon'], db_station[3])
+            self.assertEqual(float(json_station['gegrLat']), db_station[2])
+            self.assertEqual(float(json_station['gegrLon']), db_station[3])
             self.assertEqual(json_station['city']['id'], db_station[4])
             self.assertEqual(json_station['city']['name'], db_station[5])
             self.assertEqual(json_station['city']['commune']['communeName'], db_station[6])
@@ -176,8 +184,8 @@ class TestGetStationsData(unittest.TestCase):
         expected_result = [
             (0, 'id', 'INTEGER', 1, None, 1),
             (1, 'station_name', 'TEXT', 0, None, 0),
-            (2, 'gegr_lat', 'TEXT', 0, None, 0),
-            (3, 'gegr_lon', 'TEXT', 0, None, 0),
+            (2, 'gegr_lat', 'REAL', 0, None, 0),
+            (3, 'gegr_lon', 'REAL', 0, None, 0),
             (4, 'city_id', 'INTEGER', 0, None, 0),
             (5, 'city_name', 'TEXT', 0, None, 0),
             (6, 'commune_name', 'TEXT', 0, None, 0),
@@ -188,5 +196,85 @@ class TestGetStationsData(unittest.TestCase):
         self.assertEqual(result, expected_result)
 
 
+class TestStationsRtree(unittest.TestCase):
+    """
+        Klasa testuje indeks przestrzenny 'stations_rtree', zapis stacji bez współrzędnych oraz przebudowę tabeli
+    ze współrzędnymi zapisanymi jako tekst.
+    """
+
+    def setUp(self):
+        handle, self.db_file = tempfile.mkstemp(suffix='.db')
+        os.close(handle)
+        self.conn = get_connection(self.db_file)
+
+    def tearDown(self):
+        close_connection(self.db_file)
+        os.remove(self.db_file)
+
+    def save_random_stations(self, count=300):
+        generator = random.Random(11)
+        stations = [{'id': i, 'stationName': f'Station {i}', 'gegrLat': f'{generator.uniform(49, 54.9):.6f}',
+                     'gegrLon': f'{generator.uniform(14.15, 24.2):.6f}', 'addressStreet': None,
+                     'city': {'id': i, 'name': 'City', 'commune': {'communeName': 'Commune', 'districtName': 'District',
+                                                                   'provinceName': 'Province'}}}
+                    for i in range(count)]
+        create_stations_table(self.conn)
+        with self.conn:
+            save_stations(self.conn, stations)
+        return self.conn.execute('SELECT * FROM stations ORDER BY id').fetchall()
+
+    def test_bbox_matches_full_scan(self):
+        """
+            Sprawdza, czy zapytanie przez R*Tree zwraca dokładnie stacje z prostokąta, włącznie ze stacją na jego
+        brzegu.
+        """
+        stations = self.save_random_stations()
+        box = (50.5, 52.0, stations[0][3], 21.0)
+        expected = [row for row in stations if box[0] <= row[2] <= box[1] and box[2] <= row[3] <= box[3]]
+        self.assertIn(stations[0], expected)
+        self.assertEqual(stations_in_bbox(self.conn, *box), expected)
+
+    def test_within_matches_great_circle(self):
+        """
+            Sprawdza, czy stacje w promieniu są zgodne z przeliczeniem great_circle wszystkich stacji.
+        """
+        stations = self.save_random_stations()
+        expected = sorted((great_circle((51.76, 19.46), (row[2], row[3])).km, row) for row in stations)
+        result = stations_within(self.conn, 51.76, 19.46, 80)
+        self.assertEqual([row for _, row in result], [row for distance, row in expected if distance <= 80])
+
+    def test_stations_without_coordinates(self):
+        """
+            Sprawdza, czy stacje bez współrzędnych (null lub pusty tekst) są zapisywane z NULL i pomijane w indeksie.
+        """
+        stations = [{'id': i, 'stationName': f'Station {i}', 'gegrLat': latitude, 'gegrLon': longitude,
+                     'addressStreet': None,
+                     'city': {'id': i, 'name': 'City', 'commune': {'communeName': 'Commune', 'districtName': 'District',
+                                                                   'provinceName': 'Province'}}}
+                    for i, (latitude, longitude) in enumerate([('51.70', '19.40'), (None, '19.45'), ('', None)])]
+        create_stations_table(self.conn)
+        with self.conn:
+            self.assertEqual(save_stations(self.conn, stations), 3)
+        self.assertEqual(self.conn.execute('SELECT id, gegr_lat, gegr_lon FROM stations ORDER BY id').fetchall(),
+                         [(0, 51.7, 19.4), (1, None, 19.45), (2, None, None)])
+        self.assertEqual([row[0] for row in self.conn.execute('SELECT id FROM stations_rtree')], [0])
+        self.assertEqual([row[0] for row in stations_in_bbox(self.conn, -90, 90, -180, 180)], [0])
+
+    def test_text_coordinates_are_migrated(self):
+        """
+            Sprawdza, czy tabela ze współrzędnymi typu TEXT jest przebudowywana bez utraty stacji i trafia do indeksu.
+        """
+        with self.conn:
+            self.conn.execute('CREATE TABLE stations (id INTEGER NOT NULL PRIMARY KEY, station_name TEXT, '
+                              'gegr_lat TEXT, gegr_lon TEXT, city_id INTEGER, city_name TEXT, commune_name TEXT, '
+                              'district_name TEXT, province_name TEXT, address_street TEXT)')
+            self.conn.execute("INSERT INTO stations (id, gegr_lat, gegr_lon) VALUES (1, '51.70', '19.40')")
+        create_stations_table(self.conn)
+        types = {row[1]: row[2] for row in self.conn.execute('PRAGMA table_info(stations)')}
+        self.assertEqual(types['gegr_lat'], 'REAL')
+        self.assertEqual(self.conn.execute('SELECT gegr_lat, gegr_lon FROM stations').fetchall(), [(51.7, 19.4)])
+        self.assertEqual([row[0] for row in stations_in_bbox(self.conn, 51, 52, 19, 20)], [1])
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,64 @@
+"---------------------------------------------------test_haversine---------------------------------------------------"
+"""
+    Moduł zawierający klasę TestHaversine, która porównuje wektorowe obliczenia odległości z funkcją great_circle
+z modułu geopy.
+
+Moduł zawiera następujące elementy:
+- unittest - moduł do przeprowadzania testów,
+- numpy - moduł do obliczeń na tablicach,
+- geopy - moduł do geolokalizacji (wzorcowa odległość great_circle),
+- haversine - moduł zawierający wektorowe funkcje odległości.
+"""
+import unittest
+import numpy as np
+from geopy.distance import great_circle
+from haversine import distances_from, distance_matrix, nearest_points, pairs_within
+
+
+class TestHaversine(unittest.TestCase):
+    """
+        Klasa testuje zgodność odległości z great_circle oraz wyniki liczone blokami.
+    """
+
+    def setUp(self):
+        generator = np.random.default_rng(11)
+        self.lats = generator.uniform(49, 54.9, 60)
+        self.lons = generator.uniform(14.15, 24.2, 60)
+
+    def test_distances_match_great_circle(self):
+        """
+            Sprawdza, czy odległości jednego punktu od wielu zgadzają się z great_circle z dokładnością do 1 mm.
+        """
+        result = distances_from(51.76, 19.46, self.lats, self.lons)
+        expected = [great_circle((51.76, 19.46), (lat, lon)).km for lat, lon in zip(self.lats, self.lons)]
+        np.testing.assert_allclose(result, expected, atol=1e-6)
+
+    def test_chunked_matrix_equals_full_matrix(self):
+        """
+            Sprawdza, czy macierz liczona małymi blokami jest taka sama jak liczona w jednym bloku i symetryczna.
+        """
+        full = distance_matrix(self.lats, self.lons, chunk_size=1000)
+        chunked = distance_matrix(self.lats, self.lons, chunk_size=7)
+        np.testing.assert_allclose(full, chunked)
+        np.testing.assert_allclose(full, full.T)
+        self.assertTrue(np.allclose(np.diag(full), 0))
+
+    def test_nearest_points_and_pairs(self):
+        """
+            Sprawdza najbliższe punkty i pary punktów w zadanym promieniu względem pełnej macierzy odległości.
+        """
+        full = distance_matrix(self.lats[:10], self.lons[:10], self.lats, self.lons)
+        indices, distances = nearest_points(self.lats[:10], self.lons[:10], self.lats, self.lons, chunk_size=3)
+        np.testing.assert_array_equal(indices, np.arange(10))
+        np.testing.assert_allclose(distances, 0, atol=1e-9)
+
+        matrix = distance_matrix(self.lats, self.lons)
+        first, second, pair_distances = pairs_within(self.lats, self.lons, 100, chunk_size=8)
+        expected = {(i, j) for i in range(60) for j in range(i + 1, 60) if matrix[i, j] <= 100}
+        self.assertEqual(set(zip(first.tolist(), second.tolist())), expected)
+        np.testing.assert_allclose(pair_distances, matrix[first, second])
+        self.assertEqual(full.shape, (10, 60))
+
+
+if __name__ == '__main__':
+    unittest.main()
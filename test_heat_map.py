@@ -0,0 +1,106 @@
+"---------------------------------------------------test_heat_map---------------------------------------------------"
+"""
+    Moduł zawierający klasę TestHeatMap, która testuje interpolację wartości parametru na siatkę nad Polską oraz
+zapamiętywanie gotowych siatek.
+
+Moduł zawiera następujące elementy:
+- unittest - moduł do przeprowadzania testów,
+- os, tempfile - moduły do tworzenia tymczasowej bazy danych,
+- numpy - moduł do obliczeń na tablicach,
+- database - moduł zarządzający połączeniami z bazą danych,
+- get_stations_data, get_sensors_data, get_measurements_data - moduły tworzące tabele bazy danych,
+- haversine - moduł z wektorowymi funkcjami odległości,
+- heat_map - moduł zawierający funkcje idw_grid i heat_map.
+"""
+import unittest
+import os
+import tempfile
+import numpy as np
+import heat_map
+from database import get_connection, close_connection
+from get_stations_data import create_stations_table
+from get_sensors_data import create_sensors_table
+from get_measurements_data import create_measurements_table, save_measurements
+from haversine import distance_matrix
+from heat_map import idw_grid
+
+
+class TestHeatMap(unittest.TestCase):
+    """
+        Klasa testuje zgodność siatki z bezpośrednim wzorem IDW oraz wybór pomiarów z bazy danych.
+    """
+
+    def setUp(self):
+        generator = np.random.default_rng(3)
+        self.lats = generator.uniform(49, 54.9, 120)
+        self.lons = generator.uniform(14.15, 24.2, 120)
+        self.values = generator.uniform(0, 100, 120)
+
+    def brute_force(self, width, height, radius, neighbours):
+        cell_lons = 14.15 + (np.arange(width) + 0.5) * (24.2 - 14.15) / width
+        cell_lats = 54.9 - (np.arange(height) + 0.5) * (54.9 - 49) / height
+        grid_lats, grid_lons = np.meshgrid(cell_lats, cell_lons, indexing='ij')
+        distances = distance_matrix(grid_lats.ravel(), grid_lons.ravel(), self.lats, self.lons)
+        result = np.full(len(distances), np.nan)
+        for i, row in enumerate(distances):
+            nearest = np.argsort(row)[:neighbours]
+            nearest = nearest[row[nearest] <= radius]
+            if len(nearest):
+                weights = 1 / row[nearest] ** 2
+                result[i] = (weights * self.values[nearest]).sum() / weights.sum()
+        return result.reshape(height, width)
+
+    def test_tiled_grid_matches_direct_formula(self):
+        """
+            Sprawdza, czy siatka liczona kafelkami ze wstępnym wyborem stacji jest taka sama jak liczona wprost,
+        także w komórkach bez stacji w promieniu (NaN).
+        """
+        result = idw_grid(self.lats, self.lons, self.values, width=40, height=30, radius=40, neighbours=5, tile_size=7)
+        expected = self.brute_force(40, 30, 40, 5)
+        self.assertTrue(np.isnan(expected).any())
+        np.testing.assert_array_equal(np.isnan(result), np.isnan(expected))
+        np.testing.assert_allclose(result, expected, rtol=1e-9)
+
+    def test_heat_map_uses_latest_values_and_cache(self):
+        """
+            Sprawdza, czy mapa liczona jest z najnowszej godziny pomiarów danego parametru i zapamiętywana do czasu
+        dopisania pomiarów z tej godziny.
+        """
+        handle, db_file = tempfile.mkstemp(suffix='.db')
+        os.close(handle)
+        try:
+            conn = get_connection(db_file)
+            create_stations_table(conn)
+            create_sensors_table(conn)
+            create_measurements_table(conn)
+            with conn:
+                conn.executemany('INSERT INTO stations (id, gegr_lat, gegr_lon) VALUES (?, ?, ?)',
+                                 [(1, 52.0, 19.0), (2, 50.0, 20.0)])
+                conn.executemany('INSERT INTO sensors (id, station_id, param_code) VALUES (?, ?, ?)',
+                                 [(10, 1, 'PM10'), (20, 2, 'PM10'), (30, 2, 'NO2')])
+                save_measurements(conn, 10, [{'date': '2024-01-01 12:00:00', 'value': 40.0},
+                                             {'date': '2024-01-01 11:00:00', 'value': 10.0}])
+                save_measurements(conn, 20, [{'date': '2024-01-01 07:00:00', 'value': 90.0}])
+                save_measurements(conn, 30, [{'date': '2024-01-01 13:00:00', 'value': 5.0}])
+
+            result = heat_map.heat_map('PM10', db_file=db_file)
+            self.assertEqual(result.hour, '2024-01-01 12')
+            # pomiar stacji 2 jest starszy niż MAX_AGE godzin - mapa liczona jest tylko ze stacji 1
+            self.assertEqual(result.stations, 1)
+            self.assertAlmostEqual(np.nanmax(result.raster), 40.0)
+            self.assertIs(heat_map.heat_map('PM10', '2024-01-01 12', db_file=db_file), result)
+            self.assertEqual(heat_map.heat_map('PM10', '2024-01-01 11', db_file=db_file).stations, 1)
+            # spóźniony pomiar stacji 2 z tej samej godziny - siatka liczona jest ponownie
+            with conn:
+                save_measurements(conn, 20, [{'date': '2024-01-01 11:00:00', 'value': 90.0}])
+            updated = heat_map.heat_map('PM10', '2024-01-01 12', db_file=db_file)
+            self.assertEqual(updated.stations, 2)
+            self.assertIs(heat_map.heat_map('PM10', '2024-01-01 12', db_file=db_file), updated)
+        finally:
+            heat_map._cache.clear()
+            close_connection(db_file)
+            os.remove(db_file)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,140 @@
+"---------------------------------------------------test_http_cache---------------------------------------------------"
+"""
+    Moduł zawierający klasę TestResponseCache, która testuje dyskową pamięć podręczną odpowiedzi serwisu GIOŚ.
+
+Moduł zawiera następujące elementy:
+- unittest - moduł do przeprowadzania testów,
+- requests - moduł do wykonywania zapytań sieciowych (wyjątki),
+- json - moduł do konwersji danych między formatem JSON a obiektami Pythona,
+- shutil, tempfile - moduły do tworzenia i usuwania katalogu tymczasowego,
+- http_cache - moduł zawierający klasę ResponseCache.
+"""
+import unittest
+import requests
+import json
+import shutil
+import tempfile
+from http_cache import ResponseCache
+
+
+class FakeResponse:
+    """
+        Odpowiedź HTTP zwracana przez FakeSession.
+    """
+
+    def __init__(self, status_code, body=b'', headers=None):
+        self.status_code = status_code
+        self.body = body
+        self.headers = headers or {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(str(self.status_code))
+
+    def iter_content(self, chunk_size):
+        for i in range(0, len(self.body), chunk_size):
+            yield self.body[i:i + chunk_size]
+
+
+class FakeSession:
+    """
+        Sesja HTTP zapamiętująca wysłane zapytania i zwracająca kolejne przygotowane odpowiedzi.
+    """
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def get(self, url, headers=None, **kwargs):
+        self.requests.append((url, headers))
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+class TestResponseCache(unittest.TestCase):
+    """
+        Klasa testuje czas ważności, zapytania warunkowe, dane w trybie offline i usuwanie odpowiedzi (LRU).
+    """
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+
+    def read(self, file_path):
+        with open(file_path, encoding='utf-8') as f:
+            return json.load(f)
+
+    def test_fresh_response_skips_network(self):
+        """
+            Sprawdza, czy odpowiedź w czasie ważności jest zwracana bez zapytania do sieci.
+        """
+        cache = ResponseCache(self.cache_dir, ttl={'sensors': 3600})
+        session = FakeSession(FakeResponse(200, b'[{"id": 1}]'))
+
+        first = cache.fetch('sensors', 11, 'http://x/11', session)
+        second = cache.fetch('sensors', 11, 'http://x/11', session)
+
+        self.assertEqual(first, second)
+        self.assertEqual(len(session.requests), 1)
+        self.assertEqual(self.read(second), [{'id': 1}])
+
+    def test_stale_response_is_revalidated(self):
+        """
+            Sprawdza, czy przeterminowana odpowiedź jest odświeżana zapytaniem warunkowym z nagłówkiem ETag.
+        """
+        cache = ResponseCache(self.cache_dir, ttl={'measurements': 0})
+        session = FakeSession(FakeResponse(200, b'{"values": []}', {'ETag': '"v1"'}), FakeResponse(304))
+
+        cache.fetch('measurements', 50, 'http://x/50', session)
+        file_path = cache.fetch('measurements', 50, 'http://x/50', session)
+
+        self.assertEqual(session.requests[1][1], {'If-None-Match': '"v1"'})
+        self.assertEqual(self.read(file_path), {'values': []})
+
+    def test_offline_fallback_is_keyed_by_id(self):
+        """
+            Sprawdza, czy w trybie offline zwracana jest odpowiedź dla właściwego ID, a przy jej braku zgłaszany jest
+        wyjątek.
+        """
+        cache = ResponseCache(self.cache_dir, ttl={'sensors': 0})
+        offline = requests.exceptions.ConnectionError()
+        session = FakeSession(FakeResponse(200, b'[{"stationId": 11}]'), FakeResponse(200, b'[{"stationId": 12}]'),
+                              offline, offline)
+
+        cache.fetch('sensors', 11, 'http://x/11', session)
+        cache.fetch('sensors', 12, 'http://x/12', session)
+
+        self.assertEqual(self.read(cache.fetch('sensors', 11, 'http://x/11', session)), [{'stationId': 11}])
+        with self.assertRaises(requests.exceptions.RequestException):
+            cache.fetch('sensors', 13, 'http://x/13', session)
+
+    def test_least_recently_used_is_evicted(self):
+        """
+            Sprawdza, czy po przekroczeniu limitu rozmiaru usuwana jest najdawniej używana odpowiedź.
+        """
+        cache = ResponseCache(self.cache_dir, ttl={'sensors': 3600}, max_bytes=25)
+        session = FakeSession(*(FakeResponse(200, b'[' + b'1,' * 4 + b'1]') for _ in range(4)))
+
+        cache.fetch('sensors', 1, 'http://x/1', session)
+        cache.fetch('sensors', 2, 'http://x/2', session)
+        cache.fetch('sensors', 1, 'http://x/1', session)
+        cache.fetch('sensors', 3, 'http://x/3', session)
+        cache.fetch('sensors', 1, 'http://x/1', session)
+        cache.fetch('sensors', 2, 'http://x/2', session)
+
+        self.assertEqual([url for url, headers in session.requests], ['http://x/1', 'http://x/2', 'http://x/3',
+                                                                      'http://x/2'])
+
+
+if __name__ == '__main__':
+    unittest.main()
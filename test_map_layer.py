@@ -0,0 +1,121 @@
+"---------------------------------------------------test_map_layer---------------------------------------------------"
+"""
+    Moduł zawierający klasy TestMapLayer i TestImagePyramid, które testują rzutowanie stacji na mapę, łączenie stacji
+w klastry zależnie od przybliżenia oraz piramidę obrazów mapy.
+
+Moduł zawiera następujące elementy:
+- unittest - moduł do przeprowadzania testów,
+- os, tempfile - moduły do tworzenia tymczasowego obrazu mapy,
+- random - moduł do losowania położeń stacji,
+- numpy - moduł do obliczeń na tablicach,
+- PIL - moduł do tworzenia obrazu mapy,
+- map_layer - moduł zawierający klasy Projection, MapLayer, MarkerGrid i ImagePyramid.
+"""
+import unittest
+import os
+import tempfile
+import random
+import numpy as np
+from PIL import Image
+from map_layer import Projection, MapLayer, MarkerGrid, ImagePyramid
+
+
+class TestMapLayer(unittest.TestCase):
+    """
+        Klasa testuje położenia znaczników i klastry stacji na kolejnych poziomach przybliżenia.
+    """
+
+    def setUp(self):
+        generator = random.Random(11)
+        self.stations = [(i, f'Station {i}', generator.uniform(49, 54.9), generator.uniform(14.15, 24.2))
+                         for i in range(400)]
+        self.projection = Projection(700, 700)
+        self.layer = MapLayer(self.stations, self.projection)
+
+    def test_projection_matches_map_formula(self):
+        """
+            Sprawdza, czy rzut zgadza się ze wzorem używanym wcześniej przez CommandMap i czy da się go odwrócić.
+        """
+        x, y = self.projection.to_pixels([52.23], [21.01])
+        self.assertAlmostEqual(x[0], (21.01 - 14.15) * (700 / (24.2 - 14.15)))
+        self.assertAlmostEqual(y[0], (54.9 - 52.23) * (700 / (54.9 - 49)))
+        latitude, longitude = self.projection.to_geo(x[0], y[0])
+        self.assertAlmostEqual(latitude, 52.23)
+        self.assertAlmostEqual(longitude, 21.01)
+
+    def test_clusters_cover_every_station_once(self):
+        """
+            Sprawdza, czy na każdym poziomie każda stacja należy do dokładnie jednego klastra, a klastrów przybywa wraz
+        z przybliżeniem.
+        """
+        sizes = []
+        for zoom in (1, 2, 4):
+            level = self.layer.clusters(zoom)
+            self.assertEqual(int(level.counts.sum()), len(self.stations))
+            self.assertEqual(sorted(np.concatenate(level.members).tolist()), list(range(len(self.stations))))
+            self.assertEqual([len(members) for members in level.members], level.counts.tolist())
+            sizes.append(len(level.counts))
+        self.assertEqual(sizes, sorted(sizes))
+        self.assertLess(sizes[0], len(self.stations))
+        self.assertIs(self.layer.clusters(2), self.layer.clusters(2))
+
+    def test_cluster_position_is_member_centroid(self):
+        """
+            Sprawdza, czy znacznik klastra leży w środku ciężkości stacji, które obejmuje.
+        """
+        level = self.layer.clusters(1)
+        index = int(np.argmax(level.counts))
+        x, y = self.projection.to_pixels([self.stations[i][2] for i in level.members[index]],
+                                         [self.stations[i][3] for i in level.members[index]])
+        self.assertAlmostEqual(level.x[index], x.mean())
+        self.assertAlmostEqual(level.y[index], y.mean())
+
+    def test_visible_returns_markers_in_viewport(self):
+        """
+            Sprawdza, czy wybierane są dokładnie znaczniki z widoku przybliżonej mapy.
+        """
+        level = self.layer.clusters(4)
+        visible = self.layer.visible(4, 700, 700, 700, 700, margin=0)
+        x, y = level.x * 4, level.y * 4
+        expected = [i for i in range(len(x)) if 700 <= x[i] <= 1400 and 700 <= y[i] <= 1400]
+        self.assertEqual(visible.tolist(), expected)
+
+    def test_marker_grid_matches_brute_force(self):
+        """
+            Sprawdza, czy indeks siatki pikseli wskazuje ten sam znacznik co przejrzenie wszystkich znaczników.
+        """
+        level = self.layer.clusters(2)
+        x, y = level.x * 2, level.y * 2
+        grid = MarkerGrid(x, y)
+        generator = random.Random(5)
+        for _ in range(300):
+            point_x, point_y = generator.uniform(0, 1400), generator.uniform(0, 1400)
+            distances = (x - point_x) ** 2 + (y - point_y) ** 2
+            nearest = int(np.argmin(distances))
+            expected = nearest if distances[nearest] <= 12 ** 2 else None
+            self.assertEqual(grid.nearest(point_x, point_y, 12), expected)
+            self.assertEqual(self.layer.marker_at(2, point_x, point_y), expected)
+
+
+class TestImagePyramid(unittest.TestCase):
+    """
+        Klasa testuje skalowanie i wycinanie obrazu mapy.
+    """
+
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix='.png')
+        os.close(handle)
+        Image.new('RGBA', (50, 40), 'white').save(self.path)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_levels_are_scaled_once(self):
+        pyramid = ImagePyramid(self.path, levels=(1, 2))
+        self.assertEqual(pyramid.level(2).size, (100, 80))
+        self.assertIs(pyramid.level(2), pyramid.level(2))
+        self.assertEqual(pyramid.crop(2, 30, 20, 50, 40).size, (50, 40))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+"----------------------------------------------test_measurement_analysis----------------------------------------------"
+"""
+    Moduł zawierający klasę TestMeasurementFrame, która testuje typowaną ramkę danych stanowiska, zapamiętywanie ramki
+całej tabeli między instancjami MeasurementAnalysis oraz odczyt statystyk stanowiska.
+
+Moduł zawiera następujące elementy:
+- unittest - moduł do przeprowadzania testów,
+- os, shutil, tempfile - moduły do tworzenia tymczasowej bazy danych i katalogu serii,
+- numpy - moduł do obliczeń na tablicach,
+- database - moduł zarządzający połączeniami z bazą danych,
+- series_store - moduł z seriami pomiarów stanowisk odwzorowanymi w pamięci,
+- get_measurements_data - moduł zapisujący pomiary do bazy danych,
+- measurement_analysis - moduł zawierający klasę MeasurementAnalysis.
+"""
+import unittest
+import os
+import shutil
+import tempfile
+import numpy as np
+import measurement_analysis
+from database import get_connection, close_connection
+from series_store import store_dir
+from get_measurements_data import create_measurements_table, save_measurements
+from measurement_analysis import MeasurementAnalysis
+
+
+class TestMeasurementFrame(unittest.TestCase):
+    """
+        Klasa testuje typy kolumn ramki danych oraz jej ponowne wczytanie po zapisie nowych pomiarów.
+    """
+
+    def setUp(self):
+        handle, self.db_file = tempfile.mkstemp(suffix='.db')
+        os.close(handle)
+        self.conn = get_connection(self.db_file)
+        create_measurements_table(self.conn)
+        with self.conn:
+            save_measurements(self.conn, 7, [{'date': '2024-01-01 02:00:00', 'value': None},
+                                             {'date': '2024-01-01 01:00:00', 'value': 12.5}])
+            save_measurements(self.conn, 8, [{'date': '2024-01-01 01:00:00', 'value': 99.0}])
+
+    def tearDown(self):
+        measurement_analysis._frames.clear()
+        close_connection(self.db_file)
+        os.remove(self.db_file)
+        shutil.rmtree(store_dir(self.db_file), ignore_errors=True)
+
+    def test_frame_is_typed(self):
+        """
+            Sprawdza typy kolumn ramki stanowiska (odczytanej z serii odwzorowanej w pamięci) i brak wartości jako NaN.
+        """
+        frame = MeasurementAnalysis(self.db_file, 7).get_data()
+        self.assertTrue(np.issubdtype(frame['values_date'].dtype, np.datetime64))
+        self.assertEqual(frame['values_value'].dtype, np.float64)
+        self.assertEqual(frame['values_value'].iloc[0], 12.5)
+        self.assertTrue(np.isnan(frame['values_value'].iloc[1]))
+        self.assertNotIn(os.path.abspath(self.db_file), measurement_analysis._frames)
+
+    def test_frame_is_reloaded_after_ingestion(self):
+        """
+            Sprawdza, czy ramka stanowiska uwzględnia uzupełnioną wartość i dopisany pomiar, a ramka całej tabeli jest
+        wspólna dla instancji i wczytywana ponownie dopiero po zapisie pomiarów.
+        """
+        analysis = MeasurementAnalysis(self.db_file, 7)
+        first = MeasurementAnalysis(self.db_file).get_data()
+        self.assertIs(MeasurementAnalysis(self.db_file).get_data(), first)
+        with self.conn:
+            save_measurements(self.conn, 7, [{'date': '2024-01-01 02:00:00', 'value': 14.0}])
+        self.assertEqual(analysis.get_data()['values_value'].tolist(), [12.5, 14.0])
+        second = MeasurementAnalysis(self.db_file).get_data()
+        self.assertIsNot(second, first)
+        self.assertEqual(sorted(second['values_value'].tolist()), [12.5, 14.0, 99.0])
+        with self.conn:
+            save_measurements(self.conn, 7, [{'date': '2024-01-01 03:00:00', 'value': 15.0}])
+        self.assertEqual(len(analysis.get_data()), 3)
+        self.assertEqual(len(MeasurementAnalysis(self.db_file).get_data()), 4)
+
+    def test_frame_is_reloaded_after_other_sensor_backfill(self):
+        """
+            Sprawdza, czy ramka całej tabeli jest wczytywana ponownie po zapisie pomiarów kolejnego stanowiska, które
+        nie zmieniają dat najnowszych pomiarów tabeli.
+        """
+        first = MeasurementAnalysis(self.db_file).get_data()
+        self.assertEqual(len(first), 3)
+        with self.conn:
+            save_measurements(self.conn, 9, [{'date': '2024-01-01 00:00:00', 'value': 5.0},
+                                             {'date': '2024-01-01 01:00:00', 'value': 6.0}])
+        second = MeasurementAnalysis(self.db_file).get_data()
+        self.assertIsNot(second, first)
+        self.assertEqual(len(second), 5)
+        self.assertIs(MeasurementAnalysis(self.db_file).get_data(), second)
+
+    def test_statistics_read_from_summary(self):
+        """
+            Sprawdza, czy statystyki stanowiska (odczytane z tabeli 'sensor_stats') zgadzają się z ramką danych.
+        """
+        with self.conn:
+            save_measurements(self.conn, 7, [{'date': '2024-01-01 03:00:00', 'value': 20.5},
+                                             {'date': '2024-01-01 02:00:00', 'value': 4.0}])
+        stats = MeasurementAnalysis(self.db_file, 7).statistics()
+        frame = MeasurementAnalysis(self.db_file, 7).get_data()
+        self.assertEqual((stats['min_value'], stats['min_date']), (4.0, '2024-01-01 02:00:00'))
+        self.assertEqual((stats['max_value'], stats['max_date']), (20.5, '2024-01-01 03:00:00'))
+        self.assertAlmostEqual(stats['data_mean'], frame['values_value'].mean())
+        self.assertAlmostEqual(stats['data_std'], frame['values_value'].std())
+        self.assertEqual(stats['count'], 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
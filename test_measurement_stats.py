@@ -0,0 +1,113 @@
+"-----------------------------------------------test_measurement_stats-----------------------------------------------"
+"""
+    Moduł zawierający klasę TestMeasurementStats, która porównuje statystyki aktualizowane przy zapisie pomiarów
+ze statystykami policzonymi od nowa z całej historii.
+
+Moduł zawiera następujące elementy:
+- unittest - moduł do przeprowadzania testów,
+- sqlite3 - moduł do tworzenia bazy danych w pamięci,
+- datetime - moduł do generowania dat pomiarów,
+- numpy - moduł do obliczeń na tablicach,
+- get_measurements_data - moduł zapisujący pomiary do bazy danych,
+- measurement_stats - moduł zawierający funkcje sensor_statistics i period_statistics.
+"""
+import unittest
+import sqlite3
+from datetime import datetime, timedelta
+import numpy as np
+from get_measurements_data import create_measurements_table, save_measurements
+from measurement_stats import sensor_statistics, period_statistics
+
+
+class TestMeasurementStats(unittest.TestCase):
+    """
+        Klasa testuje statystyki całej historii, godzin, dni i miesięcy oraz ich wyliczenie dla istniejącej bazy.
+    """
+
+    def setUp(self):
+        self.conn = sqlite3.connect(':memory:')
+        create_measurements_table(self.conn)
+        generator = np.random.default_rng(7)
+        start = datetime(2023, 12, 30)
+        self.series = [((start + timedelta(hours=i)).strftime('%Y-%m-%d %H:%M:%S'), float(value))
+                       for i, value in enumerate(generator.normal(40, 12, 24 * 40).round(2))]
+
+    def tearDown(self):
+        self.conn.close()
+
+    def ingest(self, sensor_id, series, batch=37):
+        """
+            Zapisuje pomiary partiami, od najstarszych, tak jak kolejne pobrania z serwisu GIOŚ: najnowszy pomiar partii
+        przychodzi najpierw bez wartości i zostaje uzupełniony w następnej partii.
+        """
+        for end in range(batch, len(series) + batch, batch):
+            part = [{'date': date, 'value': value} for date, value in series[max(0, end - batch - 1):end]]
+            if end < len(series):
+                part[-1] = {'date': part[-1]['date'], 'value': None}
+            save_measurements(self.conn, sensor_id, reversed(part))
+
+    def assert_matches(self, stats, series):
+        values = np.array([value for _, value in series])
+        self.assertEqual(stats['count'], len(values))
+        self.assertAlmostEqual(stats['sum'], values.sum(), places=6)
+        self.assertAlmostEqual(stats['sumsq'], (values ** 2).sum(), places=3)
+        self.assertAlmostEqual(stats['mean'], values.mean(), places=9)
+        self.assertAlmostEqual(stats['variance'], values.var(ddof=1) if len(values) > 1 else 0.0, places=6)
+        self.assertEqual(stats['min_value'], values.min())
+        self.assertEqual(stats['min_date'], series[int(np.argmin(values))][0])
+        self.assertEqual(stats['max_value'], values.max())
+        self.assertEqual(stats['max_date'], series[int(np.argmax(values))][0])
+        self.assertEqual((stats['first_date'], stats['last_date']), (series[0][0], series[-1][0]))
+
+    def test_incremental_statistics_match_full_history(self):
+        """
+            Sprawdza, czy statystyki po zapisie wielu partii są takie same jak policzone z całej historii, dla całej
+        historii, dla każdej godziny, każdego dnia i każdego miesiąca.
+        """
+        self.ingest(5, self.series)
+        self.assert_matches(sensor_statistics(self.conn, 5), self.series)
+        for period, length in (('hour', 13), ('day', 10), ('month', 7)):
+            result = period_statistics(self.conn, 5, period)
+            keys = sorted({date[:length] for date, _ in self.series})
+            self.assertEqual([key for key, _ in result], keys)
+            for key, stats in result:
+                self.assert_matches(stats, [row for row in self.series if row[0][:length] == key])
+        self.assertEqual([key for key, _ in period_statistics(self.conn, 5, 'month', '2024-01', '2024-01')],
+                         ['2024-01'])
+        self.assertIsNone(sensor_statistics(self.conn, 6))
+
+    def test_statistics_are_built_for_existing_history(self):
+        """
+            Sprawdza, czy w bazie z pomiarami zapisanymi przed wprowadzeniem statystyk statystyki są wyliczane przy
+        utworzeniu tabel, także po dodaniu nowej tabeli okresowej do bazy z istniejącymi statystykami.
+        """
+        conn = sqlite3.connect(':memory:')
+        conn.execute('''CREATE TABLE measurements (sensor_id INTEGER NOT NULL, values_date DATETIME NOT NULL,
+                        values_value FLOAT, PRIMARY KEY (sensor_id, values_date)) WITHOUT ROWID''')
+        conn.executemany('INSERT INTO measurements VALUES (9, ?, ?)', self.series + [('2024-03-01 00:00:00', None)])
+        create_measurements_table(conn)
+        stats = sensor_statistics(conn, 9)
+        self.assert_matches(stats, self.series)
+        conn.execute('DROP TABLE sensor_hourly_stats')
+        create_measurements_table(conn)
+        self.assert_matches(sensor_statistics(conn, 9), self.series)
+        self.assertEqual(len(period_statistics(conn, 9, 'hour')), len(self.series))
+        conn.close()
+
+    def test_statistics_are_built_for_migrated_table(self):
+        """
+            Sprawdza, czy przy przebudowie tabeli 'measurements' w starym formacie (kolumna sensor_id bez NOT NULL)
+        statystyki wyliczane są z przeniesionej historii pomiarów.
+        """
+        conn = sqlite3.connect(':memory:')
+        conn.execute('CREATE TABLE measurements (sensor_id INTEGER, values_date DATETIME, values_value FLOAT)')
+        conn.executemany('INSERT INTO measurements VALUES (9, ?, ?)', self.series[:5])
+        create_measurements_table(conn)
+        self.assertEqual(conn.execute('SELECT COUNT(*) FROM measurements').fetchone()[0], 5)
+        self.assert_matches(sensor_statistics(conn, 9), self.series[:5])
+        self.assertEqual(len(period_statistics(conn, 9, 'day')), 1)
+        conn.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
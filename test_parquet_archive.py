@@ -0,0 +1,107 @@
+"------------------------------------------------test_parquet_archive------------------------------------------------"
+"""
+    Moduł zawierający klasę TestParquetArchive, która testuje eksport historii pomiarów do archiwum Parquet i odczyt
+archiwum z filtrami.
+
+Moduł zawiera następujące elementy:
+- unittest - moduł do przeprowadzania testów,
+- os, shutil, tempfile - moduły do tworzenia tymczasowego katalogu archiwum,
+- sqlite3 - moduł do tworzenia bazy danych w pamięci,
+- get_sensors_data, get_stations_data, get_measurements_data - moduły tworzące tabele i zapisujące pomiary,
+- measurement_stats - moduł aktualizujący statystyki pomiarów,
+- parquet_archive - moduł zawierający funkcje export_archive i read_archive.
+"""
+import unittest
+import os
+import shutil
+import tempfile
+import sqlite3
+from get_sensors_data import create_sensors_table
+from get_stations_data import create_stations_table
+from get_measurements_data import create_measurements_table, save_measurements
+from measurement_stats import update_statistics
+from parquet_archive import export_archive, read_archive, partition_dir
+
+
+class TestParquetArchive(unittest.TestCase):
+    """
+        Klasa testuje zawartość partycji archiwum, przyrostowy eksport (pominięcie partycji bez zmian, dopisanie nowych
+    pomiarów i ponowny zapis partycji po uzupełnieniu luki) oraz filtrowanie przy odczycie.
+    """
+
+    def setUp(self):
+        self.path = tempfile.mkdtemp()
+        self.conn = sqlite3.connect(':memory:')
+        create_stations_table(self.conn)
+        create_sensors_table(self.conn)
+        create_measurements_table(self.conn)
+        self.conn.executemany('INSERT INTO stations (id, station_name, city_name) VALUES (?, ?, ?)',
+                              [(10, 'Stacja A', 'Kraków'), (20, 'Stacja B', 'Gdańsk')])
+        self.conn.executemany('INSERT INTO sensors (id, station_id, param_name, param_code) VALUES (?, ?, ?, ?)',
+                              [(1, 10, 'pył zawieszony PM10', 'PM10'), (2, 20, 'pył zawieszony PM10', 'PM10'),
+                               (3, 10, 'dwutlenek azotu', 'NO2')])
+        self.save(1, ('2024-01-31 23:00:00', 10.0), ('2024-02-01 00:00:00', 11.0), ('2024-02-01 01:00:00', None))
+        self.save(2, ('2024-02-01 00:00:00', 20.0))
+        self.save(3, ('2024-02-01 00:00:00', 30.0))
+
+    def tearDown(self):
+        self.conn.close()
+        shutil.rmtree(self.path)
+
+    def save(self, sensor_id, *measurements):
+        save_measurements(self.conn, sensor_id, [{'date': date, 'value': value} for date, value in measurements])
+
+    def test_export(self):
+        self.assertEqual(export_archive(self.conn, self.path),
+                         {'appended': 0, 'rewritten': 3, 'removed': 0, 'unchanged': 0})
+        self.assertTrue(os.path.isdir(partition_dir(self.path, 'PM10', '2024-02')))
+        frame = read_archive(self.path)
+        self.assertEqual(len(frame), 4)
+        row = frame[frame['sensor_id'] == 3].iloc[0]
+        self.assertEqual((row['param_code'], row['month'], row['station_name'], row['values_value']),
+                         ('NO2', '2024-02', 'Stacja A', 30.0))
+        self.assertEqual(export_archive(self.conn, self.path)['unchanged'], 3)
+
+    def test_incremental_export(self):
+        export_archive(self.conn, self.path)
+        self.save(1, ('2024-02-01 01:00:00', 12.0), ('2024-02-01 02:00:00', 13.0))
+        self.assertEqual(export_archive(self.conn, self.path),
+                         {'appended': 1, 'rewritten': 0, 'removed': 0, 'unchanged': 2})
+        self.assertEqual(len(os.listdir(partition_dir(self.path, 'PM10', '2024-02'))), 2)
+        # uzupełnienie dawnej luki (np. pomiary wczytane z pliku) - partycja zapisywana od nowa
+        self.conn.execute("INSERT INTO measurements VALUES (2, '2024-01-31 22:00:00', 21.0)")
+        update_statistics(self.conn, 2, [('2024-01-31 22:00:00', 21.0)])
+        self.assertEqual(export_archive(self.conn, self.path),
+                         {'appended': 0, 'rewritten': 1, 'removed': 0, 'unchanged': 2})
+        self.assertEqual(len(os.listdir(partition_dir(self.path, 'PM10', '2024-01'))), 1)
+        frame = read_archive(self.path, param_codes=['PM10']).sort_values(['sensor_id', 'values_date'])
+        self.assertEqual(list(frame['values_value']), [10.0, 11.0, 12.0, 13.0, 21.0, 20.0])
+
+    def test_full_export_removes_stale_partitions(self):
+        """
+            Sprawdza, czy pełny eksport usuwa partycje, których nie ma już w bazie (także nieobecne w manifeście).
+        """
+        export_archive(self.conn, self.path)
+        stray = partition_dir(self.path, 'SO2', '2023-12')
+        os.makedirs(stray)
+        shutil.copy(os.path.join(partition_dir(self.path, 'NO2', '2024-02'), 'part-0.parquet'), stray)
+        self.conn.execute('DELETE FROM sensors WHERE id = 3')
+        self.assertEqual(export_archive(self.conn, self.path, full=True),
+                         {'appended': 0, 'rewritten': 2, 'removed': 1, 'unchanged': 0})
+        self.assertFalse(os.path.exists(partition_dir(self.path, 'NO2', '2024-02')))
+        self.assertFalse(os.path.exists(stray))
+        frame = read_archive(self.path)
+        self.assertEqual((len(frame), set(frame['param_code'])), (3, {'PM10'}))
+
+    def test_filters(self):
+        export_archive(self.conn, self.path)
+        frame = read_archive(self.path, columns=['sensor_id', 'values_value'], param_codes=['PM10'],
+                             start='2024-02-01', end='2024-02-29 23:00:00')
+        self.assertEqual(list(frame.columns), ['sensor_id', 'values_value'])
+        self.assertEqual(sorted(frame['sensor_id']), [1, 2])
+        self.assertEqual(list(read_archive(self.path, stations=[20])['values_value']), [20.0])
+        self.assertEqual(len(read_archive(os.path.join(self.path, 'brak'))), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
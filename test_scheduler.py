@@ -0,0 +1,119 @@
+"----------------------------------------------------test_scheduler----------------------------------------------------"
+"""
+    Moduł zawierający klasę TestPollingScheduler, która testuje moduł scheduler - cykliczne pobieranie danych GIOŚ
+w tle.
+
+Moduł zawiera następujące elementy:
+- unittest - moduł do przeprowadzania testów,
+- requests - moduł do wykonywania zapytań sieciowych (wyjątki),
+- sqlite3 - moduł do łączenia z bazą danych,
+- os, tempfile - moduły do tworzenia tymczasowej bazy danych,
+- scheduler - moduł zawierający klasę PollingScheduler.
+"""
+import unittest
+import requests
+import sqlite3
+import os
+import tempfile
+from database import close_connection
+import time
+from unittest import mock
+import scheduler
+from scheduler import PollingScheduler
+
+
+class TestPollingScheduler(unittest.TestCase):
+    """
+        Klasa testuje harmonogram cykli oraz zapis stanu pobierania stanowisk.
+    """
+
+    def setUp(self):
+        """
+            Tworzy tymczasową bazę danych z dwoma stanowiskami i aktualną listą stacji.
+        """
+        handle, self.db_file = tempfile.mkstemp(suffix='.db')
+        os.close(handle)
+        conn = sqlite3.connect(self.db_file)
+        scheduler.create_sensors_table(conn)
+        scheduler.create_scheduler_tables(conn)
+        conn.executemany('INSERT INTO sensors (id, station_id) VALUES (?, ?)', [(10, 1), (20, 2)])
+        conn.execute("INSERT INTO scheduler_state (name, value) VALUES ('metadata', ?)", (time.time(),))
+        conn.commit()
+        conn.close()
+
+    def tearDown(self):
+        close_connection(self.db_file)
+        os.remove(self.db_file)
+
+    def test_next_run_is_aligned_to_interval(self):
+        """
+            Sprawdza, czy kolejny cykl startuje po pełnej godzinie z przesunięciem offset i jitterem.
+        """
+        polling = PollingScheduler(interval=3600, offset=1200, jitter=300)
+        next_run = polling.next_run(7200 + 1300)
+        self.assertGreaterEqual(next_run, 3 * 3600 + 1200)
+        self.assertLessEqual(next_run, 3 * 3600 + 1500)
+
+    def test_backoff_grows_exponentially(self):
+        """
+            Sprawdza, czy opóźnienie ponowienia rośnie wykładniczo i jest ograniczone z góry.
+        """
+        polling = PollingScheduler(retry_delay=60, max_retry_delay=600)
+        self.assertLessEqual(polling.backoff(1), 60)
+        self.assertGreater(polling.backoff(3), 200)
+        self.assertLessEqual(polling.backoff(10), 600)
+        self.assertGreater(PollingScheduler().backoff(8), 3600)
+
+    def test_run_forever_wakes_for_sensor_retry(self):
+        """
+            Sprawdza, czy proces budzi się w terminie ponowienia stanowiska, jeśli przypada ono przed kolejnym cyklem.
+        """
+        polling = PollingScheduler(db_file=self.db_file, interval=10 ** 9, jitter=0)
+        retry = time.time() + 120
+        conn = sqlite3.connect(self.db_file)
+        conn.execute('INSERT INTO sensor_watermarks (sensor_id, failures, next_attempt) VALUES (20, 2, ?)', (retry,))
+        conn.commit()
+        conn.close()
+
+        waits = []
+
+        def fake_wait(timeout):
+            waits.append(timeout)
+            polling.stop()
+
+        with mock.patch.object(polling, 'run_cycle', return_value={'sensors': 1, 'measurements': 0, 'errors': 0}), \
+                mock.patch.object(polling._stop, 'wait', fake_wait):
+            polling.run_forever()
+
+        self.assertEqual(len(waits), 1)
+        self.assertLessEqual(waits[0], 120)
+        self.assertGreater(waits[0], 100)
+
+    def test_run_cycle_records_watermarks(self):
+        """
+            Sprawdza, czy cykl zapisuje czas pobrania udanych stanowisk, odkłada nieudane i czy kolejny cykl
+        w tej samej godzinie niczego nie pobiera.
+        """
+        def fake_measurements(sensor_id, session):
+            if sensor_id == 20:
+                raise requests.exceptions.ConnectionError()
+            return [{'date': '2023-05-17 12:00:00', 'value': 1.5}]
+
+        polling = PollingScheduler(db_file=self.db_file, requests_per_second=0)
+        with mock.patch.object(scheduler, 'fetch_measurements', fake_measurements):
+            summary = polling.run_cycle()
+            again = polling.run_cycle()
+
+        self.assertEqual((summary['sensors'], summary['measurements'], summary['errors']), (1, 1, 1))
+        self.assertEqual(again['sensors'] + again['errors'], 0)
+
+        conn = sqlite3.connect(self.db_file)
+        watermarks = dict(((row[0], row[1:]) for row in conn.execute(
+            'SELECT sensor_id, last_value_date, failures, next_attempt > ? FROM sensor_watermarks', (time.time(),))))
+        conn.close()
+        self.assertEqual(watermarks[10], ('2023-05-17 12:00:00', 0, 0))
+        self.assertEqual(watermarks[20], (None, 1, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+"-------------------------------------------------test_series_store-------------------------------------------------"
+"""
+    Moduł zawierający klasę TestSeriesStore, która testuje zapis serii pomiarów stanowisk odwzorowanych w pamięci.
+
+Moduł zawiera następujące elementy:
+- unittest - moduł do przeprowadzania testów,
+- os, shutil, tempfile - moduły do tworzenia tymczasowej bazy danych,
+- numpy - moduł do obliczeń na tablicach,
+- database - moduł zarządzający połączeniami z bazą danych,
+- get_measurements_data - moduł zapisujący pomiary do bazy danych,
+- series_store - moduł zawierający funkcję open_series.
+"""
+import unittest
+import os
+import shutil
+import tempfile
+import numpy as np
+from database import get_connection, close_connection
+from get_measurements_data import create_measurements_table, save_measurements
+from series_store import open_series, store_dir
+
+
+class TestSeriesStore(unittest.TestCase):
+    """
+        Klasa testuje zawartość serii, wybór zakresu dat oraz uaktualnianie serii po zapisie nowych pomiarów.
+    """
+
+    def setUp(self):
+        handle, self.db_file = tempfile.mkstemp(suffix='.db')
+        os.close(handle)
+        self.conn = get_connection(self.db_file)
+        create_measurements_table(self.conn)
+        self.save(7, ('2024-01-01 00:00:00', 1.5), ('2024-01-01 01:00:00', None), ('2024-01-01 02:00:00', 3.25),
+                  ('2024-01-01 03:00:00', None))
+
+    def tearDown(self):
+        close_connection(self.db_file)
+        os.remove(self.db_file)
+        shutil.rmtree(store_dir(self.db_file), ignore_errors=True)
+
+    def save(self, sensor_id, *measurements):
+        with self.conn:
+            save_measurements(self.conn, sensor_id, [{'date': date, 'value': value} for date, value in measurements])
+
+    def test_slice(self):
+        series = open_series(self.db_file, 7)
+        self.assertEqual(len(series), 4)
+        self.assertIsInstance(series.values, np.memmap)
+        self.assertEqual((series.times.dtype, series.values.dtype), (np.int64, np.float32))
+        dates, values = series.slice('2024-01-01 01:00:00', '2024-01-01 02:00:00')
+        self.assertEqual(list(dates.astype(str)), ['2024-01-01T01:00:00', '2024-01-01T02:00:00'])
+        self.assertTrue(np.shares_memory(values, series.values))
+        self.assertEqual(list(series.valid()), [True, False, True, False])
+        self.assertEqual(len(series.slice('2025-01-01')[0]), 0)
+        self.assertEqual(len(series.slice(end='2023-12-31')[0]), 0)
+        self.assertEqual(series.series().dropna().tolist(), [1.5, 3.25])
+        self.assertEqual(len(open_series(self.db_file, 8)), 0)
+
+    def test_sync(self):
+        open_series(self.db_file, 7)
+        self.save(7, ('2024-01-01 03:00:00', 4.0), ('2024-01-01 04:00:00', 5.0))
+        series = open_series(self.db_file, 7)
+        self.assertEqual(np.nan_to_num(series.values).tolist(), [1.5, 0.0, 3.25, 4.0, 5.0])
+        # pomiar wcześniejszy od zapisanych (dopisany z pominięciem save_measurements) - seria zapisywana od nowa
+        with self.conn:
+            self.conn.execute("INSERT INTO measurements VALUES (7, '2023-12-31 23:00:00', 0.5)")
+            self.conn.execute("INSERT INTO measurements VALUES (7, '2024-01-01 05:00:00', 6.0)")
+        series = open_series(self.db_file, 7)
+        self.assertEqual(np.nan_to_num(series.values).tolist(), [0.5, 1.5, 0.0, 3.25, 4.0, 5.0, 6.0])
+        self.assertEqual(str(series.slice()[0][0]), '2023-12-31T23:00:00')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+"-------------------------------------------------test_spatial_index-------------------------------------------------"
+"""
+    Moduł zawierający klasę TestStationIndex, która testuje indeks przestrzenny stacji pomiarowych, porównując jego
+wyniki z bezpośrednim przeliczeniem odległości funkcją great_circle z modułu geopy.
+
+Moduł zawiera następujące elementy:
+- unittest - moduł do przeprowadzania testów,
+- random - moduł do losowania położeń stacji,
+- geopy - moduł do geolokalizacji (wzorcowa odległość great_circle),
+- spatial_index - moduł zawierający klasę StationIndex.
+"""
+import unittest
+import random
+from geopy.distance import great_circle
+from spatial_index import StationIndex
+
+
+class TestStationIndex(unittest.TestCase):
+    """
+        Klasa testuje wyszukiwanie k najbliższych stacji i stacji w zadanym promieniu.
+    """
+
+    def setUp(self):
+        """
+            Losuje 500 stacji na obszarze Polski w formacie wierszy tabeli 'stations' (współrzędne jako tekst).
+        """
+        generator = random.Random(11)
+        self.stations = [(i, f'Station {i}', f'{generator.uniform(49, 54.9):.6f}',
+                          f'{generator.uniform(14.15, 24.2):.6f}') for i in range(500)]
+        self.index = StationIndex(self.stations)
+        self.point = (51.76, 19.46)
+
+    def brute_force(self):
+        return sorted((great_circle(self.point, (row[2], row[3])).km, row) for row in self.stations)
+
+    def test_nearest_matches_brute_force(self):
+        """
+            Sprawdza, czy k najbliższych stacji i ich odległości są zgodne z przeliczeniem wszystkich stacji.
+        """
+        expected = self.brute_force()[:7]
+        result = self.index.nearest(*self.point, k=7)
+        self.assertEqual([row for _, row in result], [row for _, row in expected])
+        for (distance, _), (expected_distance, _) in zip(result, expected):
+            self.assertAlmostEqual(distance, expected_distance, places=6)
+
+    def test_within_radius_matches_brute_force(self):
+        """
+            Sprawdza, czy wyszukiwanie w promieniu zwraca dokładnie stacje w zasięgu, posortowane według odległości.
+        """
+        expected = [row for distance, row in self.brute_force() if distance <= 80]
+        result = self.index.within_radius(*self.point, 80)
+        self.assertEqual([row for _, row in result], expected)
+        self.assertEqual(self.index.within_radius(*self.point, 0.001), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+"------------------------------------------------test_station_registry------------------------------------------------"
+"""
+    Moduł zawierający klasę TestStationRegistry, która testuje rejestr stacji pomiarowych przechowywany w pamięci
+procesu i w bazie danych.
+
+Moduł zawiera następujące elementy:
+- unittest - moduł do przeprowadzania testów,
+- os, tempfile - moduły do tworzenia tymczasowej bazy danych,
+- database - moduł zarządzający połączeniami z bazą danych,
+- station_registry - moduł zawierający klasę StationRegistry.
+"""
+import unittest
+import os
+import tempfile
+from unittest import mock
+import station_registry
+from database import get_connection, close_connection
+from get_stations_data import create_stations_table
+from station_registry import StationRegistry
+
+
+class TestStationRegistry(unittest.TestCase):
+    """
+        Klasa testuje, kiedy rejestr pobiera listę stacji z serwisu, a kiedy korzysta z listy zapisanej.
+    """
+
+    def setUp(self):
+        handle, self.db_file = tempfile.mkstemp(suffix='.db')
+        os.close(handle)
+        self.downloads = 0
+
+    def tearDown(self):
+        close_connection(self.db_file)
+        os.remove(self.db_file)
+
+    def fake_get_stations_data(self, echo=False, db_file=None):
+        """
+            Zastępuje pobieranie listy stacji - zapisuje do bazy jedną stację o ID równym liczbie pobrań.
+        """
+        self.downloads += 1
+        conn = get_connection(db_file)
+        create_stations_table(conn)
+        with conn:
+            conn.execute('DELETE FROM stations')
+            conn.execute('INSERT INTO stations (id, station_name) VALUES (?, ?)', (self.downloads, 'Station'))
+
+    def test_first_call_downloads_then_uses_stored_list(self):
+        """
+            Sprawdza, czy pusta baza wymusza pobranie listy, a kolejne wywołania korzystają z zapisanej listy.
+        """
+        registry = StationRegistry(self.db_file)
+        with mock.patch.object(station_registry, 'get_stations_data', self.fake_get_stations_data):
+            first = registry.get_stations()
+            second = StationRegistry(self.db_file).get_stations()
+
+        self.assertEqual(self.downloads, 1)
+        self.assertEqual([row[0] for row in first], [1])
+        self.assertEqual(first, second)
+
+    def test_stale_list_is_refreshed_in_background(self):
+        """
+            Sprawdza, czy przeterminowana lista jest zwracana od razu, a odświeżenie odbywa się w tle.
+        """
+        registry = StationRegistry(self.db_file, ttl=0)
+        with mock.patch.object(station_registry, 'get_stations_data', self.fake_get_stations_data):
+            registry.get_stations()
+            stale = registry.get_stations()
+            registry._refreshing.join()
+            fresh = registry.get_stations()
+            registry._refreshing.join()
+
+        self.assertEqual([row[0] for row in stale], [1])
+        self.assertEqual([row[0] for row in fresh], [2])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+"-------------------------------------------------test_station_search-------------------------------------------------"
+"""
+    Moduł zawierający klasę TestStationSearch, która testuje wyszukiwanie stacji pomiarowych bez względu na polskie
+znaki, po początku nazwy i mimo literówek.
+
+Moduł zawiera następujące elementy:
+- unittest - moduł do przeprowadzania testów,
+- os, tempfile - moduły do tworzenia tymczasowej bazy danych,
+- database - moduł zarządzający połączeniami z bazą danych,
+- get_stations_data - moduł zawierający funkcję create_stations_table,
+- station_search - moduł zawierający funkcje build_search_index i search_stations.
+"""
+import unittest
+import os
+import tempfile
+from database import get_connection, close_connection
+from get_stations_data import create_stations_table
+from station_search import build_search_index, search_stations
+
+
+class TestStationSearch(unittest.TestCase):
+    """
+        Klasa testuje wyniki i kolejność wyników wyszukiwarki stacji.
+    """
+
+    def setUp(self):
+        """
+            Tworzy tymczasową bazę danych z czterema stacjami i buduje indeks wyszukiwania.
+        """
+        handle, self.db_file = tempfile.mkstemp(suffix='.db')
+        os.close(handle)
+        self.conn = get_connection(self.db_file)
+        create_stations_table(self.conn)
+        with self.conn:
+            self.conn.executemany('''INSERT INTO stations (id, station_name, city_name, commune_name, district_name,
+                                                           address_street) VALUES (?, ?, ?, ?, ?, ?)''',
+                                  [(1, 'Łódź, ul. Czernika', 'Łódź', 'Łódź', 'Łódź', 'ul. Czernika 1/3'),
+                                   (2, 'Kraków, ul. Bujaka', 'Kraków', 'Kraków', 'Kraków', 'ul. Bujaka'),
+                                   (3, 'Zgierz, ul. Łódzka', 'Zgierz', 'Zgierz', 'zgierski', 'ul. Łódzka 8'),
+                                   (4, 'Warszawa, ul. Wokalna', 'Warszawa', 'Warszawa', 'Warszawa', 'ul. Wokalna 1')])
+            build_search_index(self.conn)
+
+    def tearDown(self):
+        close_connection(self.db_file)
+        os.remove(self.db_file)
+
+    def ids(self, query):
+        return [row[0] for row in search_stations(query, db_file=self.db_file)]
+
+    def test_accent_folding_and_ranking(self):
+        """
+            Sprawdza, czy "lodz" znajduje Łódź, a stacja przy ulicy Łódzkiej jest niżej niż stacja w Łodzi.
+        """
+        self.assertEqual(self.ids('lodz'), [1, 3])
+        self.assertEqual(self.ids('ŁÓDŹ'), [1, 3])
+
+    def test_prefix_and_short_queries(self):
+        """
+            Sprawdza wyszukiwanie po początku nazwy, także krótszym niż trygram.
+        """
+        self.assertEqual(self.ids('krak'), [2])
+        self.assertEqual(self.ids('wa'), [4])
+        self.assertEqual(self.ids('zgierz lodzka'), [3])
+
+    def test_typo_tolerance(self):
+        """
+            Sprawdza, czy nazwa z literówką znajduje właściwą stację, a zapytanie bez podobieństwa nic nie zwraca.
+        """
+        self.assertEqual(self.ids('krakw'), [2])
+        self.assertEqual(self.ids('warzsawa'), [4])
+        self.assertEqual(self.ids('xyzzy'), [])
+
+    def test_index_is_built_on_first_search(self):
+        """
+            Sprawdza, czy pusty indeks (stacje zapisane przed wprowadzeniem wyszukiwarki) jest budowany
+        przy wyszukiwaniu.
+        """
+        with self.conn:
+            self.conn.execute('DELETE FROM station_search')
+        self.assertEqual(self.ids('bujaka'), [2])
+
+
+if __name__ == '__main__':
+    unittest.main()
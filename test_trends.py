@@ -0,0 +1,120 @@
+"-----------------------------------------------------test_trends-----------------------------------------------------"
+"""
+    Moduł zawierający klasę TestTrends, która testuje serie zagregowane (godzinowe, dobowe, miesięczne) i metody
+wyznaczania linii trendu.
+
+Moduł zawiera następujące elementy:
+- unittest - moduł do przeprowadzania testów,
+- os, shutil, tempfile - moduły do tworzenia tymczasowej bazy danych,
+- numpy - moduł do obliczeń na tablicach,
+- pandas - moduł, który został wykorzystany do generowania dataframe,
+- database - moduł zarządzający połączeniami z bazą danych,
+- get_measurements_data - moduł zapisujący pomiary do bazy danych,
+- measurement_analysis - moduł zawierający klasę MeasurementAnalysis,
+- series_store - moduł z seriami pomiarów stanowisk odwzorowanymi w pamięci,
+- trends - moduł zawierający funkcje rollup, resolution_for i trend.
+"""
+import unittest
+import os
+import shutil
+import tempfile
+import numpy as np
+import pandas as pd
+import measurement_analysis
+from database import get_connection, close_connection
+from get_measurements_data import create_measurements_table, save_measurements
+from measurement_analysis import MeasurementAnalysis
+from series_store import store_dir
+from trends import rollup, resolution_for, trend
+
+
+class TestTrends(unittest.TestCase):
+    """
+        Klasa testuje odczyt serii zagregowanych, wybór rozdzielczości oraz metody trendu.
+    """
+
+    def setUp(self):
+        handle, self.db_file = tempfile.mkstemp(suffix='.db')
+        os.close(handle)
+        self.conn = get_connection(self.db_file)
+        create_measurements_table(self.conn)
+        generator = np.random.default_rng(5)
+        self.dates = pd.date_range('2023-11-20', periods=24 * 200, freq='h')
+        self.values = generator.normal(35, 10, len(self.dates)).round(1)
+        self.values[generator.random(len(self.dates)) < 0.05] = np.nan
+        with self.conn:
+            for start in range(0, len(self.dates), 500):
+                save_measurements(self.conn, 1, [{'date': date.strftime('%Y-%m-%d %H:%M:%S'),
+                                                  'value': None if np.isnan(value) else float(value)}
+                                                 for date, value in zip(self.dates[start:start + 500],
+                                                                        self.values[start:start + 500])])
+        self.series = pd.Series(self.values, index=self.dates)
+
+    def tearDown(self):
+        measurement_analysis._frames.clear()
+        close_connection(self.db_file)
+        os.remove(self.db_file)
+        shutil.rmtree(store_dir(self.db_file), ignore_errors=True)
+
+    def test_rollups_match_resampled_measurements(self):
+        """
+            Sprawdza, czy średnie, wartości skrajne i liczności serii zagregowanych są takie jak z pomiarów.
+        """
+        for resolution, rule in (('hour', 'h'), ('day', 'D'), ('month', 'MS')):
+            expected = self.series.resample(rule).agg(['mean', 'min', 'max', 'count'])
+            expected = expected[expected['count'] > 0]
+            result = rollup(self.conn, 1, resolution)
+            self.assertTrue(result.index.equals(expected.index))
+            np.testing.assert_allclose(result['mean'], expected['mean'])
+            np.testing.assert_allclose(result['min_value'], expected['min'])
+            np.testing.assert_allclose(result['max_value'], expected['max'])
+            self.assertEqual(result['count'].tolist(), expected['count'].tolist())
+        self.assertEqual(len(rollup(self.conn, 1, 'month', '2024-01', '2024-02')), 2)
+
+    def test_trend_methods(self):
+        """
+            Sprawdza średnią kroczącą o stałym oknie, EWMA oraz średnie 24- i 8-godzinne z wymaganym pokryciem okna.
+        """
+        rolling = trend(self.series, 'rolling', '24h')
+        window = self.series[(self.series.index > self.dates[100] - pd.Timedelta('24h'))
+                             & (self.series.index <= self.dates[100])]
+        self.assertAlmostEqual(rolling.iloc[100], window.mean())
+        self.assertEqual(len(trend(self.series[:48], 'rolling')), 48)
+
+        ewma = trend(self.series, 'ewma', halflife='1D')
+        self.assertFalse(ewma.isna().any())
+        self.assertAlmostEqual(ewma.iloc[0], self.series.dropna().iloc[0])
+
+        gaps = self.series.fillna(30.0)
+        gaps.iloc[[10, 11, 13]] = np.nan
+        mean8h = trend(gaps, 'mean8h')
+        self.assertTrue(np.isnan(mean8h.iloc[14]))
+        self.assertAlmostEqual(mean8h.iloc[18], gaps.iloc[11:19].mean())
+        mean24h = trend(self.series, 'mean24h')
+        self.assertTrue(mean24h.iloc[:17].isna().all())
+        self.assertAlmostEqual(mean24h.iloc[40], self.series.iloc[17:41].mean())
+        with self.assertRaises(ValueError):
+            trend(self.series, 'median')
+
+    def test_long_history_uses_rollups(self):
+        """
+            Sprawdza, czy wykres długiej historii korzysta ze średnich dobowych, a trendy (także średnia krocząca
+        7-dniowa i EWMA) - ze średnich godzinowych.
+        """
+        self.assertEqual(resolution_for(pd.Timedelta(days=30)), 'raw')
+        self.assertEqual(resolution_for(pd.Timedelta(days=2000)), 'month')
+        analysis = MeasurementAnalysis(self.db_file, 1)
+        series, resolution = analysis.series()
+        self.assertEqual((resolution, len(series)), ('day', 200))
+        self.assertEqual(len(analysis.trend('mean8h')), len(self.dates))
+        hourly = self.series.dropna()
+        line = analysis.trend('rolling')
+        self.assertEqual(len(line), len(hourly))
+        self.assertAlmostEqual(line.iloc[-1], hourly[hourly.index > hourly.index[-1] - pd.Timedelta('7D')].mean())
+        self.assertLess(line.std(), series.std())
+        self.assertEqual(len(analysis.trend('ewma')), len(hourly))
+        self.assertNotIn(os.path.abspath(self.db_file), measurement_analysis._frames)
+
+
+if __name__ == '__main__':
+    unittest.main()
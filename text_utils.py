@@ -0,0 +1,34 @@
+"--------------------------------------------------MODUŁ: text_utils--------------------------------------------------"
+"""
+    Moduł zawierający funkcje pomocnicze do porównywania nazw miejscowości i stacji niezależnie od wielkości liter,
+polskich znaków diakrytycznych i interpunkcji (np. "lodz" i "Łódź" dają ten sam klucz).
+
+Moduł zawiera następujące elementy:
+- unicodedata - moduł do rozkładu znaków Unicode na znak podstawowy i znaki diakrytyczne,
+- re - moduł wyrażeń regularnych.
+"""
+
+import unicodedata
+import re
+
+# litery, które nie rozkładają się w Unicode na literę podstawową i znak diakrytyczny
+_SPECIAL_LETTERS = str.maketrans({'ł': 'l', 'ß': 'ss', 'æ': 'ae', 'ø': 'o', 'đ': 'd'})
+_SEPARATORS = re.compile(r'[\W_]+')
+
+
+def fold_text(text):
+    """
+        Zwraca klucz tekstu do porównań: małe litery, bez znaków diakrytycznych, słowa rozdzielone pojedynczą spacją.
+
+        Args:
+            text (str): Tekst do przekształcenia.
+
+        Returns:
+            str: Znormalizowany tekst.
+
+        Example:
+            fold_text('Łódź, ul. Czernika') -> 'lodz ul czernika'
+    """
+    text = unicodedata.normalize('NFKD', text.casefold().translate(_SPECIAL_LETTERS))
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    return _SEPARATORS.sub(' ', text).strip()
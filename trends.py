@@ -0,0 +1,104 @@
+"---------------------------------------------------MODUŁ: trends---------------------------------------------------"
+"""
+    Moduł zawierający metody wyznaczania linii trendu serii pomiarów oraz odczyt serii zagregowanych (godzinowych,
+dobowych i miesięcznych) z tabel statystyk okresowych utrzymywanych przy zapisie pomiarów (moduł measurement_stats).
+    Wszystkie metody trendu mają stałe znaczenie niezależne od długości serii i liczone są jednym przejściem po serii:
+- 'rolling' - średnia krocząca z okna o stałym czasie trwania (domyślnie 7 dni),
+- 'ewma' - średnia ważona wykładniczo z zadanym czasem połowicznego zaniku wagi (domyślnie 3 doby),
+- 'mean24h' i 'mean8h' - średnie kroczące 24-godzinna i 8-godzinna liczone z wartości godzinowych, tak jak średnie
+  stosowane w ocenie jakości powietrza (średnia jest wyznaczana, gdy okno zawiera co najmniej 75% wartości
+  godzinowych; wartość przypisana jest do ostatniej godziny okna).
+    Wykresy długich zakresów dat korzystają z serii zagregowanych (resolution_for), zamiast z pomiarów, a trendy
+- ze średnich godzinowych (okno metody musi obejmować wiele punktów serii).
+
+Moduł zawiera następujące elementy:
+- math - moduł funkcji matematycznych,
+- pandas - moduł, który został wykorzystany do generowania dataframe.
+"""
+
+import math
+import pandas as pd
+
+# tabela statystyk okresowych i format klucza okresu dla każdej rozdzielczości
+ROLLUPS = {'hour': ('sensor_hourly_stats', '%Y-%m-%d %H'),
+           'day': ('sensor_daily_stats', '%Y-%m-%d'),
+           'month': ('sensor_monthly_stats', '%Y-%m')}
+# najdłuższe zakresy dat rysowane z pomiarów i z serii dobowej; dłuższe - z serii miesięcznej
+RAW_RANGE = pd.Timedelta(days=92)
+DAILY_RANGE = pd.Timedelta(days=3 * 365)
+TREND_METHODS = {'rolling': 'średnia krocząca 7 dni',
+                 'ewma': 'średnia wykładnicza (EWMA)',
+                 'mean24h': 'średnia 24-godzinna',
+                 'mean8h': 'średnia 8-godzinna'}
+ROLLING_WINDOW = '7D'
+EWMA_HALFLIFE = '3D'
+REGULATORY_WINDOWS = {'mean24h': 24, 'mean8h': 8}
+MIN_COVERAGE = 0.75
+
+
+def resolution_for(span):
+    """
+        Zwraca rozdzielczość serii ('raw' - pomiary, 'day' lub 'month') odpowiednią dla zakresu dat o długości span
+    (pandas.Timedelta).
+    """
+    if span <= RAW_RANGE:
+        return 'raw'
+    return 'day' if span <= DAILY_RANGE else 'month'
+
+
+def rollup(conn, sensor_id, resolution='day', start=None, end=None):
+    """
+        Odczytuje serię zagregowaną stanowiska z tabeli statystyk okresowych.
+
+        Args:
+            conn (sqlite3.Connection): Połączenie z bazą danych.
+            sensor_id (int): Numer ID stanowiska pomiarowego.
+            resolution (str): 'hour', 'day' lub 'month'.
+            start, end (str): Opcjonalny zakres kluczy okresów (włącznie), np. '2024-01' - '2024-06'.
+
+        Returns:
+            pandas.DataFrame: Kolumny 'mean', 'min_value', 'max_value' i 'count', indeks - początek okresu
+            (DatetimeIndex 'period'), rosnąco.
+    """
+    table, key_format = ROLLUPS[resolution]
+    rows = conn.execute(f'''SELECT {resolution}, mean, min_value, max_value, count FROM {table}
+                            WHERE sensor_id = ? AND {resolution} >= ? AND {resolution} <= ?
+                            ORDER BY {resolution}''', (sensor_id, start or '', end or '￿')).fetchall()
+    frame = pd.DataFrame(rows, columns=['period', 'mean', 'min_value', 'max_value', 'count'])
+    frame['period'] = pd.to_datetime(frame['period'], format=key_format)
+    return frame.set_index('period').astype({'mean': 'float64', 'min_value': 'float64', 'max_value': 'float64'})
+
+
+def regulatory_average(series, hours, coverage=MIN_COVERAGE):
+    """
+        Zwraca średnią kroczącą z hours kolejnych wartości godzinowych serii. Średnia jest wyznaczana, jeśli okno
+    zawiera co najmniej coverage wartości godzinowych; wynik przypisany jest do ostatniej godziny okna.
+    """
+    hourly = series.resample('h').mean()
+    return hourly.rolling(hours, min_periods=math.ceil(coverage * hours)).mean()
+
+
+def trend(series, method='rolling', window=ROLLING_WINDOW, halflife=EWMA_HALFLIFE):
+    """
+        Wyznacza linię trendu serii.
+
+        Args:
+            series (pandas.Series): Wartości (NaN dla pomiarów bez wartości) z indeksem dat (DatetimeIndex), rosnąco.
+            method (str): Metoda - klucz TREND_METHODS.
+            window (str): Czas trwania okna średniej kroczącej 'rolling', np. '7D' lub '24h'.
+            halflife (str): Czas połowicznego zaniku wagi dla 'ewma', np. '3D'.
+
+        Returns:
+            pandas.Series: Linia trendu z indeksem dat (dla 'mean24h' i 'mean8h' - kolejne godziny).
+
+        Example:
+            line = trend(frame.set_index('values_date')['values_value'], 'mean8h')
+    """
+    if method == 'rolling':
+        return series.rolling(window, min_periods=1).mean()
+    if method == 'ewma':
+        present = series.dropna()
+        return present.ewm(halflife=pd.Timedelta(halflife), times=present.index).mean()
+    if method in REGULATORY_WINDOWS:
+        return regulatory_average(series, REGULATORY_WINDOWS[method])
+    raise ValueError(f'Nieznana metoda trendu: {method}')